@@ -9,7 +9,9 @@ if (rawUrl && !rawUrl.endsWith('/api')) {
 // If no env var, use relative /api — works both locally (via proxy) and on Render
 export const API_BASE_URL = rawUrl || '/api';
 
-export const generateDigest = async (keywords = [], categories = [], sources = []) => {
+// A response holds at most 100 articles (pageSize lowers that); pass the previous response's
+// next_cursor to fetch the following page (null when there is none)
+export const generateDigest = async (keywords = [], categories = [], sources = [], { cursor = null, pageSize } = {}) => {
     try {
         const response = await fetch(`${API_BASE_URL}/generate-digest/`, {
             method: 'POST',
@@ -20,7 +22,9 @@ export const generateDigest = async (keywords = [], categories = [], sources = [
             body: JSON.stringify({
                 keywords,
                 categories,
-                sources
+                sources,
+                ...(cursor ? { cursor } : {}),
+                ...(pageSize ? { page_size: pageSize } : {}),
             }),
         });
 
@@ -91,12 +95,17 @@ export const savePreferences = async (token, categories) => {
     }
 };
 
-export const fetchBookmarks = async (token) => {
+// Every bookmark unless cursor or pageSize is given (then one page, followed with next_cursor)
+export const fetchBookmarks = async (token, { cursor = null, pageSize } = {}) => {
     try {
         const headers = { 'Content-Type': 'application/json' };
         if (token) headers['Authorization'] = `Bearer ${token}`;
 
-        const response = await fetch(`${API_BASE_URL}/user/bookmarks/`, { headers });
+        const params = new URLSearchParams();
+        if (cursor) params.set('cursor', cursor);
+        if (pageSize) params.set('page_size', pageSize);
+        const query = params.toString() ? `?${params}` : '';
+        const response = await fetch(`${API_BASE_URL}/user/bookmarks/${query}`, { headers });
         if (response.status === 401) {
             localStorage.removeItem('access_token');
             localStorage.removeItem('user');
@@ -107,7 +116,7 @@ export const fetchBookmarks = async (token) => {
         return await response.json();
     } catch (error) {
         console.error("Failed to fetch bookmarks:", error);
-        return { status: 'error', bookmarks: [] };
+        return { status: 'error', bookmarks: [], next_cursor: null };
     }
 };
 
@@ -0,0 +1,111 @@
+"""
+Offline precision/recall/latency harness for the dedup strategies.
+
+Runs every strategy over a labelled corpus (articles sharing a `group` are
+duplicates of each other) and reports pairwise precision, recall and the
+average grouping cost in ns/article, so the cheapest strategy that meets the
+accuracy bar can be chosen in config/settings.yaml.
+
+Usage:
+    python benchmarks/bench_dedup.py
+    python benchmarks/bench_dedup.py --strategy minhash --repeats 50
+"""
+import argparse
+import json
+import sys
+import time
+from itertools import combinations
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from bytebrief.core.models import Article
+from bytebrief.agent.dedup import create_strategy, group_duplicates
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent / "data" / "dedup_corpus.json"
+
+# Thresholds swept for each strategy
+GRID = {
+    'simhash': [1, 3, 6, 10, 14],
+    'minhash': [0.3, 0.5, 0.7, 0.9],
+    'title_hash': [None],
+}
+
+
+def load_corpus(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def to_articles(records):
+    return [
+        Article(title=r['title'], content=r['content'], url=r['url'], source=r['source'])
+        for r in records
+    ]
+
+
+def predicted_groups(records, strategy):
+    """Map each record id to the id of the article its duplicate group was kept under"""
+    articles = to_articles(records)
+    ids = {id(a): r['id'] for a, r in zip(articles, records)}
+    assignment = {}
+    for kept in group_duplicates(articles, strategy):
+        assignment[ids[id(kept)]] = ids[id(kept)]
+        for related in kept.related_articles:
+            assignment[ids[id(related)]] = ids[id(kept)]
+    return assignment
+
+
+def score(records, assignment):
+    """Pairwise precision and recall against the labelled groups"""
+    tp = fp = fn = 0
+    for a, b in combinations(records, 2):
+        truth = a['group'] == b['group']
+        predicted = assignment[a['id']] == assignment[b['id']]
+        if truth and predicted:
+            tp += 1
+        elif predicted:
+            fp += 1
+        elif truth:
+            fn += 1
+    precision = tp / (tp + fp) if tp + fp else 1.0
+    recall = tp / (tp + fn) if tp + fn else 1.0
+    return precision, recall
+
+
+def time_strategy(records, strategy, repeats):
+    """Average ns/article for a full grouping pass (article construction excluded)"""
+    total = 0
+    for _ in range(repeats):
+        articles = to_articles(records)
+        start = time.perf_counter_ns()
+        group_duplicates(articles, strategy)
+        total += time.perf_counter_ns() - start
+    return total / (repeats * len(records))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ByteBrief dedup strategies")
+    parser.add_argument("--corpus", type=str, default=str(DEFAULT_CORPUS), help="Labelled corpus JSON file")
+    parser.add_argument("--strategy", type=str, choices=list(GRID), help="Only benchmark one strategy")
+    parser.add_argument("--repeats", type=int, default=20, help="Timing repetitions per configuration")
+    args = parser.parse_args()
+
+    records = load_corpus(args.corpus)
+    groups = len({r['group'] for r in records})
+    print(f"Corpus: {len(records)} articles in {groups} labelled stories\n")
+    print(f"{'strategy':<12}{'threshold':>10}{'precision':>11}{'recall':>9}{'ns/article':>13}")
+
+    for name, thresholds in GRID.items():
+        if args.strategy and name != args.strategy:
+            continue
+        for threshold in thresholds:
+            strategy = create_strategy(name, threshold=threshold)
+            precision, recall = score(records, predicted_groups(records, strategy))
+            ns = time_strategy(records, strategy, args.repeats)
+            shown = '-' if threshold is None else threshold
+            print(f"{name:<12}{shown!s:>10}{precision:>11.3f}{recall:>9.3f}{ns:>13,.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Memory footprint and latency of the summarizer and classifier per inference mode.
+
+Loads each model in fp32, int8 (dynamic quantization) and, when the optional
+`optimum[onnxruntime]` extra is installed, onnx, then reports the weight size,
+the process RSS growth while loading, the RSS after importing torch, the peak
+RSS of the whole process (what an instance's memory limit has to cover) and
+the average latency of a batch.
+Each mode is measured in a fresh subprocess so RSS numbers do not leak between them.
+
+Usage:
+    python benchmarks/bench_inference.py
+    python benchmarks/bench_inference.py --task classify --modes fp32 int8 --repeats 3
+    python benchmarks/bench_inference.py --model /path/to/local/model
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+SAMPLE_TEXTS = [
+    "The central bank raised interest rates by a quarter point on Wednesday, citing persistent inflation "
+    "in services and a labour market that has cooled more slowly than policymakers expected.",
+    "The home side came from two goals down to win the cup final in extra time, sealing a first trophy "
+    "in more than a decade in front of a sold-out stadium.",
+    "Researchers released an open-source language model that runs on a laptop, claiming accuracy close "
+    "to much larger systems on coding and reasoning benchmarks.",
+    "Wildfires forced thousands to evacuate as record temperatures and strong winds swept across the "
+    "region, with officials warning that conditions could worsen over the weekend.",
+]
+
+
+def rss_bytes() -> int:
+    """Current resident set size of this process (Linux), falling back to peak RSS elsewhere"""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except OSError:
+        import resource
+        return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def peak_rss_bytes() -> int:
+    import resource
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+def measure(task: str, model_name: str, mode: str, repeats: int) -> dict:
+    """Load one model in one mode and time it; runs inside a dedicated subprocess"""
+    import torch
+    import transformers  # noqa: F401  (import cost is not part of the model's footprint)
+    from bytebrief.agent.processor import AVAILABLE_CATEGORIES, Seq2SeqSummarizer
+    from bytebrief.agent.quantization import load_sequence_classifier, model_size_bytes
+
+    torch.manual_seed(0)
+    before = rss_bytes()
+    imported_peak = peak_rss_bytes()
+    start = time.perf_counter()
+    if task == 'summarize':
+        summarizer = Seq2SeqSummarizer(model_name, mode=mode)
+        model = summarizer.model
+        run = lambda: summarizer(SAMPLE_TEXTS, max_length=60, min_length=10)
+    else:
+        from transformers import AutoTokenizer
+        from bytebrief.agent.zero_shot import BatchedZeroShotClassifier
+
+        model = load_sequence_classifier(model_name, mode)
+        classifier = BatchedZeroShotClassifier(model, AutoTokenizer.from_pretrained(model_name), AVAILABLE_CATEGORIES)
+        run = lambda: classifier.classify(SAMPLE_TEXTS, batch_size=len(SAMPLE_TEXTS))
+    load_seconds = time.perf_counter() - start
+    loaded_rss = rss_bytes() - before
+    load_peak = peak_rss_bytes()
+
+    run()  # warm-up
+    start = time.perf_counter()
+    for _ in range(repeats):
+        run()
+    latency = (time.perf_counter() - start) / repeats
+
+    return {
+        'mode': mode,
+        'weights_mb': model_size_bytes(model) / 2**20 if isinstance(model, torch.nn.Module) else None,
+        'rss_mb': loaded_rss / 2**20,
+        'import_mb': imported_peak / 2**20,
+        'peak_mb': load_peak / 2**20,
+        'load_s': load_seconds,
+        'batch_s': latency,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark ByteBrief fp32 vs quantized inference")
+    parser.add_argument("--task", choices=['summarize', 'classify'], default='summarize')
+    parser.add_argument("--model", type=str, help="Model name or local path (defaults to the pipeline's model)")
+    parser.add_argument("--modes", nargs='+', default=['fp32', 'int8', 'onnx'], choices=['fp32', 'int8', 'onnx'])
+    parser.add_argument("--repeats", type=int, default=3, help="Timed batches per mode")
+    parser.add_argument("--worker", type=str, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    from bytebrief.agent.processor import CLASSIFIER_MODEL, SUMMARIZER_MODEL
+    model_name = args.model or (SUMMARIZER_MODEL if args.task == 'summarize' else CLASSIFIER_MODEL)
+
+    if args.worker:
+        print(json.dumps(measure(args.task, model_name, args.worker, args.repeats)))
+        return
+
+    print(f"{args.task}: {model_name}, batch of {len(SAMPLE_TEXTS)} articles\n")
+    print(f"{'mode':<6}{'weights MB':>12}{'RSS MB':>10}{'import MB':>11}{'peak MB':>9}{'load s':>9}{'batch s':>10}"
+          f"{'speedup':>9}")
+    baseline = None
+    for mode in args.modes:
+        if mode == 'onnx':
+            try:
+                import optimum.onnxruntime  # noqa: F401
+            except ImportError:
+                print(f"{mode:<6}  skipped: pip install optimum[onnxruntime]")
+                continue
+        proc = subprocess.run(
+            [sys.executable, __file__, '--task', args.task, '--model', model_name,
+             '--repeats', str(args.repeats), '--worker', mode],
+            capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            print(f"{mode:<6}  failed: {proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else proc.returncode}")
+            continue
+        result = json.loads(proc.stdout.strip().splitlines()[-1])
+        baseline = baseline or result['batch_s']
+        weights = '-' if result['weights_mb'] is None else f"{result['weights_mb']:.1f}"
+        print(
+            f"{mode:<6}{weights:>12}{result['rss_mb']:>10.1f}{result['import_mb']:>11.0f}{result['peak_mb']:>9.0f}"
+            f"{result['load_s']:>9.2f}"
+            f"{result['batch_s']:>10.3f}{baseline / result['batch_s']:>8.2f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,166 @@
+"""
+API reads while ingestion writes, with SQLite's defaults vs the production profile.
+
+Seeds an article table, then runs reader threads (the digest's newest-N and
+per-category queries) alongside writer threads that upsert chunks the way
+persistence.upsert_articles does: read the chunk's stored URLs, then insert.
+"default" is what Django gets out of the box (rollback journal, deferred
+transactions, 5 s timeout); "production" applies news_brief.sqlite.PRAGMAS,
+BEGIN IMMEDIATE and one in-process writer lock, as the app does.
+
+Usage:
+    python benchmarks/bench_sqlite_concurrency.py
+    python benchmarks/bench_sqlite_concurrency.py --readers 8 --writers 2 --seconds 10
+"""
+import argparse
+import os
+import random
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from news_brief.sqlite import apply_pragmas
+
+CATEGORIES = ['technology', 'business', 'science', 'politics', 'sports', 'health']
+SCHEMA = [
+    "CREATE TABLE article (id INTEGER PRIMARY KEY, title TEXT, content TEXT, url TEXT UNIQUE, "
+    "category_key TEXT, published_at REAL)",
+    "CREATE INDEX article_published_idx ON article (published_at DESC)",
+    "CREATE INDEX article_catkey_pub_idx ON article (category_key, published_at DESC)",
+]
+READS = [
+    ("SELECT id, title FROM article ORDER BY published_at DESC LIMIT 100", lambda: ()),
+    ("SELECT id, title FROM article WHERE category_key = ? ORDER BY published_at DESC LIMIT 30",
+     lambda: (random.choice(CATEGORIES),)),
+]
+
+
+def row(n):
+    return (f"Article {n}", "lorem ipsum " * 100, f"https://example.com/{n}", CATEGORIES[n % len(CATEGORIES)],
+            time.time() - random.random() * 86400 * 7)
+
+
+def connect(path, profile):
+    # isolation_level=None: transactions are opened explicitly below
+    if profile == 'production':
+        conn = sqlite3.connect(path, timeout=20, isolation_level=None, check_same_thread=False)
+        apply_pragmas(conn.cursor())
+    else:
+        conn = sqlite3.connect(path, timeout=5, isolation_level=None, check_same_thread=False)
+    return conn
+
+
+def seed(path, rows):
+    conn = sqlite3.connect(path)
+    for statement in SCHEMA:
+        conn.execute(statement)
+    conn.executemany("INSERT INTO article (title, content, url, category_key, published_at) VALUES (?, ?, ?, ?, ?)",
+                     (row(n) for n in range(rows)))
+    conn.commit()
+    conn.close()
+
+
+def run(profile, rows, readers, writers, seconds, chunk):
+    path = os.path.join(tempfile.mkdtemp(prefix='bench-sqlite-'), 'db.sqlite3')
+    seed(path, rows)
+    stop = threading.Event()
+    write_lock = threading.Lock() if profile == 'production' else None
+    begin = "BEGIN IMMEDIATE" if profile == 'production' else "BEGIN"
+    latencies, written, errors = [], [0], [0]
+    counter = iter(range(rows, 10**9))
+    tally = threading.Lock()
+
+    def reader():
+        conn = connect(path, profile)
+        local = []
+        while not stop.is_set():
+            sql, params = random.choice(READS)
+            started = time.perf_counter()
+            try:
+                conn.execute(sql, params()).fetchall()
+                local.append(time.perf_counter() - started)
+            except sqlite3.OperationalError:
+                with tally:
+                    errors[0] += 1
+        with tally:
+            latencies.extend(local)
+        conn.close()
+
+    def writer():
+        conn = connect(path, profile)
+        while not stop.is_set():
+            with tally:
+                batch = [row(next(counter)) for _ in range(chunk)]
+            try:
+                if write_lock:
+                    write_lock.acquire()
+                try:
+                    conn.execute(begin)
+                    try:
+                        urls = [r[2] for r in batch]
+                        conn.execute(f"SELECT url FROM article WHERE url IN ({','.join('?' * len(urls))})",
+                                     urls).fetchall()
+                        conn.executemany("INSERT INTO article (title, content, url, category_key, published_at) "
+                                         "VALUES (?, ?, ?, ?, ?)", batch)
+                        conn.execute("COMMIT")
+                    except Exception:
+                        conn.execute("ROLLBACK")
+                        raise
+                finally:
+                    if write_lock:
+                        write_lock.release()
+                with tally:
+                    written[0] += len(batch)
+            except sqlite3.OperationalError:
+                with tally:
+                    errors[0] += 1
+        conn.close()
+
+    threads = [threading.Thread(target=reader) for _ in range(readers)]
+    threads += [threading.Thread(target=writer) for _ in range(writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    shutil.rmtree(os.path.dirname(path), ignore_errors=True)
+
+    latencies.sort()
+    p99 = latencies[int(len(latencies) * 0.99)] if latencies else 0
+    return {
+        'reads/s': len(latencies) / seconds,
+        'p50 ms': (statistics.median(latencies) if latencies else 0) * 1000,
+        'p99 ms': p99 * 1000,
+        'rows written/s': written[0] / seconds,
+        'locked errors': errors[0],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare SQLite defaults with the production profile under load")
+    parser.add_argument("--rows", type=int, default=20000, help="Articles seeded before the run")
+    parser.add_argument("--readers", type=int, default=4)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--seconds", type=float, default=5)
+    parser.add_argument("--chunk", type=int, default=500, help="Rows per write transaction")
+    args = parser.parse_args()
+
+    print(f"{args.rows} rows, {args.readers} readers, {args.writers} writers, {args.seconds:g}s, "
+          f"chunks of {args.chunk}\n")
+    print(f"{'profile':<12}{'reads/s':>10}{'p50 ms':>9}{'p99 ms':>9}{'rows written/s':>16}{'locked errors':>15}")
+    for profile in ('default', 'production'):
+        result = run(profile, args.rows, args.readers, args.writers, args.seconds, args.chunk)
+        print(f"{profile:<12}{result['reads/s']:>10.0f}{result['p50 ms']:>9.2f}{result['p99 ms']:>9.2f}"
+              f"{result['rows written/s']:>16.0f}{result['locked errors']:>15}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,108 @@
+"""
+Quality/latency comparison of the extractive summarizers against distilbart.
+
+Summarizes every article of a saved corpus with reference summaries and
+reports ROUGE-1/2/L F1 plus throughput, so a deployment can decide whether
+the model is worth its CPU and RAM. distilbart is skipped when it cannot be
+loaded (no transformers, no network for the first download, BYTEBRIEF_INFERENCE_MODE=off).
+
+Usage:
+    python benchmarks/bench_summarizers.py
+    python benchmarks/bench_summarizers.py --skip-abstractive --repeats 200
+"""
+import argparse
+import json
+import re
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from bytebrief.agent.extractive import SUMMARIZER_METHODS, ExtractiveSummarizer
+
+DEFAULT_CORPUS = Path(__file__).resolve().parent / "data" / "summary_corpus.json"
+
+
+def load_corpus(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def tokens(text):
+    return re.findall(r"[a-z0-9]+", text.lower())
+
+
+def _f1(overlap, predicted, reference):
+    if not predicted or not reference or not overlap:
+        return 0.0
+    precision, recall = overlap / predicted, overlap / reference
+    return 2 * precision * recall / (precision + recall)
+
+
+def rouge_n(candidate, reference, n):
+    grams = lambda words: Counter(tuple(words[i:i + n]) for i in range(len(words) - n + 1))
+    c, r = grams(tokens(candidate)), grams(tokens(reference))
+    return _f1(sum((c & r).values()), sum(c.values()), sum(r.values()))
+
+
+def rouge_l(candidate, reference):
+    c, r = tokens(candidate), tokens(reference)
+    previous = [0] * (len(r) + 1)
+    for word in c:
+        current = [0]
+        for j, ref_word in enumerate(r):
+            current.append(previous[j] + 1 if word == ref_word else max(previous[j + 1], current[j]))
+        previous = current
+    return _f1(previous[-1], len(c), len(r))
+
+
+def evaluate(name, summarize, records, repeats):
+    """Mean ROUGE F1 over the corpus and articles/s over `repeats` passes"""
+    summaries = summarize([r['content'] for r in records])
+    start = time.perf_counter()
+    for _ in range(repeats - 1):
+        summarize([r['content'] for r in records])
+    elapsed = time.perf_counter() - start
+    per_second = len(records) * (repeats - 1) / elapsed if repeats > 1 and elapsed > 0 else None
+
+    scores = [
+        (rouge_n(s, r['reference'], 1), rouge_n(s, r['reference'], 2), rouge_l(s, r['reference']))
+        for s, r in zip(summaries, records)
+    ]
+    means = [sum(column) / len(scores) for column in zip(*scores)]
+    length = sum(len(s) for s in summaries) / len(summaries)
+    rate = '-' if per_second is None else f"{per_second:,.1f}"
+    print(f"{name:<22}{means[0]:>8.3f}{means[1]:>8.3f}{means[2]:>8.3f}{length:>10.0f}{rate:>14}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare ByteBrief summarizers on a reference corpus")
+    parser.add_argument("--corpus", type=str, default=str(DEFAULT_CORPUS), help="JSON list with content and reference")
+    parser.add_argument("--repeats", type=int, default=50, help="Timed passes over the corpus for extractive methods")
+    parser.add_argument("--skip-abstractive", action="store_true", help="Do not load distilbart")
+    args = parser.parse_args()
+
+    records = load_corpus(args.corpus)
+    print(f"Corpus: {len(records)} articles with reference summaries\n")
+    print(f"{'summarizer':<22}{'R-1':>8}{'R-2':>8}{'R-L':>8}{'avg chars':>10}{'articles/s':>14}")
+
+    evaluate('lead (first 497 chars)', lambda texts: [t[:497] + '...' for t in texts], records, args.repeats)
+    for method in SUMMARIZER_METHODS:
+        summarizer = ExtractiveSummarizer(method=method)
+        evaluate(f'extractive {method}', lambda texts: [d['summary_text'] for d in summarizer(texts)], records, args.repeats)
+
+    if args.skip_abstractive:
+        return
+    from bytebrief.agent.processor import SUMMARY_GENERATION, load_summarizer
+    model = load_summarizer()
+    if model is None:
+        print(f"{'distilbart':<22}  skipped: model could not be loaded")
+        return
+    # A couple of passes only: generation is several orders of magnitude slower
+    evaluate('distilbart', lambda texts: [d['summary_text'] for d in model(texts, **SUMMARY_GENERATION)], records, 2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Per-worker memory with and without models preloaded before fork.
+
+Mimics gunicorn: a parent process forks N workers that each run one
+summarization. In "per-worker" mode every worker loads its own copy of the
+model; in "shared" mode the parent loads it once before forking (as
+gunicorn.conf.py does with BYTEBRIEF_PRELOAD_MODELS=1). RSS counts shared pages
+in every worker, so PSS (shared pages split between sharers) is the number
+to compare. Linux only (uses fork and /proc/<pid>/smaps_rollup).
+
+Usage:
+    python benchmarks/bench_worker_memory.py --workers 3
+    python benchmarks/bench_worker_memory.py --model /path/to/local/model --mode int8
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from bytebrief.utils.memory import process_memory
+
+TEXT = (
+    "The central bank raised interest rates by a quarter point on Wednesday, citing persistent inflation "
+    "in services and a labour market that has cooled more slowly than policymakers expected."
+)
+
+
+def run_workers(model_name, mode, workers, shared):
+    from bytebrief.agent.processor import Seq2SeqSummarizer
+
+    summarizer = None
+    if shared:
+        summarizer = Seq2SeqSummarizer(model_name, mode=mode)
+        gc.collect()
+        gc.freeze()
+
+    pipes = []
+    for _ in range(workers):
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            import torch
+            torch.set_num_threads(max(1, (os.cpu_count() or 1) // workers))
+            model = summarizer or Seq2SeqSummarizer(model_name, mode=mode)
+            model([TEXT], max_length=30, min_length=5)
+            with os.fdopen(write_fd, 'w') as out:
+                out.write(json.dumps(process_memory()))
+            os._exit(0)
+        os.close(write_fd)
+        pipes.append((pid, read_fd))
+
+    # Read every report before reaping so all workers are alive (and sharing) when measured
+    results = []
+    for pid, read_fd in pipes:
+        with os.fdopen(read_fd) as inp:
+            results.append(json.loads(inp.read()))
+    for pid, _ in pipes:
+        os.waitpid(pid, 0)
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare per-worker memory with shared vs private model weights")
+    parser.add_argument("--model", type=str, help="Model name or local path (defaults to the pipeline summarizer)")
+    parser.add_argument("--mode", choices=['fp32', 'int8'], default='fp32', help="Inference mode to load the model in")
+    parser.add_argument("--workers", type=int, default=3)
+    parser.add_argument("--worker", choices=['shared', 'per-worker'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    from bytebrief.agent.processor import SUMMARIZER_MODEL
+    model_name = args.model or SUMMARIZER_MODEL
+
+    if args.worker:
+        results = run_workers(model_name, args.mode, args.workers, shared=args.worker == 'shared')
+        print(json.dumps(results))
+        return
+
+    import subprocess
+    print(f"{model_name} ({args.mode}), {args.workers} forked workers\n")
+    print(f"{'mode':<12}{'RSS MB/worker':>15}{'PSS MB/worker':>15}{'shared MB':>11}{'total PSS MB':>14}")
+    for mode in ('per-worker', 'shared'):
+        # Fresh interpreter per mode so the first run cannot leave pages behind for the second
+        proc = subprocess.run(
+            [sys.executable, __file__, '--model', model_name, '--mode', args.mode,
+             '--workers', str(args.workers), '--worker', mode],
+            capture_output=True, text=True,
+        )
+        if proc.returncode != 0:
+            print(f"{mode:<12}  failed: {proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else proc.returncode}")
+            continue
+        results = json.loads(proc.stdout.strip().splitlines()[-1])
+        mb = lambda key: sum(r[key] for r in results) / len(results) / 2**20
+        total_pss = sum(r['pss'] for r in results) / 2**20
+        print(f"{mode:<12}{mb('rss'):>15.1f}{mb('pss'):>15.1f}{mb('shared'):>11.1f}{total_pss:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""
+Gunicorn configuration for ByteBrief (picked up automatically from the backend directory).
+
+    gunicorn bytebrief_web.wsgi
+
+With BYTEBRIEF_PRELOAD_MODELS=1 the Django app and the ML models are loaded once
+in the master before it forks. safetensors checkpoints are memory-mapped by
+transformers, and since workers only read the weights, their pages stay shared
+copy-on-write instead of every worker holding a private copy. Each worker logs
+its RSS/PSS after start-up; benchmarks/bench_worker_memory.py compares both modes.
+
+Environment:
+    PORT                      listen port (default 8000)
+    WEB_CONCURRENCY           worker processes (default 2)
+    GUNICORN_TIMEOUT          worker timeout in seconds (default 120)
+    BYTEBRIEF_PRELOAD_MODELS  1 to load models in the master and share them
+    BYTEBRIEF_TORCH_THREADS   torch threads per worker (default: cores / workers)
+"""
+import gc
+import os
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent
+sys.path.append(str(BASE_DIR / "src"))
+
+bind = f"0.0.0.0:{os.environ.get('PORT', '8000')}"
+workers = int(os.environ.get('WEB_CONCURRENCY', 2))
+timeout = int(os.environ.get('GUNICORN_TIMEOUT', 120))
+
+PRELOAD_MODELS = os.environ.get('BYTEBRIEF_PRELOAD_MODELS', '').lower() in ('1', 'true', 'yes')
+preload_app = PRELOAD_MODELS
+
+if PRELOAD_MODELS:
+    # The scheduler and cold-start threads would otherwise start in the master
+    os.environ['BYTEBRIEF_DEFER_BACKGROUND_SERVICES'] = '1'
+
+
+def _pipeline_settings():
+    import yaml
+    try:
+        with open(BASE_DIR / "config" / "settings.yaml", 'r') as f:
+            return yaml.safe_load(f) or {}
+    except FileNotFoundError:
+        return {}
+
+
+def when_ready(server):
+    """Runs in the master after the app is loaded and before any worker is forked"""
+    if not PRELOAD_MODELS:
+        return
+    from django.db import connections
+    from bytebrief.agent.processor import preload_models
+    from bytebrief.utils.memory import format_memory, process_memory
+
+    # Load weights only: running a forward pass here would start torch's thread
+    # pool in the master, which does not survive fork
+    preload_models(_pipeline_settings())
+    # Sockets must not be shared with the children
+    connections.close_all()
+    # Keep the garbage collector from touching (and so un-sharing) preloaded objects
+    gc.collect()
+    gc.freeze()
+    server.log.info(f"Models preloaded in master: {format_memory(process_memory())}")
+
+
+def post_fork(server, worker):
+    from bytebrief.agent.processor import set_inference_threads
+
+    threads = os.environ.get('BYTEBRIEF_TORCH_THREADS')
+    set_inference_threads(int(threads) if threads else max(1, (os.cpu_count() or 1) // server.cfg.workers))
+
+
+def post_worker_init(worker):
+    from bytebrief.utils.memory import format_memory, process_memory
+
+    if PRELOAD_MODELS:
+        from news_brief.apps import start_background_services
+        start_background_services()
+    worker.log.info(
+        f"Worker {worker.pid} ready ({'shared' if PRELOAD_MODELS else 'per-worker'} models): "
+        f"{format_memory(process_memory())}"
+    )
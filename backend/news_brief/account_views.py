@@ -54,7 +54,11 @@ class DeleteAccountView(APIView):
         user.delete()
         return Response({'message': 'Account deleted successfully.'})
 
-from .models import UserPreference, ReadingHistory, Notification, SupportTicket, Article as DBArticle
+from django.db.models import Exists, OuterRef
+from .models import (
+    UserPreference, ReadingHistory, Notification, BroadcastNotification, BroadcastRead, SupportTicket,
+    Article as DBArticle,
+)
 import django.utils.timezone
 
 class UserSettingsView(APIView):
@@ -73,7 +77,7 @@ class UserSettingsView(APIView):
 class ReadingHistoryView(APIView):
     permission_classes = [IsAuthenticated]
     def get(self, request):
-        history = ReadingHistory.objects.filter(user=request.user)[:50]
+        history = ReadingHistory.objects.filter(user=request.user).select_related('article__publisher').defer('article__content')[:50]
         data = [{
             'id': h.article.id,
             'title': h.article.title,
@@ -96,24 +100,41 @@ class ReadingHistoryView(APIView):
         except DBArticle.DoesNotExist:
             return Response({'error': 'Article not found'}, status=404)
 
+# Broadcast ids are prefixed so they can't collide with personal notification ids
+BROADCAST_PREFIX = 'broadcast-'
+NOTIFICATIONS_LIMIT = 20
+
 class NotificationView(APIView):
     permission_classes = [IsAuthenticated]
     def get(self, request):
-        notifs = Notification.objects.filter(user=request.user).order_by('-created_at')[:20]
+        personal = Notification.objects.filter(user=request.user).order_by('-created_at')[:NOTIFICATIONS_LIMIT]
+        # Broadcasts from before the account existed are not shown
+        broadcasts = BroadcastNotification.objects.filter(created_at__gte=request.user.date_joined).annotate(
+            is_read=Exists(BroadcastRead.objects.filter(user=request.user, broadcast=OuterRef('pk')))
+        ).order_by('-created_at')[:NOTIFICATIONS_LIMIT]
+        merged = sorted([*personal, *broadcasts], key=lambda n: n.created_at, reverse=True)[:NOTIFICATIONS_LIMIT]
         data = [{
-            'id': n.id, 'title': n.title, 'message': n.message,
+            'id': f'{BROADCAST_PREFIX}{n.id}' if isinstance(n, BroadcastNotification) else n.id,
+            'title': n.title, 'message': n.message,
             'is_read': n.is_read, 'created_at': n.created_at.isoformat()
-        } for n in notifs]
+        } for n in merged]
         return Response(data)
         
     def post(self, request):
-        notif_id = request.data.get('notification_id')
+        notif_id = str(request.data.get('notification_id'))
+        if notif_id.startswith(BROADCAST_PREFIX):
+            broadcast_id = notif_id[len(BROADCAST_PREFIX):]
+            broadcast = BroadcastNotification.objects.filter(id=broadcast_id).first() if broadcast_id.isdigit() else None
+            if broadcast is None:
+                return Response({'error': 'not found'}, status=404)
+            BroadcastRead.objects.get_or_create(user=request.user, broadcast=broadcast)
+            return Response({'status': 'ok'})
         try:
             n = Notification.objects.get(id=notif_id, user=request.user)
             n.is_read = True
             n.save()
             return Response({'status': 'ok'})
-        except Notification.DoesNotExist:
+        except (Notification.DoesNotExist, ValueError):
             return Response({'error': 'not found'}, status=404)
 
 class SupportTicketView(APIView):
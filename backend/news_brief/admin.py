@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Publisher, Article, UserPreference, Bookmark, SupportTicket
+from .models import Publisher, Article, UserPreference, Bookmark, SupportTicket, StoryCluster
 
 @admin.register(SupportTicket)
 class SupportTicketAdmin(admin.ModelAdmin):
@@ -20,10 +20,17 @@ class PublisherAdmin(admin.ModelAdmin):
 @admin.register(Article)
 class ArticleAdmin(admin.ModelAdmin):
     list_display = ('title', 'publisher', 'category', 'published_at')
-    list_filter = ('category', 'publisher')
+    list_filter = ('category', 'publisher', 'enrichment_state')
     search_fields = ('title', 'summary')
     date_hierarchy = 'published_at'
 
+@admin.register(StoryCluster)
+class StoryClusterAdmin(admin.ModelAdmin):
+    list_display = ('title', 'category', 'article_count', 'last_seen_at')
+    list_filter = ('category',)
+    search_fields = ('title',)
+    date_hierarchy = 'last_seen_at'
+
 @admin.register(UserPreference)
 class UserPreferenceAdmin(admin.ModelAdmin):
     list_display = ('user', 'created_at')
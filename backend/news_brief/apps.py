@@ -32,29 +32,39 @@ class NewsBriefConfig(AppConfig):
                       any('gunicorn' in arg for arg in sys.argv)
 
         if run_main or is_gunicorn:
-            try:
-                from .scheduler import start_scheduler
-                start_scheduler()
-                logger.info("✅ APScheduler started successfully.")
-            except Exception as e:
-                logger.error(f"Failed to start news scheduler: {e}", exc_info=True)
-
-            # On cold-start: if article DB is empty, trigger immediate scrape in background
-            try:
-                from .models import Article
-                if Article.objects.count() == 0:
-                    logger.info("📭 Database is empty on startup — triggering background scrape...")
-                    import threading
-                    from django.core.management import call_command
-
-                    def initial_scrape():
-                        try:
-                            call_command('scrape_news')
-                            logger.info("✅ Cold-start scrape completed.")
-                        except Exception as ex:
-                            logger.error(f"❌ Cold-start scrape failed: {ex}", exc_info=True)
-
-                    thread = threading.Thread(target=initial_scrape, daemon=True)
-                    thread.start()
-            except Exception as e:
-                logger.error(f"Could not check article DB on startup: {e}", exc_info=True)
+            # With BYTEBRIEF_PRELOAD_MODELS the app is imported in the gunicorn master
+            # before fork; threads must not be started there, so each worker starts
+            # them from gunicorn.conf.py's post_worker_init instead.
+            if os.environ.get('BYTEBRIEF_DEFER_BACKGROUND_SERVICES') == '1':
+                return
+            start_background_services()
+
+
+def start_background_services():
+    """Start the APScheduler jobs and, on an empty DB, a cold-start scrape."""
+    try:
+        from .scheduler import start_scheduler
+        start_scheduler()
+        logger.info("✅ APScheduler started successfully.")
+    except Exception as e:
+        logger.error(f"Failed to start news scheduler: {e}", exc_info=True)
+
+    # On cold-start: if article DB is empty, trigger immediate scrape in background
+    try:
+        from .models import Article
+        if Article.objects.count() == 0:
+            logger.info("📭 Database is empty on startup — triggering background scrape...")
+            import threading
+            from django.core.management import call_command
+
+            def initial_scrape():
+                try:
+                    call_command('scrape_news')
+                    logger.info("✅ Cold-start scrape completed.")
+                except Exception as ex:
+                    logger.error(f"❌ Cold-start scrape failed: {ex}", exc_info=True)
+
+            thread = threading.Thread(target=initial_scrape, daemon=True)
+            thread.start()
+    except Exception as e:
+        logger.error(f"Could not check article DB on startup: {e}", exc_info=True)
@@ -0,0 +1,148 @@
+"""
+Primary/replica routing for API reads.
+
+Reads go to the replica only inside a request that was marked read-only by
+ReplicaRoutingMiddleware (GET/HEAD/OPTIONS, or a view decorated with
+@replica_reads). Everything else (writes, the scheduler's ingestion,
+management commands) stays on the primary. A request that writes is pinned to
+the primary for the rest of the request, and a short-lived cookie keeps the
+same client on the primary until the replica has caught up with its write.
+If the replica is unreachable or lags by more than REPLICA_MAX_LAG_SECONDS,
+reads fall back to the primary.
+
+Configured with DATABASE_REPLICA_URL (parsed like DATABASE_URL); without it
+all routing returns the default database.
+"""
+import logging
+import threading
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS, connections
+
+logger = logging.getLogger(__name__)
+
+PIN_COOKIE = 'bb_primary'
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+# A failed or lagging replica is re-checked after this many seconds
+RECHECK_SECONDS = 30
+
+
+class _RouteState:
+    __slots__ = ('replica', 'wrote')
+
+    def __init__(self, replica: bool):
+        self.replica = replica
+        self.wrote = False
+
+
+_state: ContextVar[Optional[_RouteState]] = ContextVar('bytebrief_db_route', default=None)
+
+
+def replica_reads(view):
+    """Mark a non-GET view as read-only, e.g. a search endpoint that takes a POST body"""
+    view.replica_reads = True
+    return view
+
+
+class ReplicaHealth:
+    """Caches whether the replica is reachable and within the allowed lag"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._checked_at = 0.0
+        self._healthy = True
+
+    def healthy(self, alias: str) -> bool:
+        now = time.monotonic()
+        interval = RECHECK_SECONDS if not self._healthy else getattr(settings, 'REPLICA_CHECK_SECONDS', 5)
+        if now - self._checked_at < interval:
+            return self._healthy
+        with self._lock:
+            if now - self._checked_at < interval:
+                return self._healthy
+            healthy = self._check(alias)
+            if healthy != self._healthy:
+                logger.warning(f"Read replica '{alias}' {'back in service' if healthy else 'unavailable; reading from primary'}")
+            self._healthy, self._checked_at = healthy, now
+            return healthy
+
+    @staticmethod
+    def _check(alias: str) -> bool:
+        try:
+            connection = connections[alias]
+            connection.ensure_connection()
+            if connection.vendor != 'postgresql':
+                return True
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT CASE WHEN pg_is_in_recovery() "
+                    "THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) ELSE 0 END"
+                )
+                lag = float(cursor.fetchone()[0])
+            return lag <= getattr(settings, 'REPLICA_MAX_LAG_SECONDS', 5)
+        except Exception as e:
+            logger.warning(f"Read replica '{alias}' check failed: {e}")
+            return False
+
+    def reset(self):
+        with self._lock:
+            self._checked_at, self._healthy = 0.0, True
+
+
+replica_health = ReplicaHealth()
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        alias = getattr(settings, 'REPLICA_DATABASE', None)
+        state = _state.get()
+        if not alias or state is None or not state.replica:
+            return DEFAULT_DB_ALIAS
+        # Related objects follow the instance they were loaded from
+        instance = hints.get('instance')
+        if instance is not None and instance._state.db:
+            return instance._state.db
+        return alias if replica_health.healthy(alias) else DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        state = _state.get()
+        if state is not None:
+            # Read-your-writes for the rest of this request
+            state.replica = False
+            state.wrote = True
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != getattr(settings, 'REPLICA_DATABASE', None)
+
+
+class ReplicaRoutingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        state = _RouteState(replica=False)
+        token = _state.set(state)
+        try:
+            response = self.get_response(request)
+        finally:
+            _state.reset(token)
+        if state.wrote:
+            response.set_cookie(
+                PIN_COOKIE, '1', max_age=getattr(settings, 'REPLICA_PIN_SECONDS', 10), httponly=True, samesite='Lax',
+            )
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        state = _state.get()
+        if state is not None and not state.wrote:
+            read_only = request.method in SAFE_METHODS or getattr(view_func, 'replica_reads', False)
+            state.replica = read_only and PIN_COOKIE not in request.COOKIES
+        return None
@@ -0,0 +1,70 @@
+"""
+Custom model fields
+"""
+import zlib
+
+from django.db import models
+
+
+class CompressedTextField(models.BinaryField):
+    """
+    Text stored zlib-compressed; reads and writes str.
+
+    The column holds bytes behind a one-byte codec marker, so short values
+    that don't shrink are stored raw and another codec could be added without
+    rewriting old rows. The database can't look inside the value: no
+    filtering, ordering or full-text indexing on this column.
+    """
+    RAW = b'\x00'
+    ZLIB = b'\x01'
+    # Below this many bytes the zlib header outweighs the savings
+    MIN_COMPRESS_BYTES = 64
+
+    def __init__(self, *args, level: int = 6, **kwargs):
+        self.level = level
+        kwargs.setdefault('editable', True)
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        if self.level != 6:
+            kwargs['level'] = self.level
+        return name, path, args, kwargs
+
+    def compress(self, text: str) -> bytes:
+        raw = text.encode('utf-8')
+        if len(raw) >= self.MIN_COMPRESS_BYTES:
+            packed = zlib.compress(raw, self.level)
+            if len(packed) < len(raw):
+                return self.ZLIB + packed
+        return self.RAW + raw
+
+    @classmethod
+    def decompress(cls, value) -> str:
+        value = bytes(value)
+        marker, payload = value[:1], value[1:]
+        if marker == cls.ZLIB:
+            payload = zlib.decompress(payload)
+        elif marker != cls.RAW:
+            raise ValueError(f"Unknown compression marker {marker!r}")
+        return payload.decode('utf-8')
+
+    def get_prep_value(self, value):
+        if isinstance(value, str):
+            return self.compress(value)
+        return super().get_prep_value(value)
+
+    def from_db_value(self, value, expression, connection):
+        return None if value is None else self.decompress(value)
+
+    def to_python(self, value):
+        if value is None or isinstance(value, str):
+            return value
+        return self.decompress(value)
+
+    def get_default(self):
+        default = super().get_default()
+        return '' if default == b'' else default
+
+    def value_to_string(self, obj):
+        return self.value_from_object(obj)
@@ -24,12 +24,18 @@ class Command(BaseCommand):
         try:
             from bytebrief.core.models import ClientConfig
             from bytebrief.agent.orchestrator import AgentOrchestrator
+            from bytebrief.agent.enrichment import wait_for_enrichment
 
             orch = AgentOrchestrator()
             result = orch.run(ClientConfig(name="ManualScrape", categories=["global"]))
 
             count = len(result) if result else 0
             self.stdout.write(self.style.SUCCESS(f"Scrape complete. Processed {count} articles."))
+
+            # Articles are already live; finish summaries/categories before the command exits
+            self.stdout.write(self.style.NOTICE("Waiting for background enrichment to finish..."))
+            wait_for_enrichment()
+            self.stdout.write(self.style.SUCCESS("Enrichment complete."))
         except Exception as e:
             self.stderr.write(self.style.ERROR(f"Scrape failed: {e}"))
             logger.error(f"manual scrape_news failed: {e}", exc_info=True)
@@ -0,0 +1,81 @@
+"""
+Management command to run the shared ML model server.
+
+Loads the summarizer and zero-shot classifier once and serves batched requests
+to every gunicorn worker / scheduler thread that has BYTEBRIEF_MODEL_SERVER set.
+Needs BYTEBRIEF_MODEL_SERVER_AUTHKEY (the same value in every client) and only
+binds to localhost or a unix socket.
+
+Usage:
+    python manage.py serve_models
+    python manage.py serve_models --address 127.0.0.1:8765
+"""
+import logging
+import os
+import sys
+from pathlib import Path
+from django.core.management.base import BaseCommand
+
+logger = logging.getLogger(__name__)
+
+
+class Command(BaseCommand):
+    help = "Load the summarizer and classifier once and serve them to local clients over a socket."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--address',
+            default=None,
+            help='host:port or unix socket path (defaults to $BYTEBRIEF_MODEL_SERVER or 127.0.0.1:8765)',
+        )
+        parser.add_argument(
+            '--classifier-backend',
+            choices=['nli', 'embedding'],
+            default='nli',
+            help='Category classifier to serve; should match ml.classifier_backend in settings.yaml',
+        )
+
+    def handle(self, *args, **options):
+        # Ensure src directory is on the path
+        sys.path.append(str(Path(__file__).resolve().parent.parent.parent.parent / "src"))
+
+        from bytebrief.agent.model_server import (
+            AUTHKEY_ENV, DEFAULT_ADDRESS, ModelServer, ModelServerConfigError, is_local_address, model_server_address,
+            parse_address,
+        )
+        from bytebrief.agent.processor import load_batched_classifier, load_embedding_classifier, load_summarizer
+
+        address = options['address'] or model_server_address() or DEFAULT_ADDRESS
+        # Checked before the (slow) model load; ModelServer enforces the same
+        if not os.environ.get(AUTHKEY_ENV):
+            self.stderr.write(self.style.ERROR(f"{AUTHKEY_ENV} is not set; refusing to start the model server."))
+            return
+        if not is_local_address(parse_address(address)):
+            self.stderr.write(self.style.ERROR(f"{address} is not a loopback address or unix socket; refusing to start."))
+            return
+
+        self.stdout.write(self.style.NOTICE("Loading ML models for the model server..."))
+        summarizer = load_summarizer()
+        if options['classifier_backend'] == 'embedding':
+            classifier = load_embedding_classifier()
+        else:
+            classifier = load_batched_classifier()
+        if summarizer is None and classifier is None:
+            self.stderr.write(self.style.ERROR("No model could be loaded; refusing to start an empty model server."))
+            return
+
+        try:
+            server = ModelServer(address, summarizer=summarizer, classifier=classifier)
+        except ModelServerConfigError as e:
+            self.stderr.write(self.style.ERROR(f"{e}; refusing to start the model server."))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"Model server ready on {server.address} "
+            f"(summarizer: {'yes' if summarizer else 'no'}, classifier: {'yes' if classifier else 'no'})"
+        ))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.close()
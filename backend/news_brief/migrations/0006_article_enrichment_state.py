@@ -0,0 +1,18 @@
+# Generated by Django 6.0.1 on 2026-10-19 05:30
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news_brief', '0005_inferencecacheentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='enrichment_state',
+            field=models.CharField(choices=[('pending', 'Pending'), ('pending_summary', 'Pending summary'), ('done', 'Done'), ('failed', 'Failed')], db_index=True, default='done', max_length=20),
+        ),
+    ]
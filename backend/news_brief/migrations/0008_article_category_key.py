@@ -0,0 +1,27 @@
+# Generated by Django 6.0.1 on 2026-10-19 05:38
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news_brief', '0007_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='article',
+            name='article_category_pub_idx',
+        ),
+        migrations.AddField(
+            model_name='article',
+            name='category_key',
+            field=models.GeneratedField(db_persist=True, expression=django.db.models.functions.text.Lower('category'), output_field=models.CharField(max_length=100, null=True)),
+        ),
+        migrations.AddIndex(
+            model_name='article',
+            index=models.Index(fields=['category_key', '-published_at'], name='article_catkey_pub_idx'),
+        ),
+    ]
@@ -0,0 +1,24 @@
+# Generated by Django 6.0.1 on 2026-10-19 05:40
+
+from django.db import migrations
+
+
+def install_search_index(apps, schema_editor):
+    from news_brief import search
+    search.install(schema_editor.connection)
+
+
+def uninstall_search_index(apps, schema_editor):
+    from news_brief import search
+    search.uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news_brief', '0008_article_category_key'),
+    ]
+
+    operations = [
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 6.0.1 on 2026-10-19 05:50
+
+from django.db import migrations, models
+
+
+def backfill_content_hash(apps, schema_editor):
+    from news_brief.models import article_content_hash
+
+    Article = apps.get_model('news_brief', 'Article')
+    db = schema_editor.connection.alias
+    batch = []
+    for article in Article.objects.using(db).only('id', 'title', 'content', 'image_url').iterator(chunk_size=1000):
+        article.content_hash = article_content_hash(article.title, article.content, article.image_url)
+        batch.append(article)
+        if len(batch) >= 1000:
+            Article.objects.using(db).bulk_update(batch, ['content_hash'])
+            batch = []
+    if batch:
+        Article.objects.using(db).bulk_update(batch, ['content_hash'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news_brief', '0009_article_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='article',
+            name='content_hash',
+            field=models.CharField(blank=True, default='', max_length=64),
+        ),
+        migrations.RunPython(backfill_content_hash, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,46 @@
+# Generated by Django 6.0.1 on 2026-10-19 05:59
+
+import django.db.models.deletion
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+def install_search_index(apps, schema_editor):
+    from news_brief import search
+    search.install(schema_editor.connection, search.ARCHIVE)
+
+
+def uninstall_search_index(apps, schema_editor):
+    from news_brief import search
+    search.uninstall(schema_editor.connection, search.ARCHIVE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news_brief', '0010_article_content_hash'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedArticle',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('title', models.CharField(max_length=500)),
+                ('summary', models.TextField()),
+                ('category', models.CharField(blank=True, max_length=100, null=True)),
+                ('category_key', models.GeneratedField(db_persist=True, expression=django.db.models.functions.text.Lower('category'), output_field=models.CharField(max_length=100, null=True))),
+                ('url', models.URLField(max_length=1000, unique=True)),
+                ('image_url', models.URLField(blank=True, max_length=1000, null=True)),
+                ('published_at', models.DateTimeField()),
+                ('content_hash', models.CharField(blank=True, default='', max_length=64)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+                ('publisher', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='archived_articles', to='news_brief.publisher')),
+            ],
+            options={
+                'ordering': ['-published_at'],
+                'indexes': [models.Index(fields=['-published_at'], name='archive_published_idx')],
+            },
+        ),
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 6.0.1 on 2026-10-19 06:10
+
+from django.db import migrations, models
+
+import news_brief.fields
+
+
+def copy_content(source, target):
+    def copy(apps, schema_editor):
+        Article = apps.get_model('news_brief', 'Article')
+        db = schema_editor.connection.alias
+        batch = []
+        for article in Article.objects.using(db).only('id', source).iterator(chunk_size=1000):
+            setattr(article, target, getattr(article, source))
+            batch.append(article)
+            if len(batch) >= 1000:
+                Article.objects.using(db).bulk_update(batch, [target])
+                batch = []
+        if batch:
+            Article.objects.using(db).bulk_update(batch, [target])
+    return copy
+
+
+def install_search_index(apps, schema_editor):
+    from news_brief import search
+    search.install(schema_editor.connection)
+
+
+def uninstall_search_index(apps, schema_editor):
+    from news_brief import search
+    search.uninstall(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('news_brief', '0011_archivedarticle'),
+    ]
+
+    operations = [
+        # The index covered content; it is rebuilt over title and summary at the end
+        migrations.RunPython(uninstall_search_index, install_search_index),
+        migrations.AddField(
+            model_name='article',
+            name='content_compressed',
+            field=news_brief.fields.CompressedTextField(blank=True, null=True),
+        ),
+        migrations.RunPython(copy_content('content', 'content_compressed'), copy_content('content_compressed', 'content')),
+        migrations.RemoveField(
+            model_name='article',
+            name='content',
+        ),
+        migrations.RenameField(
+            model_name='article',
+            old_name='content_compressed',
+            new_name='content',
+        ),
+        migrations.RunPython(install_search_index, uninstall_search_index),
+    ]
@@ -1,7 +1,12 @@
+import hashlib
+
 from django.db import models
+from django.db.models.functions import Lower
 from django.contrib.auth import get_user_model
 from django.utils import timezone
 
+from .fields import CompressedTextField
+
 User = get_user_model()
 
 class Publisher(models.Model):
@@ -15,19 +20,112 @@ class Publisher(models.Model):
     def __str__(self):
         return self.name
 
+class StoryCluster(models.Model):
+    """
+    A group of articles from different outlets covering the same story.
+    The 64-bit simhash fingerprint is split into four 16-bit bands so that any
+    fingerprint within 3 bits of this one shares at least one band exactly,
+    which lets new articles find their cluster with an indexed lookup.
+    """
+    title = models.CharField(max_length=500)
+    category = models.CharField(max_length=100, blank=True, null=True)
+    fingerprint = models.BigIntegerField()
+    band_0 = models.IntegerField(db_index=True)
+    band_1 = models.IntegerField(db_index=True)
+    band_2 = models.IntegerField(db_index=True)
+    band_3 = models.IntegerField(db_index=True)
+    article_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_seen_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    class Meta:
+        ordering = ['-last_seen_at']
+
+    def __str__(self):
+        return f"{self.title} ({self.article_count} articles)"
+
+def article_content_hash(title, content, image_url) -> str:
+    """Fingerprint of the scraped fields; re-ingesting a URL only writes when it changes"""
+    payload = '\0'.join(value or '' for value in (title, content, image_url))
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ArticleManager(models.Manager):
+    """
+    Leaves the compressed content column out of every query; it loads on first
+    access to .content, or up front with .defer(None) (also before .only(...,
+    'content'): only() alone keeps the manager's deferral).
+    """
+    def get_queryset(self):
+        return super().get_queryset().defer('content')
+
+
 class Article(models.Model):
+    ENRICHMENT_STATES = [
+        ('pending', 'Pending'),
+        ('pending_summary', 'Pending summary'),
+        ('done', 'Done'),
+        ('failed', 'Failed'),
+    ]
+
     title = models.CharField(max_length=500)
     summary = models.TextField()
-    content = models.TextField(blank=True, null=True)
+    # Full scraped text, zlib-compressed and deferred by default; the API serves it per article
+    content = CompressedTextField(blank=True, null=True)
     category = models.CharField(max_length=100, blank=True, null=True)
+    # Lower-cased category, maintained by the database so bulk writes can't miss it;
+    # API filters arrive as 'tech' while the pipeline stores 'Tech'
+    category_key = models.GeneratedField(
+        expression=Lower('category'), output_field=models.CharField(max_length=100, null=True), db_persist=True,
+    )
     url = models.URLField(max_length=1000, unique=True)
     image_url = models.URLField(max_length=1000, blank=True, null=True)
     publisher = models.ForeignKey(Publisher, on_delete=models.CASCADE, related_name='articles')
+    cluster = models.ForeignKey(StoryCluster, on_delete=models.SET_NULL, blank=True, null=True, related_name='articles')
     published_at = models.DateTimeField()
     created_at = models.DateTimeField(auto_now_add=True)
+    content_hash = models.CharField(max_length=64, blank=True, default='')
+    # Published with placeholder summary/category until the background enrichment pool gets to it
+    enrichment_state = models.CharField(max_length=20, choices=ENRICHMENT_STATES, default='done', db_index=True)
+
+    objects = ArticleManager()
 
     class Meta:
         ordering = ['-published_at']
+        # Digest/email feeds read the newest window (overall, per category, per publisher);
+        # cleanup deletes by published_at. news_brief/tests.py checks the plans with EXPLAIN.
+        indexes = [
+            models.Index(fields=['-published_at'], name='article_published_idx'),
+            models.Index(fields=['category_key', '-published_at'], name='article_catkey_pub_idx'),
+            models.Index(fields=['publisher', '-published_at'], name='article_publisher_pub_idx'),
+        ]
+
+    def __str__(self):
+        return self.title
+
+class ArchivedArticle(models.Model):
+    """
+    An article moved out of the hot table by the retention job (tasks.cleanup_old_news).
+    Keeps the summary and metadata but not the scraped content, so the feed tables stay
+    small while old stories remain searchable (search.search_archive_ids).
+    """
+    title = models.CharField(max_length=500)
+    summary = models.TextField()
+    category = models.CharField(max_length=100, blank=True, null=True)
+    category_key = models.GeneratedField(
+        expression=Lower('category'), output_field=models.CharField(max_length=100, null=True), db_persist=True,
+    )
+    url = models.URLField(max_length=1000, unique=True)
+    image_url = models.URLField(max_length=1000, blank=True, null=True)
+    publisher = models.ForeignKey(Publisher, on_delete=models.SET_NULL, blank=True, null=True, related_name='archived_articles')
+    published_at = models.DateTimeField()
+    # article_content_hash() of the article when it was archived
+    content_hash = models.CharField(max_length=64, blank=True, default='')
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-published_at']
+        indexes = [models.Index(fields=['-published_at'], name='archive_published_idx')]
 
     def __str__(self):
         return self.title
@@ -50,6 +148,7 @@ class ReadingHistory(models.Model):
     class Meta:
         ordering = ['-viewed_at']
         unique_together = ('user', 'article')
+        indexes = [models.Index(fields=['user', '-viewed_at'], name='history_user_viewed_idx')]
 
     def __str__(self):
         return f"{self.user.username} read {self.article.title}"
@@ -63,10 +162,40 @@ class Notification(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [models.Index(fields=['user', '-created_at'], name='notification_user_created_idx')]
 
     def __str__(self):
         return f"Notification for {self.user.username}: {self.title}"
 
+class BroadcastNotification(models.Model):
+    """
+    A notification for every user (breaking news), stored once. NotificationView
+    merges these with each user's own Notification rows at read time; users who
+    open one get a BroadcastRead row, so writes scale with reads, not with users.
+    """
+    title = models.CharField(max_length=255)
+    message = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [models.Index(fields=['-created_at'], name='broadcast_created_idx')]
+
+    def __str__(self):
+        return f"Broadcast: {self.title}"
+
+class BroadcastRead(models.Model):
+    """Per-user read state of a BroadcastNotification"""
+    user = models.ForeignKey(User, on_delete=models.CASCADE, related_name='broadcasts_read')
+    broadcast = models.ForeignKey(BroadcastNotification, on_delete=models.CASCADE, related_name='reads')
+    read_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('user', 'broadcast')
+
+    def __str__(self):
+        return f"{self.user.username} read {self.broadcast.title}"
+
 class SupportTicket(models.Model):
     STATUS_CHOICES = (
         ('open', 'Open'),
@@ -95,6 +224,22 @@ class Bookmark(models.Model):
     class Meta:
         unique_together = ('user', 'article')
         ordering = ['-created_at']
+        indexes = [models.Index(fields=['user', '-created_at'], name='bookmark_user_created_idx')]
 
     def __str__(self):
         return f"{self.user.username} bookmarked {self.article.title}"
+
+class InferenceCacheEntry(models.Model):
+    """
+    Stored output of an ML model (summary text or category label), keyed by a
+    hash of the normalized input text, the model ID and its generation
+    parameters, so re-ingested and syndicated copies skip inference.
+    """
+    key = models.CharField(max_length=64, unique=True)
+    kind = models.CharField(max_length=20)
+    value = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+    last_used_at = models.DateTimeField(default=timezone.now, db_index=True)
+
+    def __str__(self):
+        return f"{self.kind} cache entry {self.key[:12]}"
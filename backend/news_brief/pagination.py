@@ -0,0 +1,66 @@
+"""
+Opaque keyset cursors for the feed APIs.
+
+A page is "the rows after this (timestamp, id) position, newest first", so each
+request is an index range scan of page_size + 1 rows however deep the client
+scrolls, and rows inserted meanwhile don't shift or repeat items like OFFSET
+pages would. Cursors are base64url JSON; clients pass them back unchanged.
+"""
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from django.db.models import Q, QuerySet
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(state: Dict[str, Any]) -> str:
+    return base64.urlsafe_b64encode(json.dumps(state, separators=(',', ':')).encode()).decode().rstrip('=')
+
+
+def decode_cursor(token: Optional[str]) -> Optional[Dict[str, Any]]:
+    if not token:
+        return None
+    try:
+        state = json.loads(base64.urlsafe_b64decode(token + '=' * (-len(token) % 4)))
+    except (ValueError, TypeError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+    if not isinstance(state, dict):
+        raise InvalidCursor("Invalid cursor")
+    return state
+
+
+def position(obj, field: str) -> List[Any]:
+    """Keyset position of a row: [ISO timestamp, id]"""
+    return [getattr(obj, field).isoformat(), obj.pk]
+
+
+def after(field: str, pos) -> Q:
+    """Rows strictly after `pos` in (-field, -id) order"""
+    try:
+        timestamp, pk = datetime.fromisoformat(pos[0]), int(pos[1])
+    except (TypeError, ValueError, IndexError, KeyError) as e:
+        raise InvalidCursor("Invalid cursor") from e
+    return Q(**{f'{field}__lt': timestamp}) | Q(**{field: timestamp, 'pk__lt': pk})
+
+
+def page_size(value, default: int, maximum: int) -> int:
+    """Client-chosen page size, clamped to [1, maximum]"""
+    try:
+        return max(1, min(int(value), maximum)) if value not in (None, '') else default
+    except (TypeError, ValueError):
+        return default
+
+
+def keyset_page(qs: QuerySet, field: str, cursor: Optional[str], size: int) -> Tuple[List[Any], Optional[str]]:
+    """One page of `qs` newest first by (field, id), and the cursor for the next page (None at the end)"""
+    state = decode_cursor(cursor)
+    if state is not None:
+        qs = qs.filter(after(field, state.get('after')))
+    rows = list(qs.order_by(f'-{field}', '-pk')[:size + 1])
+    next_cursor = encode_cursor({'after': position(rows[size - 1], field)}) if len(rows) > size else None
+    return rows[:size], next_cursor
@@ -39,6 +39,16 @@ def start_scheduler():
         replace_existing=True,
     )
 
+    # ── Pick up articles still pending enrichment every 10 minutes ─────────────
+    from .tasks import enrich_stale_articles_job
+    scheduler.add_job(
+        enrich_stale_articles_job,
+        trigger=IntervalTrigger(minutes=10),
+        id="enrich_stale_articles_job",
+        max_instances=1,
+        replace_existing=True,
+    )
+
     register_events(scheduler)
     scheduler.start()
     logger.info("APScheduler started — Pipeline automation runs every 6 hours, digest emailed daily at 8 AM.")
@@ -0,0 +1,202 @@
+"""
+Full-text article search: SQLite FTS5 in development, PostgreSQL tsvector + GIN in production.
+
+Both backends index title and summary (weighted in that order; content is
+stored compressed, and the summary is its abstract), are kept current by the
+database itself (FTS5 triggers / a GIN expression index), and rank matches by
+relevance decayed by age. A keyword ending in '*' matches
+as a prefix ('crypto*' finds 'cryptocurrency'); otherwise whole words match,
+stemmed, so 'ai' no longer hits 'said'.
+
+Archived articles have an index of their own,
+queried with search_archive_ids(). Where there is no full-text backend the
+API views match keywords in Python over the same title and summary, so a
+word that only appears in an article's content is found by neither.
+"""
+import logging
+from typing import Iterable, List, Optional, Tuple
+
+from django.db import connection, connections, router
+
+from bytebrief.agent.keywords import tokenize
+
+logger = logging.getLogger(__name__)
+
+# Relevance is divided by (1 + age_days / RECENCY_HALF_LIFE_DAYS)
+RECENCY_HALF_LIFE_DAYS = 3.0
+
+# Search results returned per request
+SEARCH_LIMIT = 1000
+# Only the newest matches (after the date/category filters) are scored, so very common
+# terms don't rank the whole table
+CANDIDATE_LIMIT = 5000
+
+
+class SearchIndex:
+    """Full-text index over `columns` of `table`, most important column first"""
+
+    def __init__(self, table: str, name: str, columns: Tuple[str, ...], weights: Tuple[float, ...]):
+        self.table = table
+        self.fts_table = f'{table}_fts'
+        self.pg_index = f'{name}_search_gin'
+        self.columns = columns
+        self.weights = weights
+        self.pg_vector = ' || '.join(
+            f"setweight(to_tsvector('english', coalesce({column}, '')), '{letter}')"
+            for column, letter in zip(columns, 'ABCD')
+        )
+
+    def sqlite_setup(self) -> List[str]:
+        fts, cols = self.fts_table, ', '.join(self.columns)
+        new = ', '.join(f'new.{c}' for c in self.columns)
+        old = ', '.join(f'old.{c}' for c in self.columns)
+        return [
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5("
+            f"{cols}, content='{self.table}', content_rowid='id', tokenize='porter unicode61')",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ai AFTER INSERT ON {self.table} BEGIN "
+            f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_ad AFTER DELETE ON {self.table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); END",
+            f"CREATE TRIGGER IF NOT EXISTS {fts}_au AFTER UPDATE OF {cols} ON {self.table} BEGIN "
+            f"INSERT INTO {fts}({fts}, rowid, {cols}) VALUES ('delete', old.id, {old}); "
+            f"INSERT INTO {fts}(rowid, {cols}) VALUES (new.id, {new}); END",
+        ]
+
+    def postgres_setup(self) -> List[str]:
+        return [f"CREATE INDEX IF NOT EXISTS {self.pg_index} ON {self.table} USING GIN (({self.pg_vector}))"]
+
+
+ARTICLES = SearchIndex('news_brief_article', 'article', ('title', 'summary'), (10.0, 3.0))
+ARCHIVE = SearchIndex('news_brief_archivedarticle', 'archive', ('title', 'summary'), (10.0, 3.0))
+
+FTS_TABLE = ARTICLES.fts_table
+# The GIN index is on this expression; queries must use it verbatim for PostgreSQL to use the index
+PG_VECTOR = ARTICLES.pg_vector
+
+
+def is_supported(conn=None) -> bool:
+    return (conn or connection).vendor in ('sqlite', 'postgresql')
+
+
+def install(conn=None, index: SearchIndex = ARTICLES) -> bool:
+    """
+    Create the search index if it is missing (idempotent). On SQLite a table
+    rebuild by a later migration drops the triggers, so this also recreates
+    them and re-syncs the index; returns True when it had to.
+    """
+    conn = conn or connection
+    with conn.cursor() as cursor:
+        if conn.vendor == 'postgresql':
+            for statement in index.postgres_setup():
+                cursor.execute(statement)
+            return False
+        if conn.vendor != 'sqlite':
+            return False
+        cursor.execute(
+            "SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE %s", [f'{index.fts_table}_%']
+        )
+        complete = cursor.fetchone()[0] == 3
+        if complete:
+            return False
+        for statement in index.sqlite_setup():
+            cursor.execute(statement)
+        cursor.execute(f"INSERT INTO {index.fts_table}({index.fts_table}) VALUES ('rebuild')")
+    logger.info(f"Search index on {index.table} (re)built")
+    return True
+
+
+def uninstall(conn=None, index: SearchIndex = ARTICLES):
+    conn = conn or connection
+    with conn.cursor() as cursor:
+        if conn.vendor == 'postgresql':
+            cursor.execute(f"DROP INDEX IF EXISTS {index.pg_index}")
+        elif conn.vendor == 'sqlite':
+            for suffix in ('ai', 'ad', 'au'):
+                cursor.execute(f"DROP TRIGGER IF EXISTS {index.fts_table}_{suffix}")
+            cursor.execute(f"DROP TABLE IF EXISTS {index.fts_table}")
+
+
+def _terms(keywords: Iterable[str]):
+    """(tokens, prefix) per keyword; a trailing '*' asks for prefix matching on the last token"""
+    for keyword in keywords:
+        keyword = str(keyword).strip()
+        tokens = tokenize(keyword)
+        if tokens:
+            yield tokens, keyword.endswith('*')
+
+
+def _fts5_query(keywords: Iterable[str]) -> str:
+    # Every token is quoted, so user input can't inject FTS5 operators
+    phrases = [f'"{" ".join(tokens)}"' + ('*' if prefix else '') for tokens, prefix in _terms(keywords)]
+    return ' OR '.join(phrases)
+
+
+def _tsquery(keywords: Iterable[str]) -> str:
+    # Tokens are word characters only, so they're safe inside to_tsquery syntax
+    phrases = []
+    for tokens, prefix in _terms(keywords):
+        if prefix:
+            tokens = tokens[:-1] + [tokens[-1] + ':*']
+        phrases.append('(' + ' <-> '.join(tokens) + ')')
+    return ' | '.join(phrases)
+
+
+def search_article_ids(keywords: Iterable[str], since=None, category_keys: Optional[List[str]] = None,
+                       limit: int = SEARCH_LIMIT) -> Optional[List[int]]:
+    """
+    IDs of articles matching any of the keywords, best first, or None when the
+    database has no full-text backend (callers then filter in Python).
+    """
+    from .models import Article
+    return _search(ARTICLES, Article, keywords, since, category_keys, limit)
+
+
+def search_archive_ids(keywords: Iterable[str], since=None, category_keys: Optional[List[str]] = None,
+                       limit: int = SEARCH_LIMIT) -> Optional[List[int]]:
+    """search_article_ids() over ArchivedArticle"""
+    from .models import ArchivedArticle
+    return _search(ARCHIVE, ArchivedArticle, keywords, since, category_keys, limit)
+
+
+def _search(index: SearchIndex, model, keywords, since, category_keys, limit) -> Optional[List[int]]:
+    conn = connections[router.db_for_read(model)]
+    if not is_supported(conn):
+        return None
+    keywords = list(keywords)
+    where, params = [], []
+    if since is not None:
+        where.append("a.published_at >= %s")
+        params.append(conn.ops.adapt_datetimefield_value(since))
+    if category_keys:
+        where.append(f"a.category_key IN ({', '.join(['%s'] * len(category_keys))})")
+        params.extend(category_keys)
+    extra = ''.join(f" AND {clause}" for clause in where)
+
+    if conn.vendor == 'postgresql':
+        query = _tsquery(keywords)
+        if not query:
+            return []
+        sql = (
+            f"SELECT id FROM (SELECT a.id, a.published_at, ts_rank({index.pg_vector}, q) AS relevance "
+            f"FROM {index.table} a, to_tsquery('english', %s) q "
+            f"WHERE ({index.pg_vector}) @@ q{extra} ORDER BY a.id DESC LIMIT {CANDIDATE_LIMIT}) candidates "
+            f"ORDER BY relevance / (1 + EXTRACT(EPOCH FROM (now() - published_at)) / 86400.0 / %s) DESC LIMIT %s"
+        )
+    else:
+        query = _fts5_query(keywords)
+        if not query:
+            return []
+        fts = index.fts_table
+        # bm25() is negative, lower is better; column weights favour title, then summary.
+        # FTS5 walks matches in rowid order, so the newest candidates are found without scoring the rest;
+        # the filters apply before the cap, or older matching rows would be cut off
+        sql = (
+            f"SELECT id FROM (SELECT a.id, a.published_at, "
+            f"bm25({fts}, {', '.join(map(str, index.weights))}) AS relevance "
+            f"FROM {fts} JOIN {index.table} a ON a.id = {fts}.rowid "
+            f"WHERE {fts} MATCH %s{extra} ORDER BY {fts}.rowid DESC LIMIT {CANDIDATE_LIMIT}) candidates "
+            f"ORDER BY relevance / (1 + (julianday('now') - julianday(published_at)) / %s) LIMIT %s"
+        )
+    with conn.cursor() as cursor:
+        cursor.execute(sql, [query, *params, RECENCY_HALF_LIFE_DAYS, limit])
+        return [row[0] for row in cursor.fetchall()]
@@ -1,5 +1,8 @@
 from allauth.account.signals import email_confirmed
 from django.contrib.auth.signals import user_logged_in
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_migrate
 from django.dispatch import receiver
 from .utils import send_welcome_email, send_login_alert_email
 import logging
@@ -34,31 +37,50 @@ def login_alert(sender, request, user, **kwargs):
         logger.error(f"Failed to send login alert email to {user.email}: {e}")
 
 from django.db.models.signals import post_save
-from .models import Article, Notification
-from django.contrib.auth import get_user_model
-
-User = get_user_model()
+from .models import Article, BroadcastNotification
 
 @receiver(post_save, sender=Article)
 def auto_push_breaking_news_notification(sender, instance, created, **kwargs):
     """
     Whenever a new Article is saved into the database, this pipeline kicks in!
     If we detect it as "Breaking" or highly important news, it broadcasts
-    a notification directly to all ByteBrief users automatically.
+    a notification to all ByteBrief users: one row, merged into every
+    user's notifications when they are read.
     """
     if created and instance.category:
         if instance.category.lower() == 'breaking' or instance.category.lower() == 'urgent':
-            users = User.objects.all()
-            
-            notifications = [
-                Notification(
-                    user=user,
-                    title="🚨 New Breaking News!",
-                    message=f"Just In: {instance.title[:60]}... Open ByteBrief to learn more."
-                )
-                for user in users
-            ]
-            
-            # Efficiently write to Database at scale
-            if notifications:
-                Notification.objects.bulk_create(notifications)
+            BroadcastNotification.objects.create(
+                title="🚨 New Breaking News!",
+                message=f"Just In: {instance.title[:60]}... Open ByteBrief to learn more."
+            )
+
+
+@receiver(post_migrate)
+def ensure_search_index(sender, using='default', **kwargs):
+    """
+    SQLite rebuilds news_brief_article for some schema changes, which drops the
+    full-text triggers; recreate them (and re-sync the index) after every migrate.
+    """
+    if sender.name != 'news_brief':
+        return
+    from django.db.migrations.recorder import MigrationRecorder
+    from .search import ARCHIVE, ARTICLES, install
+    try:
+        connection = connections[using]
+        applied = MigrationRecorder(connection).applied_migrations()
+        # Not when migrating back past the migration that adds the index
+        for migration, index in (('0009_article_search_index', ARTICLES), ('0011_archivedarticle', ARCHIVE)):
+            if ('news_brief', migration) in applied:
+                install(connection, index)
+    except Exception as e:
+        logger.error(f"Could not install the article search index: {e}")
+
+
+@receiver(connection_created)
+def configure_sqlite(sender, connection, **kwargs):
+    """WAL, relaxed fsync, busy timeout and memory-mapped reads for every SQLite connection"""
+    if connection.vendor != 'sqlite':
+        return
+    from .sqlite import apply_pragmas
+    with connection.cursor() as cursor:
+        apply_pragmas(cursor)
@@ -0,0 +1,51 @@
+"""
+SQLite production profile for single-box deployments.
+
+Every new SQLite connection gets PRAGMAS (see the connection_created receiver
+in signals.py):
+
+  journal_mode=WAL     readers no longer block on the writer, or the writer on readers
+  synchronous=NORMAL   fsync at checkpoints instead of every commit (safe with WAL)
+  busy_timeout         wait for the write lock instead of failing with "database is locked"
+  mmap_size/cache_size serve hot pages from memory
+
+settings.py also opens transactions with BEGIN IMMEDIATE, so a transaction
+that will write takes the lock up front (where busy_timeout applies) instead of
+failing when it upgrades from a read lock. Within one process, writers queue on
+serialized_writes() rather than polling the busy handler.
+benchmarks/bench_sqlite_concurrency.py compares this profile with the defaults.
+"""
+import threading
+from contextlib import contextmanager
+
+PRAGMAS = (
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),
+    ('busy_timeout', 20000),           # ms
+    ('mmap_size', 256 * 2**20),        # bytes
+    ('cache_size', -32000),            # negative = KiB per connection
+    ('temp_store', 'MEMORY'),
+)
+
+_write_lock = threading.RLock()
+
+
+def apply_pragmas(cursor):
+    for name, value in PRAGMAS:
+        cursor.execute(f"PRAGMA {name} = {value}")
+
+
+@contextmanager
+def serialized_writes(using: str = 'default'):
+    """
+    One short write transaction at a time per process on SQLite (a plain
+    transaction elsewhere). Keep the body to the writes and the reads they depend on.
+    """
+    from django.db import connections, transaction
+
+    if connections[using].vendor != 'sqlite':
+        with transaction.atomic(using=using):
+            yield
+        return
+    with _write_lock, transaction.atomic(using=using):
+        yield
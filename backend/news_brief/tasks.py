@@ -88,7 +88,7 @@ def send_daily_digests():
 def automated_pipeline_job():
     """
     ByteBrief Automated Setup:
-    1. Clean old news (older than 7 days) preserving bookmarks.
+    1. Archive old news (older than 7 days) preserving bookmarks.
     2. Run scraper logic to fetch, summarize, and deduplicate.
     """
     logger.info("🎬 [AUTOMATION] Starting Daily/Hourly News Pipeline...")
@@ -105,18 +105,62 @@ def automated_pipeline_job():
     except Exception as e:
         logger.error(f"❌ [AUTOMATION] Failed during scraping/summarization: {e}", exc_info=True)
 
-def cleanup_old_news():
-    logger.info("🧹 [CLEANUP] Deleting articles older than 7 days that are not bookmarked...")
-    seven_days_ago = timezone.now() - timedelta(days=7)
-    
-    from .models import Bookmark
-    
-    old_articles = Article.objects.filter(published_at__lt=seven_days_ago)
-    bookmarked_article_ids = Bookmark.objects.values_list('article_id', flat=True)
-    unbookmarked_old_articles = old_articles.exclude(id__in=bookmarked_article_ids)
-    
-    deleted_count, _ = unbookmarked_old_articles.delete()
-    logger.info(f"✅ [CLEANUP] Successfully deleted {deleted_count} outdated articles.")
+# Articles older than this leave the hot table unless someone bookmarked them
+RETENTION_DAYS = 7
+# Articles moved per transaction; each batch holds the write lock only briefly
+ARCHIVE_BATCH_SIZE = 500
+# Copied to ArchivedArticle; content stays behind
+ARCHIVE_FIELDS = ['title', 'summary', 'category', 'url', 'image_url', 'publisher_id', 'published_at', 'content_hash']
+
+def cleanup_old_news(days=RETENTION_DAYS, batch_size=ARCHIVE_BATCH_SIZE):
+    """
+    Move unbookmarked articles older than `days` to ArchivedArticle, oldest first,
+    batch_size rows per transaction. Each batch is copied and deleted atomically, so
+    an interrupted run loses nothing and the next one carries on. The story clusters
+    the articles belonged to shrink with them, and are deleted once they have no
+    articles left.
+    """
+    logger.info(f"🧹 [CLEANUP] Archiving articles older than {days} days that are not bookmarked...")
+    from collections import Counter
+    from django.db.models import Exists, F, OuterRef
+    from django.db.models.functions import Greatest
+    from .models import ArchivedArticle, Bookmark, StoryCluster
+    from .sqlite import serialized_writes
+
+    cutoff = timezone.now() - timedelta(days=days)
+    # NOT EXISTS per row instead of materializing every bookmarked id into the statement
+    expired = Article.objects.filter(published_at__lt=cutoff).filter(
+        ~Exists(Bookmark.objects.filter(article=OuterRef('pk')))
+    ).order_by('published_at')
+
+    archived = 0
+    while True:
+        with serialized_writes():
+            batch = list(expired.values('id', 'cluster_id', *ARCHIVE_FIELDS)[:batch_size])
+            if not batch:
+                break
+            # A URL archived before and scraped again replaces its older archive copy
+            ArchivedArticle.objects.bulk_create(
+                [ArchivedArticle(**{field: row[field] for field in ARCHIVE_FIELDS}) for row in batch],
+                update_conflicts=True, unique_fields=['url'],
+                update_fields=[field for field in ARCHIVE_FIELDS if field != 'url'],
+            )
+            Article.objects.filter(id__in=[row['id'] for row in batch]).delete()
+
+            # article_count is the cluster's member rows; decrementing it avoids a recount per cluster
+            by_count = {}
+            for cluster_id, count in Counter(row['cluster_id'] for row in batch if row['cluster_id']).items():
+                by_count.setdefault(count, []).append(cluster_id)
+            for count, cluster_ids in by_count.items():
+                StoryCluster.objects.filter(id__in=cluster_ids).update(
+                    article_count=Greatest(F('article_count') - count, 0),
+                )
+        archived += len(batch)
+
+    with serialized_writes():
+        emptied, _ = StoryCluster.objects.filter(~Exists(Article.objects.filter(cluster=OuterRef('pk')))).delete()
+    logger.info(f"✅ [CLEANUP] Archived {archived} outdated articles, deleted {emptied} emptied story clusters.")
+    return archived
 
 def run_orchestrator_scraper():
     logger.info("🕸️ [SCRAPER] Initializing AgentOrchestrator to fetch fresh data...")
@@ -134,3 +178,15 @@ def run_orchestrator_scraper():
     
     processed_count = len(results) if results else 0
     logger.info(f"✅ [SCRAPER] Successfully pulled and summarized {processed_count} new articles.")
+
+def enrich_stale_articles_job():
+    """Re-queue articles left with placeholder summaries, e.g. after a restart mid-enrichment."""
+    from bytebrief.agent.enrichment import get_enrichment_pool
+    from bytebrief.agent.orchestrator import AgentOrchestrator
+    import os
+    from django.conf import settings
+
+    orch_settings = AgentOrchestrator(config_dir=os.path.join(settings.BASE_DIR, 'config')).settings
+    count = get_enrichment_pool(orch_settings).enqueue_stale()
+    if count:
+        logger.info(f"🧪 [ENRICHMENT] Re-queued {count} articles still waiting for summaries/categories.")
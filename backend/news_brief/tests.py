@@ -1,3 +1,1251 @@
-from django.test import TestCase
+import importlib.util
+import json
+import os
+import sys
+import tempfile
+import threading
+from pathlib import Path
+from unittest import mock, skipUnless
 
-# Create your tests here.
+from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.db.models import Exists, OuterRef
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from datetime import timedelta
+
+from . import search, views
+from .db_router import PIN_COOKIE, replica_health
+from .fields import CompressedTextField
+from .sqlite import serialized_writes
+from .tasks import cleanup_old_news
+from .models import (
+    ArchivedArticle, Article as DBArticle, Bookmark, BroadcastNotification, BroadcastRead, InferenceCacheEntry,
+    Notification, Publisher, ReadingHistory, StoryCluster,
+)
+
+# Add src to path so the bytebrief agent package can be imported
+sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
+
+from bytebrief.core.models import Article
+from bytebrief.agent.clustering import StoryClusterer
+from bytebrief.agent.comparer import NewsComparer
+from bytebrief.agent.dedup import MinHashLSHStrategy, TitleHashStrategy, create_strategy, group_duplicates
+from bytebrief.agent.processor import DataProcessor, Seq2SeqSummarizer
+from bytebrief.agent.zero_shot import BatchedZeroShotClassifier
+from bytebrief.agent.cache import InferenceCache
+from bytebrief.agent.model_server import ModelServer, ModelServerConfigError
+from bytebrief.agent import processor as processor_module
+from bytebrief.agent.cascade import cascade_totals
+from bytebrief.utils.memory import process_memory
+from bytebrief.agent.enrichment import EnrichmentPool
+from bytebrief.agent.governor import ResourceGovernor
+from bytebrief.agent.orchestrator import AgentOrchestrator
+from bytebrief.agent.persistence import upsert_articles
+from bytebrief.agent.keywords import CATEGORY_MATCHER, KeywordFilter, KeywordMatcher
+from bytebrief.agent.extractive import ExtractiveSummarizer, split_sentences
+from bytebrief.agent.embedding_classifier import EmbeddingZeroShotClassifier
+from bytebrief.agent.quantization import inference_mode, load_sequence_classifier, model_size_bytes
+from bytebrief.core.models import ClientConfig
+
+HAS_TORCH = importlib.util.find_spec('torch') is not None and importlib.util.find_spec('transformers') is not None
+
+TINY_VOCAB = (
+    "<s> <pad> </s> <unk> the a bank rates rise inflation cup final stadium rivals meet world news "
+    "This example is Finance Sports Global ."
+).split()
+
+
+def build_tiny_bart(path, sequence_classification=False):
+    """Save a tiny randomly initialised BART model and word-level tokenizer so no download is needed"""
+    import torch
+    from tokenizers import Tokenizer, models, pre_tokenizers, processors
+    from transformers import (
+        BartConfig, BartForConditionalGeneration, BartForSequenceClassification, PreTrainedTokenizerFast,
+    )
+
+    backend = Tokenizer(models.WordLevel({w: i for i, w in enumerate(TINY_VOCAB)}, unk_token="<unk>"))
+    backend.pre_tokenizer = pre_tokenizers.Whitespace()
+    backend.post_processor = processors.TemplateProcessing(
+        single="<s> $A </s>", pair="<s> $A </s> </s> $B </s>", special_tokens=[("<s>", 0), ("</s>", 2)],
+    )
+    tokenizer = PreTrainedTokenizerFast(
+        tokenizer_object=backend, bos_token="<s>", eos_token="</s>", pad_token="<pad>", unk_token="<unk>",
+    )
+    config = BartConfig(
+        vocab_size=len(TINY_VOCAB), d_model=16, encoder_layers=1, decoder_layers=1,
+        encoder_attention_heads=2, decoder_attention_heads=2, encoder_ffn_dim=32, decoder_ffn_dim=32,
+        max_position_embeddings=64, pad_token_id=1, bos_token_id=0, eos_token_id=2, decoder_start_token_id=2,
+        id2label={0: 'contradiction', 1: 'neutral', 2: 'entailment'},
+        label2id={'contradiction': 0, 'neutral': 1, 'entailment': 2},
+    )
+    torch.manual_seed(0)
+    model_class = BartForSequenceClassification if sequence_classification else BartForConditionalGeneration
+    model_class(config).save_pretrained(path)
+    tokenizer.save_pretrained(path)
+    return path
+
+
+def make_db_article(publisher, article, **extra):
+    return DBArticle.objects.create(
+        title=article.title,
+        summary=article.content,
+        content=article.content,
+        url=article.url,
+        publisher=publisher,
+        published_at=timezone.now(),
+        **extra
+    )
+
+
+class StoryClustererTests(TestCase):
+    def setUp(self):
+        self.bbc = Publisher.objects.create(name='BBC')
+        self.cnn = Publisher.objects.create(name='CNN')
+        self.clusterer = StoryClusterer()
+
+    def test_new_story_opens_cluster_and_copy_joins_it(self):
+        text = "Central bank raises interest rates by half a point to fight persistent inflation"
+        first = Article(title="Rates rise again", content=text, url="https://bbc.example/a", source='BBC')
+        make_db_article(self.bbc, first)
+        self.assertEqual(self.clusterer.assign([first]), (0, 1))
+
+        copy = Article(title="Rates rise again", content=text, url="https://cnn.example/a", source='CNN')
+        make_db_article(self.cnn, copy)
+        self.assertEqual(self.clusterer.assign([copy]), (1, 0))
+
+        cluster = StoryCluster.objects.get()
+        self.assertEqual(cluster.article_count, 2)
+        self.assertEqual(cluster.articles.count(), 2)
+
+    def test_unrelated_story_and_already_clustered_rows_are_left_alone(self):
+        a = Article(title="Rates rise again", content="Central bank raises interest rates", url="https://bbc.example/a", source='BBC')
+        b = Article(title="Cup final tonight", content="Two rivals meet at a sold out stadium", url="https://cnn.example/b", source='CNN')
+        make_db_article(self.bbc, a)
+        make_db_article(self.cnn, b)
+
+        self.assertEqual(self.clusterer.assign([a, b]), (0, 2))
+        # A second pass only touches articles without a cluster
+        self.assertEqual(self.clusterer.assign([a, b]), (0, 0))
+        self.assertEqual(StoryCluster.objects.count(), 2)
+
+    def test_clusters_api_lists_member_counts(self):
+        a = Article(title="Rates rise again", content="Central bank raises interest rates", url="https://bbc.example/a", source='BBC')
+        # Same-run duplicates folded in by the comparer have no row, so they aren't counted as members
+        a.related_articles = [Article(title=a.title, content=a.content, url="https://other.example/a", source='Other')]
+        make_db_article(self.bbc, a)
+        self.clusterer.assign([a])
+        cluster = StoryCluster.objects.get()
+        self.assertEqual(cluster.article_count, cluster.articles.count())
+
+        response = self.client.get('/api/clusters/')
+        self.assertEqual(response.status_code, 200)
+        clusters = response.json()['clusters']
+        self.assertEqual(len(clusters), 1)
+        self.assertEqual(clusters[0]['article_count'], 1)
+        self.assertEqual(clusters[0]['sources'], ['BBC'])
+
+
+class DedupStrategyTests(SimpleTestCase):
+    story = (
+        "The Federal Reserve raised its benchmark interest rate by a quarter of a percentage point "
+        "on Wednesday while signalling that it may soon pause its campaign against inflation."
+    )
+
+    def articles(self):
+        return [
+            Article(title="Fed raises rates", content=self.story, url="https://ap.example/1", source='AP'),
+            Article(title="Fed raises rates - Reuters", content=self.story, url="https://reuters.example/1", source='Reuters'),
+            Article(title="Cup final tonight", content="Two rivals meet at a sold out stadium.", url="https://ap.example/2", source='AP'),
+        ]
+
+    def test_each_strategy_folds_syndicated_copy(self):
+        for name in ('simhash', 'minhash', 'title_hash'):
+            threshold = 14 if name == 'simhash' else None
+            with self.subTest(strategy=name):
+                unique = group_duplicates(self.articles(), create_strategy(name, threshold=threshold))
+                self.assertEqual([a.url for a in unique], ["https://ap.example/1", "https://ap.example/2"])
+                self.assertEqual([r.source for r in unique[0].related_articles], ['Reuters'])
+
+    def test_title_hash_strips_publisher_suffix(self):
+        strategy = TitleHashStrategy()
+        self.assertEqual(strategy.normalize("Fed Raises Rates | BBC News"), "fed raises rates")
+
+    def test_minhash_bands_cover_threshold(self):
+        strategy = MinHashLSHStrategy(threshold=0.5, num_perm=64)
+        self.assertEqual(strategy.bands * strategy.rows, 64)
+        self.assertLessEqual((1.0 / strategy.bands) ** (1.0 / strategy.rows), 0.5)
+
+    def test_comparer_reads_strategy_from_settings(self):
+        comparer = NewsComparer.from_settings({'dedup': {'strategy': 'minhash', 'threshold': 0.7}})
+        self.assertEqual(comparer.strategy.name, 'minhash')
+        self.assertEqual(comparer.strategy.threshold, 0.7)
+        self.assertEqual(NewsComparer.from_settings({}).strategy.name, 'simhash')
+        with self.assertRaises(ValueError):
+            create_strategy('soundex')
+
+
+class BatchedSummarizationTests(TestCase):
+    def test_articles_are_summarized_in_length_sorted_batches(self):
+        calls = []
+
+        def fake_summarizer(texts, **kwargs):
+            calls.append(list(texts))
+            return [{'summary_text': f"summary of {len(t)}"} for t in texts]
+
+        lengths = [900, 200, 600, 400, 100]
+        articles = [
+            Article(title=f"t{n}", content="x" * n, url=f"https://example.com/{n}", source='AP') for n in lengths
+        ]
+        processor = DataProcessor(ClientConfig(name='test'), settings={'ml': {'summarizer_batch_size': 2}})
+        with mock.patch('bytebrief.agent.processor.get_summarizer', return_value=fake_summarizer):
+            processor._summarize_articles(articles)
+
+        # Content of 150 chars or less is left alone; the rest go through in ascending-length batches of 2
+        self.assertEqual([[len(t) for t in batch] for batch in calls], [[200, 400], [600, 900]])
+        self.assertEqual([a.content for a in articles[:4]], [
+            "summary of 900", "summary of 200", "summary of 600", "summary of 400",
+        ])
+        self.assertEqual(articles[4].content, "x" * 100)
+
+    @skipUnless(HAS_TORCH, "torch/transformers not installed")
+    def test_seq2seq_summarizer_returns_one_summary_per_input(self):
+        with tempfile.TemporaryDirectory() as path:
+            summarizer = Seq2SeqSummarizer(build_tiny_bart(path))
+            results = summarizer(["the bank rates rise", "cup final world news stadium"], max_length=8, min_length=2)
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all('summary_text' in r for r in results))
+
+
+class BatchedZeroShotTests(TestCase):
+    labels = ['Finance', 'Sports', 'Global']
+    texts = ["the bank rates rise inflation", "cup final stadium rivals meet", "world news"]
+
+    @skipUnless(HAS_TORCH, "torch/transformers not installed")
+    def test_batched_scores_match_the_pipeline(self):
+        from transformers import AutoModelForSequenceClassification, AutoTokenizer, pipeline
+
+        with tempfile.TemporaryDirectory() as path:
+            build_tiny_bart(path, sequence_classification=True)
+            model = AutoModelForSequenceClassification.from_pretrained(path)
+            tokenizer = AutoTokenizer.from_pretrained(path)
+
+        reference = pipeline("zero-shot-classification", model=model, tokenizer=tokenizer, device=-1)
+        batched = BatchedZeroShotClassifier(model, tokenizer, self.labels)
+
+        results = batched.classify(self.texts, batch_size=2)
+        for text, result in zip(self.texts, results):
+            expected = reference(text, candidate_labels=self.labels, multi_label=False)
+            want = dict(zip(expected['labels'], expected['scores']))
+            for label, score in zip(result['labels'], result['scores']):
+                self.assertAlmostEqual(score, want[label], places=5)
+
+    def test_low_confidence_and_failed_batches_fall_back_to_keywords(self):
+        classifier = mock.Mock()
+        classifier.classify.return_value = [
+            {'labels': ['Sports', 'Finance'], 'scores': [0.9, 0.1]},
+            None,
+            {'labels': ['Travel', 'Finance'], 'scores': [0.1, 0.05]},
+        ]
+        articles = [
+            Article(title="Cup final", content="two rivals", url="https://example.com/1", source='AP'),
+            Article(title="Bank shock", content="inflation hits the currency", url="https://example.com/2", source='AP'),
+            Article(title="Space race", content="nasa plans a mars mission", url="https://example.com/3", source='AP'),
+            Article(title="Breaking: storm", content="roads closed", url="https://example.com/4", source='AP'),
+            Article(title="Kept", content="already labelled", url="https://example.com/5", source='AP', category='Tech'),
+        ]
+        # Cascade off so every non-breaking article reaches the (mocked) model
+        processor = DataProcessor(ClientConfig(name='test'), settings={'classification': {'cascade': False}})
+        with mock.patch('bytebrief.agent.processor.get_batched_classifier', return_value=classifier):
+            processor._categorize_articles(articles)
+
+        # Breaking and pre-labelled articles never reach the model; the rest go in one call
+        self.assertEqual(len(classifier.classify.call_args[0][0]), 3)
+        self.assertEqual([a.category for a in articles], ['Sports', 'Finance', 'Space & Research', 'Breaking', 'Tech'])
+
+
+class InferenceCacheTests(TestCase):
+    def test_key_depends_on_normalized_text_model_and_params(self):
+        cache = InferenceCache('summary', 'model-a', {'max_length': 250})
+        self.assertEqual(cache.key("Rates  rise\n again "), cache.key("Rates rise again"))
+        self.assertNotEqual(cache.key("x"), InferenceCache('summary', 'model-b', {'max_length': 250}).key("x"))
+        self.assertNotEqual(cache.key("x"), InferenceCache('summary', 'model-a', {'max_length': 120}).key("x"))
+
+    def test_repeated_text_is_summarized_once(self):
+        summarizer = mock.Mock(side_effect=lambda texts, **kw: [{'summary_text': 'short'} for _ in texts])
+        processor = DataProcessor(ClientConfig(name='test'))
+
+        def run():
+            article = Article(title="t", content="wire copy " * 40, url="https://example.com/1", source='AP')
+            with mock.patch('bytebrief.agent.processor.get_summarizer', return_value=summarizer):
+                processor._summarize_articles([article])
+            return article.content
+
+        self.assertEqual(run(), 'short')
+        self.assertEqual(run(), 'short')
+        self.assertEqual(summarizer.call_count, 1)
+
+    def test_prune_evicts_old_then_least_recently_used(self):
+        now = timezone.now()
+        for n, days in enumerate([0, 1, 2, 40]):
+            InferenceCacheEntry.objects.create(key=f"k{n}", kind='summary', value='v', last_used_at=now - timezone.timedelta(days=days))
+
+        self.assertEqual(InferenceCache.prune(max_entries=2, max_age_days=30), 2)
+        self.assertEqual(sorted(InferenceCacheEntry.objects.values_list('key', flat=True)), ['k0', 'k1'])
+
+
+class ModelServerTests(SimpleTestCase):
+    def setUp(self):
+        classifier = mock.Mock()
+        classifier.classify.side_effect = lambda texts, batch_size: [
+            {'labels': ['Sports'], 'scores': [0.9]} for _ in texts
+        ]
+        self.summarizer = mock.Mock(side_effect=lambda texts, **kw: [{'summary_text': t.upper()} for t in texts])
+        self.env = mock.patch.dict('os.environ', {'BYTEBRIEF_MODEL_SERVER_AUTHKEY': 'test-key'})
+        self.env.start()
+        self.server = ModelServer('127.0.0.1:0', summarizer=self.summarizer, classifier=classifier)
+        self.serving = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.serving.start()
+        host, port = self.server.address
+        os.environ['BYTEBRIEF_MODEL_SERVER'] = f"{host}:{port}"
+
+    def tearDown(self):
+        self.env.stop()
+        self.server.close()
+
+    def test_clients_use_the_shared_models(self):
+        with mock.patch.object(processor_module, 'load_summarizer') as load_local:
+            summarizer = processor_module.get_summarizer()
+            self.assertEqual(summarizer(["a", "b"], max_length=10), [{'summary_text': 'A'}, {'summary_text': 'B'}])
+            load_local.assert_not_called()
+
+        self.assertEqual(self.summarizer.call_args.kwargs, {'max_length': 10})
+        results = processor_module.get_batched_classifier().classify(["x", "y"], batch_size=2)
+        self.assertEqual([r['labels'][0] for r in results], ['Sports', 'Sports'])
+
+    def test_unreachable_server_disables_ml_instead_of_loading_locally(self):
+        self.server.close()
+        with mock.patch.object(processor_module, 'load_summarizer') as load_local:
+            self.assertIsNone(processor_module.get_summarizer())
+            self.assertIsNone(processor_module.get_batched_classifier())
+            load_local.assert_not_called()
+        self.serving.join(timeout=5)
+        self.assertFalse(self.serving.is_alive())
+
+    def test_clients_need_the_same_authkey(self):
+        with mock.patch.dict('os.environ', {'BYTEBRIEF_MODEL_SERVER_AUTHKEY': 'wrong-key'}):
+            self.assertIsNone(processor_module.get_summarizer())
+        del os.environ['BYTEBRIEF_MODEL_SERVER_AUTHKEY']
+        self.assertIsNone(processor_module.get_summarizer())
+
+    def test_refuses_to_start_without_authkey_or_off_localhost(self):
+        with self.assertRaises(ModelServerConfigError):
+            ModelServer('0.0.0.0:0')
+        del os.environ['BYTEBRIEF_MODEL_SERVER_AUTHKEY']
+        with self.assertRaises(ModelServerConfigError):
+            ModelServer('127.0.0.1:0')
+
+
+class QuantizedInferenceTests(SimpleTestCase):
+    def test_render_defaults_to_off_and_off_disables_ml(self):
+        with mock.patch.dict('os.environ', {'RENDER': 'true'}, clear=True):
+            self.assertEqual(inference_mode(), 'off')
+        with mock.patch.dict('os.environ', {'BYTEBRIEF_INFERENCE_MODE': 'off'}, clear=True):
+            self.assertIsNone(processor_module.load_summarizer())
+            self.assertIsNone(processor_module.get_classifier())
+
+    @skipUnless(HAS_TORCH, "torch/transformers not installed")
+    def test_int8_models_are_smaller_and_still_run(self):
+        import torch
+
+        with tempfile.TemporaryDirectory() as path:
+            build_tiny_bart(path)
+            fp32 = Seq2SeqSummarizer(path, mode='fp32')
+            int8 = Seq2SeqSummarizer(path, mode='int8')
+            self.assertLess(model_size_bytes(int8.model), model_size_bytes(fp32.model))
+            self.assertFalse(any(isinstance(m, torch.nn.Linear) for m in int8.model.modules()))
+            self.assertEqual(len(int8(["the bank rates rise", "world news"], max_length=8, min_length=2)), 2)
+
+        with tempfile.TemporaryDirectory() as path:
+            build_tiny_bart(path, sequence_classification=True)
+            from transformers import AutoTokenizer
+            classifier = BatchedZeroShotClassifier(
+                load_sequence_classifier(path, 'int8'), AutoTokenizer.from_pretrained(path), ['Finance', 'Sports'],
+            )
+            result = classifier.classify(["the bank rates rise"])[0]
+            self.assertAlmostEqual(sum(result['scores']), 1.0, places=5)
+
+
+class EmbeddingClassifierTests(SimpleTestCase):
+    labels = ['Finance', 'Sports', 'Global']
+
+    @skipUnless(HAS_TORCH, "torch/transformers not installed")
+    def test_label_vectors_are_cached_on_disk(self):
+        from transformers import AutoModel, AutoTokenizer
+
+        with tempfile.TemporaryDirectory() as path, tempfile.TemporaryDirectory() as cache_dir:
+            build_tiny_bart(path)
+            model, tokenizer = AutoModel.from_pretrained(path), AutoTokenizer.from_pretrained(path)
+            first = EmbeddingZeroShotClassifier(model, tokenizer, self.labels, model_id=path, cache_dir=cache_dir)
+            self.assertEqual(len(list(Path(cache_dir).glob('*.npy'))), 1)
+
+            with mock.patch.object(EmbeddingZeroShotClassifier, 'encode') as encode:
+                second = EmbeddingZeroShotClassifier(model, tokenizer, self.labels, model_id=path, cache_dir=cache_dir)
+                encode.assert_not_called()
+            self.assertTrue((first.label_vectors == second.label_vectors).all())
+
+            results = first.classify(["the bank rates rise", "cup final stadium"], batch_size=2)
+            self.assertEqual(sorted(results[0]['labels']), sorted(self.labels))
+            self.assertAlmostEqual(sum(results[0]['scores']), 1.0, places=5)
+
+    def test_processor_uses_the_configured_backend(self):
+        classifier = mock.Mock()
+        classifier.classify.return_value = [{'labels': ['Sports', 'Finance'], 'scores': [0.7, 0.3]}]
+        settings = {'ml': {'classifier_backend': 'embedding', 'cache': {'enabled': False}}}
+        processor = DataProcessor(ClientConfig(name='test'), settings=settings)
+
+        with mock.patch.object(processor_module, 'get_batched_classifier', return_value=classifier) as get:
+            self.assertEqual(processor._classify_texts(["cup final stadium"]), ['Sports'])
+        get.assert_called_once_with('embedding')
+        self.assertEqual(classifier.classify.call_args.kwargs['batch_size'], 32)
+
+
+class ExtractiveSummarizerTests(SimpleTestCase):
+    text = (
+        "The U.S. Senate passed the climate bill on Monday. Mr. Lee said the climate bill would cut emissions. "
+        "Lunch was served at noon. The bill now goes to the House, where the climate bill faces a close vote. "
+        "Weather was mild."
+    )
+
+    def test_sentences_keep_abbreviations_and_summary_fits_budget(self):
+        self.assertEqual(len(split_sentences(self.text)), 5)
+        for method in ('textrank', 'tfidf'):
+            summary = ExtractiveSummarizer(method=method, max_chars=120, max_sentences=2).summarize(self.text)
+            self.assertLessEqual(len(summary), 120)
+            self.assertTrue(summary.startswith("The U.S. Senate passed the climate bill on Monday."))
+            self.assertNotIn("Lunch", summary)
+
+    def test_processor_falls_back_to_extractive_when_model_is_unavailable(self):
+        article = Article(title="Senate", content=self.text, url="https://example.com/1", source='AP')
+        processor = DataProcessor(ClientConfig(name='test'), settings={'ml': {'cache': {'enabled': False}}})
+        with mock.patch.object(processor_module, 'get_summarizer', return_value=None):
+            processor._summarize_articles([article])
+        self.assertLessEqual(len(article.content), 500)
+        self.assertNotEqual(article.content, self.text)
+
+    def test_extractive_backend_never_loads_the_model(self):
+        article = Article(title="Senate", content=self.text, url="https://example.com/1", source='AP')
+        processor = DataProcessor(ClientConfig(name='test'), settings={'ml': {'summarizer': 'extractive'}})
+        with mock.patch.object(processor_module, 'get_summarizer') as get:
+            processor._summarize_articles([article])
+        get.assert_not_called()
+        self.assertIn("climate bill", article.content)
+
+
+class KeywordMatcherTests(SimpleTestCase):
+    def test_whole_words_plurals_and_phrases(self):
+        matcher = KeywordMatcher({'AI': ['ai', 'neural network'], 'Sports': ['player', 'game'], 'Gaming': ['game']})
+        self.assertEqual(matcher.counts("he said the campaign was over"), {})
+        self.assertEqual(
+            matcher.matches("AI players love this game, built on a neural\n network"),
+            {'AI': {'ai', 'neural network'}, 'Sports': {'player', 'game'}, 'Gaming': {'game'}},
+        )
+
+    def test_category_fallback_ignores_keywords_inside_other_words(self):
+        processor = DataProcessor(ClientConfig(name='test'))
+        # "said" and "campaign" used to count as AI hits via substring matching
+        self.assertEqual(processor._keyword_category("officials said the election campaign was over"), 'Politics')
+        self.assertEqual(processor._keyword_category("nothing relevant here"), 'Global')
+        # Ties go to the category listed first, as before
+        self.assertEqual(CATEGORY_MATCHER.best_group("the game"), 'Sports')
+
+
+class KeywordFilterTests(TestCase):
+    def test_include_and_exclude_lists_in_one_pass(self):
+        keyword_filter = KeywordFilter(keywords=['AI', 'climate change'], excluded_keywords=['sponsored'])
+        self.assertTrue(keyword_filter.allows("New AI chip", None))
+        self.assertTrue(keyword_filter.allows("Summit", "Leaders discuss Climate\nChange"))
+        self.assertFalse(keyword_filter.allows("Officials said the campaign ended"))
+        self.assertFalse(keyword_filter.allows("AI deals", "Sponsored content"))
+        self.assertTrue(KeywordFilter(excluded_keywords=['sponsored']).allows("Anything else"))
+
+    def test_non_ascii_keywords(self):
+        # Devanagari vowel signs are combining marks, outside \w
+        excluding = KeywordFilter(excluded_keywords=['मोदी', 'Café'])
+        self.assertFalse(excluding.allows("PM मोदी visits Delhi"))
+        self.assertFalse(excluding.allows("Le CAFÉ opens"))
+        self.assertTrue(excluding.allows("Markets rally"))
+
+        including = KeywordFilter(keywords=['東京', 'привет'])
+        self.assertTrue(including.requires_include)
+        self.assertTrue(including.allows("Olympics return to 東京"))
+        self.assertTrue(including.allows("Привет, мир"))
+        self.assertFalse(including.allows("Markets rally"))
+
+    def test_whole_words_unless_keyword_ends_with_star(self):
+        self.assertFalse(KeywordFilter(keywords=['crypto']).allows("Cryptocurrency prices fall"))
+        self.assertTrue(KeywordFilter(keywords=['crypto']).allows("Crypto prices fall"))
+        prefix = KeywordFilter(keywords=['crypto*', 'climate chang*'])
+        self.assertTrue(prefix.allows("Cryptocurrency prices fall"))
+        self.assertTrue(prefix.allows("A changing climate", "Climate changes faster"))
+        self.assertFalse(prefix.allows("Encrypted chats", "climate policy"))
+
+    def test_saved_client_keywords_keep_substring_matching(self):
+        # A client config saved before whole-word matching existed
+        saved = ClientConfig.from_dict({'name': 'saved', 'keywords': ['AI', 'bank'], 'excluded_keywords': ['crypto']})
+        self.assertEqual(saved.keyword_match, 'substring')
+        articles = [
+            Article(title="Cryptocurrency prices fall", content="Bank shares too.", url="https://example.com/1", source='AP'),
+            Article(title="Officials said the campaign ended", content="", url="https://example.com/2", source='AP'),
+            Article(title="Banking rules change", content="Regulators act.", url="https://example.com/3", source='AP'),
+            Article(title="Markets rally", content="Stocks rose.", url="https://example.com/4", source='AP'),
+        ]
+        kept = DataProcessor(saved)._filter_articles(articles)
+        self.assertEqual([a.url for a in kept], ["https://example.com/2", "https://example.com/3"])
+
+        words = ClientConfig.from_dict({'name': 'words', 'keywords': ['AI', 'bank'], 'excluded_keywords': ['crypto'],
+                                        'keyword_match': 'words'})
+        kept = DataProcessor(words)._filter_articles(articles)
+        self.assertEqual([a.url for a in kept], ["https://example.com/1"])
+
+    def test_digest_api_filters_keywords_in_python(self):
+        publisher = Publisher.objects.create(name='AP')
+        for n, title in enumerate(["AI model released", "Officials said the campaign ended", "Bank rates rise"]):
+            make_db_article(publisher, Article(title=title, content=title, url=f"https://example.com/{n}", source='AP'))
+        # Only the content mentions the bank: neither the index nor the Python fallback looks there
+        DBArticle.objects.create(title="Quiet day", summary="Nothing happened", content="the bank was closed",
+                                 url="https://example.com/3", publisher=publisher, published_at=timezone.now())
+
+        def titles():
+            response = self.client.post('/api/generate-digest/', data='{"keywords": ["ai", "bank"]}',
+                                        content_type='application/json')
+            self.assertEqual(response.status_code, 200)
+            return sorted(a['title'] for a in response.json()['articles'])
+
+        self.assertEqual(titles(), ["AI model released", "Bank rates rise"])
+        # Without a full-text backend the same keywords are matched in Python
+        with mock.patch('news_brief.views.search_article_ids', return_value=None):
+            self.assertEqual(titles(), ["AI model released", "Bank rates rise"])
+
+
+class DigestCategoryTests(TestCase):
+    def setUp(self):
+        publisher = Publisher.objects.create(name='AP')
+        now = timezone.now()
+        for n in range(12):
+            category = ['Tech', 'Sports', 'Health'][n % 3]
+            DBArticle.objects.create(
+                title=f"{category} {'bank' if n % 2 else 'story'} {n}", summary="", url=f"https://example.com/{n}",
+                publisher=publisher, category=category, published_at=now - timedelta(hours=n),
+            )
+
+    def digest(self, **payload):
+        response = self.client.post('/api/generate-digest/', data=json.dumps(payload), content_type='application/json')
+        self.assertEqual(response.status_code, 200)
+        return [a['title'] for a in response.json()['articles']]
+
+    def test_newest_n_per_requested_category(self):
+        self.assertEqual(self.digest(categories=['tech', 'SPORTS'], per_category=2),
+                         ["Tech story 0", "Sports bank 1", "Tech bank 3", "Sports story 4"])
+
+    def test_keywords_within_categories(self):
+        self.assertEqual(self.digest(categories=['tech'], keywords=['bank'], per_category=2),
+                         ["Tech bank 3", "Tech bank 9"])
+
+
+class ArticleSearchTests(TestCase):
+    def setUp(self):
+        self.publisher = Publisher.objects.create(name='AP')
+        self.now = timezone.now()
+
+    def add(self, n, title, summary="", hours_old=0, content=""):
+        return DBArticle.objects.create(
+            title=title, summary=summary, content=content, url=f"https://example.com/{n}", publisher=self.publisher,
+            published_at=self.now - timedelta(hours=hours_old),
+        )
+
+    def test_ranks_by_relevance_then_recency(self):
+        in_summary = self.add(1, "Markets today", "the central bank held rates")
+        in_title = self.add(2, "Central bank holds rates", "markets were calm")
+        old_title = self.add(3, "Central bank raises rates", "", hours_old=24 * 30)
+        self.add(4, "Officials said the campaign ended")
+        # Content is stored compressed and not indexed
+        self.add(5, "Weather", content="the central bank building flooded")
+        self.assertEqual(search.search_article_ids(["central bank"]), [in_title.id, in_summary.id, old_title.id])
+        self.assertEqual(search.search_article_ids(["ai"]), [])
+
+    def test_prefix_matching_and_stemming(self):
+        article = self.add(1, "Cryptocurrency exchanges merge", "regulators approved it")
+        self.assertEqual(search.search_article_ids(["crypto*"]), [article.id])
+        self.assertEqual(search.search_article_ids(["crypto"]), [])
+        self.assertEqual(search.search_article_ids(["merging"]), [article.id])
+
+    def test_non_ascii_keywords(self):
+        article = self.add(1, "मोदी opens the Café Москва", "東京 summit")
+        for keyword in ["मोदी", "café", "москва", "東京"]:
+            self.assertEqual(search.search_article_ids([keyword]), [article.id], keyword)
+
+    def test_filters_apply_before_the_candidate_cap(self):
+        older = self.add(0, "Storm hits the coast", hours_old=2)
+        older.category = 'Tech'
+        older.save(update_fields=['category'])
+        # More newer matches than CANDIDATE_LIMIT, all outside the filters
+        DBArticle.objects.bulk_create(
+            DBArticle(title=f"Storm update {n}", summary="", url=f"https://example.com/bulk/{n}",
+                      publisher=self.publisher, category='Weather', published_at=self.now - timedelta(days=20))
+            for n in range(search.CANDIDATE_LIMIT + 1)
+        )
+        self.assertEqual(search.search_article_ids(["storm"], category_keys=['tech']), [older.id])
+        self.assertEqual(search.search_article_ids(["storm"], since=self.now - timedelta(days=1)), [older.id])
+
+    def test_index_follows_updates_and_deletes(self):
+        article = self.add(1, "Quiet day")
+        DBArticle.objects.filter(id=article.id).update(title="Storm warning issued")
+        self.assertEqual(search.search_article_ids(["storm"]), [article.id])
+        self.assertEqual(search.search_article_ids(["quiet"]), [])
+        article.delete()
+        self.assertEqual(search.search_article_ids(["storm"]), [])
+
+    def test_reinstall_resyncs_after_triggers_are_dropped(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest("SQLite table rebuilds only")
+        with connection.cursor() as cursor:
+            cursor.execute(f"DROP TRIGGER {search.FTS_TABLE}_ai")
+        article = self.add(1, "Flood defences tested")
+        self.assertTrue(search.install())
+        self.assertEqual(search.search_article_ids(["flood"]), [article.id])
+        self.assertFalse(search.install())
+
+
+class KeysetPaginationTests(TestCase):
+    def setUp(self):
+        publisher = Publisher.objects.create(name='AP')
+        now = timezone.now()
+        self.user = get_user_model().objects.create_user('reader', password='pw')
+        for n in range(7):
+            # Pairs share a timestamp so the id tie-breaker matters
+            article = DBArticle.objects.create(
+                title=f"{['Tech', 'Sports'][n % 2]} bank {n}", summary="", url=f"https://example.com/{n}",
+                publisher=publisher, category=['Tech', 'Sports'][n % 2], published_at=now - timedelta(hours=n // 2),
+            )
+            Bookmark.objects.create(user=self.user, article=article)
+
+    def walk(self, fetch):
+        """Titles across every page, following next_cursor until it runs out"""
+        titles, cursor = [], None
+        for _ in range(20):
+            page = fetch(cursor)
+            titles.extend(page['titles'])
+            cursor = page['next_cursor']
+            if not cursor:
+                return titles
+        self.fail("pagination did not terminate")
+
+    def digest_pages(self, **payload):
+        def fetch(cursor):
+            body = dict(payload, cursor=cursor)
+            response = self.client.post('/api/generate-digest/', data=json.dumps(body), content_type='application/json')
+            self.assertEqual(response.status_code, 200, response.content)
+            data = response.json()
+            return {'titles': [a['title'] for a in data['articles']], 'next_cursor': data['next_cursor']}
+        return self.walk(fetch)
+
+    def test_digest_pages_cover_every_article_once(self):
+        newest_first = [a.title for a in DBArticle.objects.order_by('-published_at', '-id')]
+        self.assertEqual(self.digest_pages(page_size=2), newest_first)
+        self.assertEqual(sorted(self.digest_pages(categories=['tech', 'sports'], per_category=1)), sorted(newest_first))
+        self.assertEqual(sorted(self.digest_pages(keywords=['bank'], page_size=3)), sorted(newest_first))
+
+    def test_bookmark_pages(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+
+        def fetch(cursor):
+            response = client.get('/api/user/bookmarks/', {'page_size': 3, **({'cursor': cursor} if cursor else {})})
+            self.assertEqual(response.status_code, 200)
+            data = response.json()
+            self.assertLessEqual(len(data['bookmarks']), 3)
+            return {'titles': [b['title'] for b in data['bookmarks']], 'next_cursor': data['next_cursor']}
+
+        expected = [b.article.title for b in Bookmark.objects.order_by('-created_at', '-id')]
+        self.assertEqual(self.walk(fetch), expected)
+        self.assertEqual(client.get('/api/user/bookmarks/', {'cursor': 'not-a-cursor'}).status_code, 400)
+
+    def test_requests_without_cursor_or_page_size_are_not_paged(self):
+        publisher = Publisher.objects.get()
+        now = timezone.now()
+        for n in range(views.BOOKMARKS_PAGE_SIZE + views.DIGEST_PAGE_SIZE):
+            article = DBArticle.objects.create(
+                title=f"Rates story {n}", summary="", url=f"https://example.com/more/{n}", publisher=publisher,
+                category='Tech', published_at=now - timedelta(days=1, minutes=n),
+            )
+            Bookmark.objects.create(user=self.user, article=article)
+        total = DBArticle.objects.count()
+
+        client = APIClient()
+        client.force_authenticate(self.user)
+        data = client.get('/api/user/bookmarks/').json()
+        self.assertEqual(len(data['bookmarks']), total)
+        self.assertIsNone(data['next_cursor'])
+
+        response = self.client.post('/api/generate-digest/', data=json.dumps({'keywords': ['rates']}),
+                                    content_type='application/json')
+        # Ranked keyword results are still capped at a page; the rest is one cursor away
+        self.assertEqual(len(response.json()['articles']), views.DIGEST_PAGE_SIZE)
+        response = self.client.post('/api/generate-digest/', content_type='application/json',
+                                    data=json.dumps({'keywords': ['rates'], 'cursor': response.json()['next_cursor']}))
+        self.assertEqual(len(response.json()['articles']), views.BOOKMARKS_PAGE_SIZE)
+        self.assertIsNone(response.json()['next_cursor'])
+
+
+class ArticleUpsertTests(TestCase):
+    def setUp(self):
+        self.publisher = Publisher.objects.create(name='AP')
+
+    def row(self, n, content, **extra):
+        return DBArticle(
+            title=f"Story {n}", summary=content[:20], content=content, url=f"https://example.com/{n}",
+            publisher=self.publisher, published_at=timezone.now(), **extra,
+        )
+
+    def test_counts_inserts_updates_and_unchanged_rows(self):
+        first = upsert_articles([self.row(n, "original text") for n in range(3)], chunk_size=2)
+        self.assertEqual((first.inserted, first.updated, first.unchanged), (3, 0, 0))
+        original = DBArticle.objects.get(url="https://example.com/1")
+
+        second = upsert_articles(
+            [self.row(0, "original text"), self.row(1, "corrected text"), self.row(1, "duplicate"), self.row(3, "new")],
+            chunk_size=2,
+        )
+        self.assertEqual((second.inserted, second.updated, second.unchanged), (1, 1, 1))
+        updated = DBArticle.objects.get(url="https://example.com/1")
+        self.assertEqual((updated.id, updated.content), (original.id, "corrected text"))
+        self.assertEqual(updated.published_at, original.published_at)
+        self.assertEqual(DBArticle.objects.count(), 4)
+
+    def test_pipeline_rewrites_a_changed_story_in_place(self):
+        config_dir = tempfile.mkdtemp()
+        Path(config_dir, 'settings.yaml').write_text(
+            "ml:\n  enrichment:\n    mode: background\n  cache:\n    enabled: false\n"
+        )
+        orchestrator = AgentOrchestrator(config_dir=config_dir)
+
+        def run(content):
+            scraped = [Article(title="Council vote", content=content, url="https://example.com/1", source='AP')]
+            with mock.patch('bytebrief.scrapers.async_universal.AsyncUniversalScraper.scrape_all',
+                            new=mock.AsyncMock(return_value=scraped)), \
+                    mock.patch('bytebrief.agent.enrichment.get_enrichment_pool') as pool:
+                orchestrator.run(ClientConfig(name='test', keywords=[], categories=[], excluded_keywords=[]))
+            return pool
+
+        run("The council will vote on the budget tomorrow.")
+        DBArticle.objects.update(enrichment_state='done', summary="Enriched summary")
+        pool = run("The council approved the budget by seven votes to two.")
+
+        row = DBArticle.objects.get()
+        self.assertEqual(row.content, "The council approved the budget by seven votes to two.")
+        self.assertEqual((row.summary, row.enrichment_state), (row.content, 'pending'))
+        pool.return_value.submit.assert_called_once_with([row.id])
+
+        # The same text again writes nothing and keeps the enriched summary
+        DBArticle.objects.update(enrichment_state='done', summary="Enriched again")
+        run("The council approved the budget by seven votes to two.")
+        self.assertEqual(DBArticle.objects.get().summary, "Enriched again")
+
+    def test_changed_content_is_queued_for_enrichment_again(self):
+        upsert_articles([self.row(1, "first draft", enrichment_state='done')])
+        upsert_articles([self.row(1, "second draft", enrichment_state='pending')])
+        self.assertEqual(DBArticle.objects.get().enrichment_state, 'pending')
+
+
+class CompressedContentTests(TestCase):
+    def setUp(self):
+        self.publisher = Publisher.objects.create(name='AP')
+        self.body = "The council approved the new flood barrier after a long debate. " * 40
+        self.article = DBArticle.objects.create(
+            title="Flood barrier approved", summary="Council approves barrier", content=self.body,
+            url="https://example.com/1", publisher=self.publisher, published_at=timezone.now(),
+        )
+
+    def test_content_is_stored_compressed_and_read_back_as_text(self):
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT content FROM news_brief_article WHERE id = %s", [self.article.id])
+            stored = bytes(cursor.fetchone()[0])
+        self.assertLess(len(stored), len(self.body) / 10)
+        self.assertEqual(DBArticle.objects.get(id=self.article.id).content, self.body)
+
+        self.article.content = "short"
+        self.article.save()
+        self.article.refresh_from_db()
+        self.assertEqual(self.article.content, "short")
+        self.assertEqual(CompressedTextField.decompress(CompressedTextField().compress("short")), "short")
+
+    def test_list_queries_leave_content_out_until_asked_for(self):
+        listed = DBArticle.objects.select_related('publisher').get(id=self.article.id)
+        self.assertEqual(listed.get_deferred_fields(), {'content'})
+        with self.assertNumQueries(1):
+            self.assertEqual(listed.content, self.body)
+
+        with self.assertNumQueries(1):
+            response = self.client.get(f'/api/articles/{self.article.id}/content/')
+        self.assertEqual(response.json()['content'], self.body)
+        self.assertEqual(self.client.get('/api/articles/999/content/').status_code, 404)
+
+    def test_lists_fall_back_to_a_content_snippet_without_a_summary(self):
+        pending = DBArticle.objects.create(
+            title="Flood barrier opens", summary="", content=self.body, url="https://example.com/2",
+            publisher=self.publisher, published_at=timezone.now(),
+        )
+        user = get_user_model().objects.create_user('reader', password='pw')
+        for article in (self.article, pending):
+            Bookmark.objects.create(user=user, article=article)
+
+        response = self.client.post('/api/generate-digest/', data='{}', content_type='application/json')
+        by_id = {a['id']: a['content'] for a in response.json()['articles']}
+        self.assertEqual(by_id[self.article.id], "Council approves barrier")
+        snippet = by_id[pending.id]
+        self.assertTrue(snippet.endswith('…') and self.body.startswith(snippet[:-1]))
+        self.assertLessEqual(len(snippet), views.CONTENT_SNIPPET_CHARS + 1)
+
+        client = APIClient()
+        client.force_authenticate(user)
+        with self.assertNumQueries(2):
+            bookmarks = client.get('/api/user/bookmarks/').json()['bookmarks']
+        self.assertEqual({b['id']: b['content'] for b in bookmarks}, by_id)
+
+
+class ArchiveRetentionTests(TestCase):
+    def setUp(self):
+        self.user = get_user_model().objects.create_user('reader', 'reader@example.com', 'pw')
+        self.publisher = Publisher.objects.create(name='AP')
+
+    def add(self, n, title, days_old):
+        return DBArticle.objects.create(
+            title=title, summary=f"Summary of {title.lower()}", content="full scraped text", category='Tech',
+            url=f"https://example.com/{n}", publisher=self.publisher,
+            published_at=timezone.now() - timedelta(days=days_old),
+        )
+
+    def test_moves_old_unbookmarked_articles_in_batches(self):
+        old = [self.add(n, f"Old story {n}", days_old=10 + n) for n in range(5)]
+        kept = self.add(5, "Bookmarked story", days_old=30)
+        fresh = self.add(6, "Fresh story", days_old=1)
+        Bookmark.objects.create(user=self.user, article=kept)
+
+        self.assertEqual(cleanup_old_news(batch_size=2), 5)
+        self.assertEqual(set(DBArticle.objects.values_list('id', flat=True)), {kept.id, fresh.id})
+        archived = ArchivedArticle.objects.get(url=old[0].url)
+        self.assertEqual((archived.title, archived.summary, archived.category_key), (old[0].title, old[0].summary, 'tech'))
+        self.assertEqual(archived.content_hash, old[0].content_hash)
+        self.assertEqual(archived.published_at, old[0].published_at)
+        self.assertEqual(cleanup_old_news(), 0)
+
+    def test_archiving_shrinks_and_prunes_story_clusters(self):
+        def cluster(count):
+            return StoryCluster.objects.create(title="Story", fingerprint=0, band_0=0, band_1=0, band_2=0, band_3=0,
+                                               article_count=count)
+
+        # Two rows plus a same-run syndicated copy that never got a row of its own
+        gone = cluster(3)
+        shrunk = cluster(2)
+        for n, (target, days_old) in enumerate([(gone, 20), (gone, 20), (shrunk, 20), (shrunk, 1)]):
+            DBArticle.objects.filter(id=self.add(n, f"Story {n}", days_old).id).update(cluster=target)
+
+        cleanup_old_news()
+        self.assertFalse(StoryCluster.objects.filter(id=gone.id).exists())
+        self.assertEqual(StoryCluster.objects.get(id=shrunk.id).article_count, 1)
+        self.assertEqual([c['id'] for c in self.client.get('/api/clusters/').json()['clusters']], [shrunk.id])
+
+        # A drained cluster left behind doesn't take new articles
+        StoryCluster.objects.filter(id=shrunk.id).update(article_count=0)
+        self.assertIsNone(StoryClusterer().find_cluster(0, timezone.now() - timedelta(hours=1)))
+
+    def test_archived_stories_stay_searchable(self):
+        self.add(1, "Flood defences tested", days_old=20)
+        self.add(2, "Election results", days_old=20)
+        cleanup_old_news()
+        self.assertEqual(search.search_article_ids(["flood"]), [])
+        archived = ArchivedArticle.objects.get(title="Flood defences tested")
+        self.assertEqual(search.search_archive_ids(["flood"]), [archived.id])
+
+        response = self.client.get('/api/archive/', {'q': 'flood'})
+        self.assertEqual([a['title'] for a in response.json()['articles']], ["Flood defences tested"])
+        response = self.client.get('/api/archive/', {'page_size': 1})
+        self.assertEqual(len(response.json()['articles']), 1)
+        self.assertIsNotNone(response.json()['next_cursor'])
+
+
+class BroadcastNotificationTests(TestCase):
+    def setUp(self):
+        users = get_user_model().objects
+        self.alice = users.create_user('alice', 'alice@example.com', 'pw')
+        self.bob = users.create_user('bob', 'bob@example.com', 'pw')
+        self.publisher = Publisher.objects.create(name='AP')
+
+    def notifications(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client, client.get('/api/user/notifications/').json()
+
+    def test_breaking_news_is_one_row_whatever_the_user_count(self):
+        with self.assertNumQueries(2):  # article insert + broadcast insert
+            DBArticle.objects.create(
+                title="Bridge collapses", summary="", category='Breaking', url="https://example.com/1",
+                publisher=self.publisher, published_at=timezone.now(),
+            )
+        self.assertEqual(BroadcastNotification.objects.count(), 1)
+        self.assertFalse(Notification.objects.exists())
+
+    def test_broadcasts_merge_with_personal_notifications_and_track_reads_per_user(self):
+        broadcast = BroadcastNotification.objects.create(title="Breaking", message="")
+        Notification.objects.create(user=self.alice, title="Welcome", message="")
+
+        client, listed = self.notifications(self.alice)
+        self.assertEqual([n['title'] for n in listed], ["Welcome", "Breaking"])
+        self.assertEqual(listed[1]['id'], f"broadcast-{broadcast.id}")
+
+        self.assertEqual(client.post('/api/user/notifications/', {'notification_id': listed[1]['id']}).status_code, 200)
+        self.assertEqual(client.post('/api/user/notifications/', {'notification_id': 'broadcast-x'}).status_code, 404)
+        self.assertTrue(self.notifications(self.alice)[1][1]['is_read'])
+        self.assertEqual([(n['title'], n['is_read']) for n in self.notifications(self.bob)[1]], [("Breaking", False)])
+        self.assertEqual(BroadcastRead.objects.count(), 1)
+
+
+@override_settings(REPLICA_DATABASE='replica')
+class ReplicaRoutingTests(TestCase):
+    """
+    Without DATABASE_REPLICA_URL the 'replica' alias is added for this class only:
+    a second test database (an SQLite file next to an in-memory primary) that it
+    creates and destroys itself.
+    """
+    # 'replica' joins in setUpClass: the runner checks every listed alias before any class is set up
+    databases = {'default'}
+
+    @classmethod
+    def setUpClass(cls):
+        cls.stand_in = 'replica' not in connections.settings
+        if cls.stand_in:
+            default = connections['default'].settings_dict
+            cls.replica_dir = tempfile.TemporaryDirectory(prefix='bytebrief-replica-')
+            connections.settings['replica'] = dict(default, TEST=dict(
+                default['TEST'],
+                # Tables are created from the models: third-party data migrations don't all honour the alias
+                MIGRATE=False,
+                NAME=str(Path(cls.replica_dir.name) / 'replica.sqlite3')
+                if connections['default'].vendor == 'sqlite' else f"{default['NAME']}_replica",
+            ))
+            cls.replica_name = connections['replica'].settings_dict['NAME']
+            connections['replica'].creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        cls.databases = {'default', 'replica'}
+        super().setUpClass()
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        if cls.stand_in:
+            connections['replica'].creation.destroy_test_db(cls.replica_name, verbosity=0)
+            del connections['replica']
+            del connections.settings['replica']
+            cls.replica_dir.cleanup()
+
+    def setUp(self):
+        if connections.settings['replica'].get('TEST', {}).get('MIRROR'):
+            self.skipTest("replica mirrors the test primary")
+        replica_health.reset()
+        self.user = get_user_model().objects.create_user('reader')
+        for alias in ('default', 'replica'):
+            publisher = Publisher.objects.using(alias).create(name='AP')
+            DBArticle.objects.using(alias).create(
+                title=f"On {alias}", summary="", url=f"https://example.com/{alias}", publisher=publisher,
+                published_at=timezone.now(),
+            )
+
+    def digest_titles(self, client=None):
+        response = (client or self.client).post('/api/generate-digest/', data='{}', content_type='application/json')
+        return [a['title'] for a in response.json()['articles']]
+
+    def test_read_only_requests_use_the_replica(self):
+        self.assertEqual(self.digest_titles(), ["On replica"])
+        # Outside a request (scheduler, commands) reads stay on the primary
+        self.assertEqual(list(DBArticle.objects.values_list('title', flat=True)), ["On default"])
+
+    def test_writes_pin_the_client_to_the_primary(self):
+        client = APIClient()
+        client.force_authenticate(self.user)
+        article = DBArticle.objects.get()
+        response = client.post('/api/user/bookmarks/', {'article_id': article.id}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(PIN_COOKIE, response.cookies)
+        self.assertTrue(Bookmark.objects.filter(user=self.user, article=article).exists())
+        # The cookie travels with the client's next requests until the replica catches up
+        self.assertEqual(self.digest_titles(client), ["On default"])
+
+    def test_unhealthy_replica_falls_back_to_the_primary(self):
+        with mock.patch.object(replica_health, '_check', return_value=False):
+            self.assertEqual(self.digest_titles(), ["On default"])
+
+
+class SqliteProfileTests(TestCase):
+    def test_connections_get_the_production_pragmas(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest("SQLite only")
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA busy_timeout")
+            self.assertEqual(cursor.fetchone()[0], 20000)
+            cursor.execute("PRAGMA synchronous")
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+        self.assertEqual(connection.transaction_mode, 'IMMEDIATE')
+        # WAL needs a file; the default test database is in memory
+        with tempfile.TemporaryDirectory() as path:
+            on_disk = type(connections['default'])(dict(connection.settings_dict, NAME=str(Path(path) / 'wal.sqlite3')), 'wal')
+            try:
+                with on_disk.cursor() as cursor:
+                    cursor.execute("PRAGMA journal_mode")
+                    self.assertEqual(cursor.fetchone()[0], 'wal')
+            finally:
+                on_disk.close()
+
+    def test_serialized_writes_commit_together(self):
+        publisher = Publisher.objects.create(name='AP')
+        with self.assertRaises(RuntimeError), serialized_writes():
+            make_db_article(publisher, Article(title="Half written", content="", url="https://example.com/1", source='AP'))
+            raise RuntimeError
+        self.assertFalse(DBArticle.objects.exists())
+
+
+class BackgroundEnrichmentTests(TestCase):
+    settings = {'ml': {'enrichment': {'mode': 'background'}, 'cache': {'enabled': False}}}
+
+    def setUp(self):
+        Publisher.objects.create(name='AP')
+        Publisher.objects.create(name='ESPN')
+        self.articles = [
+            Article(title="Bank rates rise", content="The bank raised rates again. " * 10, url="https://example.com/1", source='AP'),
+            Article(title="Cup final", content="A short match report.", url="https://example.com/2", source='ESPN', category='Sports'),
+        ]
+
+    def test_articles_are_published_before_ml_runs(self):
+        pool = mock.Mock()
+        processor = DataProcessor(ClientConfig(name='test'), settings=self.settings)
+        with mock.patch.object(processor_module, 'get_summarizer') as summarizer, \
+                mock.patch.object(processor_module, 'get_batched_classifier') as classifier, \
+                mock.patch('bytebrief.agent.enrichment.get_enrichment_pool', return_value=pool):
+            processor.process(self.articles)
+        summarizer.assert_not_called()
+        classifier.assert_not_called()
+
+        rows = {a.url: a for a in DBArticle.objects.all()}
+        self.assertEqual(rows["https://example.com/1"].enrichment_state, 'pending')
+        self.assertEqual(rows["https://example.com/1"].category, 'Finance')  # keyword placeholder
+        self.assertEqual(rows["https://example.com/2"].enrichment_state, 'pending_summary')
+        self.assertEqual(sorted(pool.submit.call_args.args[0]), sorted(a.id for a in rows.values()))
+
+    def test_pool_replaces_placeholders_and_marks_rows_done(self):
+        processor = DataProcessor(ClientConfig(name='test'), settings=self.settings)
+        with mock.patch('bytebrief.agent.enrichment.get_enrichment_pool'):
+            processor.process(self.articles)
+
+        classifier = mock.Mock()
+        classifier.classify.return_value = [{'labels': ['Business'], 'scores': [0.9]}]
+        fake_summarizer = lambda texts, **kw: [{'summary_text': "Rates went up."} for _ in texts]
+        with mock.patch.object(processor_module, 'get_summarizer', return_value=fake_summarizer), \
+                mock.patch.object(processor_module, 'get_batched_classifier', return_value=classifier):
+            updated = EnrichmentPool(self.settings).enrich(list(DBArticle.objects.values_list('id', flat=True)))
+
+        self.assertEqual(updated, 2)
+        bank = DBArticle.objects.get(url="https://example.com/1")
+        self.assertEqual((bank.summary, bank.category, bank.enrichment_state), ("Rates went up.", 'Business', 'done'))
+        cup = DBArticle.objects.get(url="https://example.com/2")
+        self.assertEqual((cup.summary, cup.category, cup.enrichment_state), ("A short match report.", 'Sports', 'done'))
+
+    def test_publisher_priors_apply_to_placeholders_and_enrichment(self):
+        settings = dict(self.settings, classification={'publisher_priors': {'ESPN': {'category': 'Sports'}}})
+        late_winner = Article(title="Late winner", content="A dramatic night.", url="https://example.com/3", source='ESPN')
+        processor = DataProcessor(ClientConfig(name='test'), settings=settings)
+        with mock.patch('bytebrief.agent.enrichment.get_enrichment_pool'):
+            processor.process([late_winner])
+        row = DBArticle.objects.get(url="https://example.com/3")
+        self.assertEqual((row.category, row.enrichment_state), ('Sports', 'pending'))
+
+        before = cascade_totals()
+        fake_summarizer = lambda texts, **kw: [{'summary_text': "A late goal."} for _ in texts]
+        with mock.patch.object(processor_module, 'get_summarizer', return_value=fake_summarizer), \
+                mock.patch.object(processor_module, 'get_batched_classifier') as classifier:
+            EnrichmentPool(settings).enrich([row.id])
+        classifier.assert_not_called()
+        row.refresh_from_db()
+        self.assertEqual((row.category, row.enrichment_state), ('Sports', 'done'))
+        after = cascade_totals()
+        self.assertEqual(after.get('publisher', 0) - before.get('publisher', 0), 1)
+        self.assertEqual(after.get('ml', 0), before.get('ml', 0))
+
+
+class CategoryCascadeTests(SimpleTestCase):
+    settings = {
+        'classification': {'publisher_priors': {'ESPN': {'category': 'Sports', 'confidence': 0.95}}},
+        'ml': {'cache': {'enabled': False}},
+    }
+
+    def test_only_ambiguous_articles_reach_the_model(self):
+        classifier = mock.Mock()
+        classifier.classify.return_value = [{'labels': ['Health'], 'scores': [0.8]}]
+        articles = [
+            Article(title="Late winner", content="a dramatic night", url="https://example.com/1", source='ESPN'),
+            Article(title="Rates", content="the bank says inflation and currency moves worry investors",
+                    url="https://example.com/2", source='AP'),
+            Article(title="Gallery", content="photos from the weekend", url="https://example.com/3", source='AP',
+                    tags=['science']),
+            Article(title="A quiet day", content="nothing obvious here", url="https://example.com/4", source='AP'),
+        ]
+        before = cascade_totals()
+        processor = DataProcessor(ClientConfig(name='test'), settings=self.settings)
+        with mock.patch.object(processor_module, 'get_batched_classifier', return_value=classifier):
+            processor._categorize_articles(articles)
+
+        self.assertEqual([a.category for a in articles], ['Sports', 'Finance', 'Science', 'Health'])
+        self.assertEqual(classifier.classify.call_args.args[0], [processor._classification_text(articles[3])])
+        after = cascade_totals()
+        for stage in ('publisher', 'keywords', 'feed_tag', 'ml'):
+            self.assertEqual(after.get(stage, 0) - before.get(stage, 0), 1)
+
+
+class ModelPreloadTests(SimpleTestCase):
+    def test_preload_loads_only_the_configured_models(self):
+        settings = {'ml': {'summarizer': 'extractive', 'classifier_backend': 'embedding'}}
+        with mock.patch.dict('os.environ', {}, clear=True), \
+                mock.patch.object(processor_module, 'load_summarizer') as summarizer, \
+                mock.patch.object(processor_module, 'load_batched_classifier') as nli, \
+                mock.patch.object(processor_module, 'load_embedding_classifier') as embedding:
+            processor_module.preload_models(settings)
+        summarizer.assert_not_called()
+        nli.assert_not_called()
+        embedding.assert_called_once()
+
+    def test_memory_report(self):
+        memory = process_memory()
+        self.assertGreater(memory['rss'], 0)
+        self.assertLessEqual(memory['pss'], memory['rss'])
+
+
+class ResourceGovernorTests(SimpleTestCase):
+    settings = {
+        'governor': {'enabled': True, 'memory_limit_mb': 1000, 'backlog_reduced': 10, 'backlog_keywords': 100},
+        'ml': {'summarizer': 'abstractive', 'classifier_backend': 'nli', 'summarizer_batch_size': 8},
+    }
+
+    def _apply(self, memory=0.1, backlog=0, elapsed=0.0):
+        governor = ResourceGovernor(self.settings)
+        readings = {'memory': memory, 'backlog': backlog, 'elapsed': elapsed}
+        with mock.patch.object(governor, 'readings', return_value=readings), \
+                mock.patch.object(processor_module, 'release_models') as release:
+            return governor.apply(self.settings), release
+
+    def test_worst_signal_picks_the_tier(self):
+        self.assertEqual(self._apply()[0]['ml']['tier'], 'full')
+        self.assertEqual(self._apply(backlog=10)[0]['ml']['tier'], 'reduced')
+        self.assertEqual(self._apply(elapsed=0.9)[0]['ml']['tier'], 'keywords')
+        self.assertEqual(self._apply(memory=0.75, backlog=150)[0]['ml']['tier'], 'keywords')
+
+    def test_memory_pressure_shrinks_batches_and_releases_models(self):
+        soft, release = self._apply(memory=0.75)
+        self.assertEqual(soft['ml']['summarizer_batch_size'], 4)
+        release.assert_not_called()
+        hard, release = self._apply(memory=0.9)
+        self.assertEqual(hard['ml']['summarizer_batch_size'], 2)
+        self.assertEqual(hard['ml']['classifier_backend'], 'keywords')
+        release.assert_called_once()
+        # The configured settings are left untouched
+        self.assertEqual(self.settings['ml']['summarizer_batch_size'], 8)
+
+    def test_downgraded_tier_summarizes_extractively(self):
+        settings, _ = self._apply(backlog=10)
+        processor = DataProcessor(ClientConfig(name='test'), settings=settings)
+        self.assertEqual(processor._summarizer_backend(), 'extractive')
+        self.assertFalse(ResourceGovernor({}).enabled)
+
+    def test_run_time_only_counts_during_runs(self):
+        governor = ResourceGovernor(self.settings)
+        with mock.patch('bytebrief.agent.governor.time.monotonic') as clock:
+            clock.return_value = 0.0
+            governor.start_run()
+            clock.return_value = 0.9 * governor.run_budget
+            self.assertAlmostEqual(governor.elapsed(), 0.9)
+            governor.end_run()
+            # Enrichment batches between scheduled runs are not held to the last run's clock
+            clock.return_value = 5 * governor.run_budget
+            self.assertEqual(governor.elapsed(), 0.0)
+            governor.start_run()
+            self.assertEqual(governor.elapsed(), 0.0)
+
+    def test_released_models_stay_released_until_memory_recovers(self):
+        governor = ResourceGovernor(self.settings)
+        tiers = []
+        with mock.patch.object(processor_module, 'release_models') as release:
+            for memory in (0.9, 0.75, 0.65, 0.55, 0.75):
+                with mock.patch.object(governor, 'readings', return_value={'memory': memory, 'backlog': 0, 'elapsed': 0.0}):
+                    tiers.append(governor.apply(self.settings)['ml']['tier'])
+        release.assert_called_once()
+        # Between memory_reacquire (0.60) and memory_hard the tier holds at keywords instead of reloading models
+        self.assertEqual(tiers, ['keywords', 'keywords', 'keywords', 'full', 'reduced'])
+
+
+class QueryPlanTests(TestCase):
+    """The hot endpoint queries must be served by an index, not a full table scan"""
+
+    @classmethod
+    def setUpTestData(cls):
+        now = timezone.now()
+        publishers = [Publisher.objects.create(name=f"Outlet {i}") for i in range(5)]
+        categories = ['Tech', 'Business', 'Sports', 'Health', 'Global']
+        DBArticle.objects.bulk_create([
+            DBArticle(
+                title=f"Story {i}", summary="", url=f"https://example.com/{i}", publisher=publishers[i % 5],
+                category=categories[i % 5], published_at=now - timedelta(hours=i),
+            )
+            for i in range(5000)
+        ])
+        users = [get_user_model().objects.create_user(f"reader{i}") for i in range(20)]
+        articles = list(DBArticle.objects.order_by('id')[:100])
+        Notification.objects.bulk_create(
+            [Notification(user=u, title="New story", message="") for u in users for _ in range(50)]
+        )
+        ReadingHistory.objects.bulk_create([ReadingHistory(user=u, article=a) for u in users for a in articles])
+        Bookmark.objects.bulk_create([Bookmark(user=u, article=a) for u in users for a in articles[:10]])
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+        cls.user = users[0]
+        cls.publisher = publishers[1]
+
+    def assertUsesIndex(self, qs, table):
+        """No full scan of `table`, and the index also provides the ordering (no sort step)"""
+        plan = qs.explain()
+        if connection.vendor == 'postgresql':
+            self.assertNotIn(f"Seq Scan on {table}", plan, plan)
+            self.assertNotRegex(plan, r"(?m)^\s*(->\s*)?Sort\b", plan)
+        else:
+            # SQLite: "SCAN t" reads every row; "SCAN t USING INDEX" / "SEARCH t ..." do not
+            full_scans = [line for line in plan.splitlines() if line.strip().endswith(f"SCAN {table}")]
+            self.assertFalse(full_scans, plan)
+            self.assertNotIn("TEMP B-TREE FOR ORDER BY", plan, plan)
+        self.assertTrue(any(word in plan for word in ('INDEX', 'Index')), plan)
+
+    def test_article_feeds_use_an_index(self):
+        since = timezone.now() - timedelta(days=1)
+        # generate_digest_api / send_daily_digests
+        self.assertUsesIndex(
+            DBArticle.objects.select_related('publisher', 'cluster').filter(published_at__gte=since), 'news_brief_article'
+        )
+        self.assertUsesIndex(DBArticle.objects.filter(category_key='tech')[:20], 'news_brief_article')
+        self.assertUsesIndex(DBArticle.objects.filter(publisher=self.publisher)[:20], 'news_brief_article')
+        # cleanup_old_news
+        self.assertUsesIndex(
+            DBArticle.objects.filter(published_at__lt=timezone.now() - timedelta(days=200))
+            .filter(~Exists(Bookmark.objects.filter(article=OuterRef('pk')))).order_by('published_at')[:500],
+            'news_brief_article',
+        )
+
+    def test_per_user_lists_use_an_index(self):
+        self.assertUsesIndex(Notification.objects.filter(user=self.user)[:20], 'news_brief_notification')
+        self.assertUsesIndex(ReadingHistory.objects.filter(user=self.user)[:50], 'news_brief_readinghistory')
+        self.assertUsesIndex(Bookmark.objects.filter(user=self.user), 'news_brief_bookmark')
@@ -7,6 +7,9 @@ from .account_views import (
 
 urlpatterns = [
     path('generate-digest/', views.generate_digest_api, name='generate_digest_api'),
+    path('clusters/', views.story_clusters_api, name='story_clusters_api'),
+    path('articles/<int:article_id>/content/', views.article_content_api, name='article_content_api'),
+    path('archive/', views.archive_search_api, name='archive_search_api'),
     path('metadata/', views.get_metadata, name='get_metadata'),
     path('admin/force-scrape/', views.force_scrape_api, name='force_scrape_api'),
     path('admin/clear-users/', views.clear_users_api, name='clear_users_api'),
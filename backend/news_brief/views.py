@@ -49,6 +49,7 @@ def serve_react(request, path=''):
         status=404
     )
 
+class GoogleLoginView(SocialLoginView):
     adapter_class = GoogleOAuth2Adapter
     callback_url = os.environ.get('FRONTEND_URL', 'http://localhost:3000')
     client_class = OAuth2Client
@@ -58,6 +59,7 @@ sys.path.append(str(Path(__file__).resolve().parent.parent / "src"))
 
 from bytebrief.core.models import ClientConfig
 from bytebrief.agent.orchestrator import AgentOrchestrator
+from bytebrief.agent.keywords import KeywordFilter
 
 @csrf_exempt
 def get_metadata(request):
@@ -105,12 +107,47 @@ def get_metadata(request):
         return JsonResponse(data)
     return JsonResponse({'status': 'error', 'message': 'Only GET method allowed'}, status=405)
 
-from .models import Article as DBArticle, UserPreference
+from .models import Article as DBArticle, ArchivedArticle, UserPreference, StoryCluster
 from django.utils import timezone
 from datetime import timedelta
 
-from django.db.models import Q
+from django.db.models import F, Q, Window
+from django.db.models.functions import RowNumber
+from .search import search_archive_ids, search_article_ids
+from .db_router import replica_reads
+from .pagination import InvalidCursor, after, decode_cursor, encode_cursor, keyset_page, page_size, position
 
+# Articles returned per requested category (the request may ask for up to the maximum)
+DIGEST_PER_CATEGORY = 30
+DIGEST_MAX_PER_CATEGORY = 100
+# Default and largest page for digests without categories (client-chosen with page_size)
+DIGEST_PAGE_SIZE = 100
+# Default and largest bookmark page. Bookmarks, and keyword digests by category, only page when
+# the request sends page_size or cursor; otherwise they return every bookmark / per_category matches
+BOOKMARKS_PAGE_SIZE = 50
+BOOKMARKS_MAX_PAGE_SIZE = 100
+# Default and largest archive page
+ARCHIVE_PAGE_SIZE = 50
+ARCHIVE_MAX_PAGE_SIZE = 100
+# List endpoints show this much of the scraped text for articles that have no summary yet
+CONTENT_SNIPPET_CHARS = 500
+
+
+def summaries(articles):
+    """
+    {article id: text to list it with}: the summary, or for articles without one
+    (not enriched yet) the start of the scraped content. Content is deferred, so
+    it is loaded in one query for just those articles.
+    """
+    text = {a.id: a.summary for a in articles}
+    missing = [pk for pk, summary in text.items() if not summary]
+    if missing:
+        for pk, content in DBArticle.objects.filter(pk__in=missing).values_list('id', 'content'):
+            if content:
+                text[pk] = content if len(content) <= CONTENT_SNIPPET_CHARS else content[:CONTENT_SNIPPET_CHARS].rstrip() + '…'
+    return text
+
+@replica_reads
 @csrf_exempt
 def generate_digest_api(request):
     if request.method == 'POST':
@@ -122,36 +159,94 @@ def generate_digest_api(request):
 
             # Fetch recent articles from DB (last 48 hours to keep it fresh)
             time_threshold = timezone.now() - timedelta(days=90)  # Extended to 90 days so existing articles are always included
-            qs = DBArticle.objects.select_related('publisher').filter(published_at__gte=time_threshold)
+            qs = DBArticle.objects.select_related('publisher', 'cluster').filter(published_at__gte=time_threshold)
             
-            if keywords:
-                # Combine keywords with OR logic for title and summary
-                q_objects = Q()
-                for keyword in keywords:
-                    q_objects |= Q(title__icontains=keyword) | Q(summary__icontains=keyword) | Q(content__icontains=keyword)
-                qs = qs.filter(q_objects)
-            
-            qs = qs.order_by('-published_at')
-            
-            # For simplicity matching the old keyword/category filter format
-            articles = []
-            if categories:
-                # Case-insensitive match: URL params arrive as 'tech', DB stores 'Tech'
-                cat_lower = [c.lower() for c in categories]
-                filtered_qs = [a for a in qs if (a.category or '').lower() in cat_lower]
+            qs = qs.order_by('-published_at', '-id')
+
+            # Case-insensitive match: URL params arrive as 'tech', DB stores 'Tech' (category_key is lower-cased)
+            cat_lower = sorted({c.lower() for c in categories})
+            per_category = max(1, min(int(data.get('per_category', DIGEST_PER_CATEGORY)), DIGEST_MAX_PER_CATEGORY))
+            size = page_size(data.get('page_size'), DIGEST_PAGE_SIZE, DIGEST_PAGE_SIZE)
+            cursor = decode_cursor(data.get('cursor')) or {}
+            paginated = 'page_size' in data or 'cursor' in data
+
+            # Keywords go through the full-text index (ranked by relevance and recency)
+            ranked_ids = search_article_ids(keywords, since=time_threshold, category_keys=cat_lower) if keywords else None
+            # Without a full-text backend, all keywords are matched in one pass over each article's text
+            keyword_filter = KeywordFilter(keywords) if keywords and ranked_ids is None else None
+
+            next_cursor = None
+            if ranked_ids is not None:
+                # Relevance order has no keyset; the cursor is an offset into the (cheap to recompute) ranking
+                offset = int(cursor.get('offset', 0))
+                page_ids = ranked_ids[offset:offset + size]
+                by_id = qs.in_bulk(page_ids)
+                rows = [by_id[pk] for pk in page_ids if pk in by_id]
+                if len(ranked_ids) > offset + size:
+                    next_cursor = encode_cursor({'offset': offset + size})
+            elif categories and not keyword_filter:
+                # Newest N per category after each category's own cursor position, ranked and cut in SQL
+                # on the (category_key, published_at) index; rank N + 1 only tells us whether more exist
+                positions = cursor.get('categories')
+                active = [c for c in cat_lower if positions is None or positions.get(c)]
+                condition = Q(pk__in=[])
+                for c in active:
+                    condition |= Q(category_key=c) & (after('published_at', positions[c]) if positions else Q())
+                ranked = list(qs.filter(condition).annotate(
+                    category_rank=Window(
+                        RowNumber(), partition_by=F('category_key'), order_by=[F('published_at').desc(), F('id').desc()],
+                    ),
+                ).filter(category_rank__lte=per_category + 1))
+                rows = [a for a in ranked if a.category_rank <= per_category]
+                more = {a.category_key for a in ranked if a.category_rank > per_category}
+                next_positions = {
+                    a.category_key: position(a, 'published_at')
+                    for a in rows if a.category_key in more and a.category_rank == per_category
+                }
+                if next_positions:
+                    next_cursor = encode_cursor({'categories': next_positions})
+            elif keyword_filter:
+                # Keywords are matched in Python: stream newest-first from the cursor until the page is full
+                # and one more match proves there is a next page
+                if categories:
+                    qs = qs.filter(category_key__in=cat_lower)
+                if cursor.get('after'):
+                    qs = qs.filter(after('published_at', cursor['after']))
+                rows = []
+                per_category_counts = defaultdict(int)
+                # Title and summary only, the same columns the full-text index covers
+                for a in qs.iterator(chunk_size=500):
+                    if not keyword_filter.allows(a.title, a.summary):
+                        continue
+                    if categories and not paginated:
+                        # Unpaginated: up to per_category matches from each requested category
+                        if per_category_counts[a.category_key] >= per_category:
+                            if all(per_category_counts[c] >= per_category for c in cat_lower):
+                                break
+                            continue
+                        per_category_counts[a.category_key] += 1
+                        rows.append(a)
+                        continue
+                    if len(rows) == size:
+                        next_cursor = encode_cursor({'after': position(rows[-1], 'published_at')})
+                        break
+                    rows.append(a)
             else:
-                filtered_qs = list(qs)[:100]  # Return top 100 if no category selected
-                
-            for a in filtered_qs:
+                rows, next_cursor = keyset_page(qs, 'published_at', data.get('cursor'), size)
+
+            articles = []
+            texts = summaries(rows)
+            for a in rows:
                 articles.append({
                     'id': a.id,
                     'title': a.title,
-                    'content': a.summary or a.content,
+                    'content': texts[a.id],
                     'source': a.publisher.name if a.publisher else 'Unknown',
                     'url': a.url,
                     'image_url': a.image_url,
                     'published_date': a.published_at.strftime("%Y-%m-%d %H:%M:%S") if a.published_at else None,
                     'category': a.category or 'Global',
+                    'cluster_size': a.cluster.article_count if a.cluster else 1,
                 })
 
             # Group articles by category for the frontend
@@ -166,12 +261,116 @@ def generate_digest_api(request):
                 'status': 'success',
                 'articles': articles,
                 'by_category': by_category,
+                'next_cursor': next_cursor,
             })
         except Exception as e:
             return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
     
     return JsonResponse({'status': 'error', 'message': 'Only POST method allowed'}, status=405)
 
+@csrf_exempt
+def story_clusters_api(request):
+    """List recent story clusters with how many articles/outlets cover each one."""
+    if request.method == 'GET':
+        try:
+            hours = int(request.GET.get('hours', 48))
+            limit = min(int(request.GET.get('limit', 50)), 200)
+            min_size = int(request.GET.get('min_size', 1))
+        except ValueError:
+            return JsonResponse({'status': 'error', 'message': 'hours, limit and min_size must be integers'}, status=400)
+
+        since = timezone.now() - timedelta(hours=hours)
+        clusters = (
+            StoryCluster.objects
+            .filter(last_seen_at__gte=since, article_count__gte=max(min_size, 1))
+            .order_by('-article_count', '-last_seen_at')
+            .prefetch_related('articles__publisher')[:limit]
+        )
+
+        data = []
+        for c in clusters:
+            members = list(c.articles.all())
+            data.append({
+                'id': c.id,
+                'title': c.title,
+                'category': c.category or 'Global',
+                'article_count': c.article_count,
+                'sources': sorted({m.publisher.name for m in members if m.publisher}),
+                'first_seen': c.created_at.strftime("%Y-%m-%d %H:%M:%S"),
+                'last_seen': c.last_seen_at.strftime("%Y-%m-%d %H:%M:%S"),
+                'articles': [{
+                    'id': m.id,
+                    'title': m.title,
+                    'source': m.publisher.name if m.publisher else 'Unknown',
+                    'url': m.url,
+                } for m in members],
+            })
+
+        return JsonResponse({'status': 'success', 'clusters': data})
+
+    return JsonResponse({'status': 'error', 'message': 'Only GET method allowed'}, status=405)
+
+@csrf_exempt
+def article_content_api(request, article_id):
+    """Full text of one article; list endpoints only carry the summary"""
+    if request.method != 'GET':
+        return JsonResponse({'status': 'error', 'message': 'Only GET method allowed'}, status=405)
+    article = DBArticle.objects.defer(None).only('id', 'summary', 'content').filter(id=article_id).first()
+    if article is None:
+        return JsonResponse({'status': 'error', 'message': 'Article not found'}, status=404)
+    return JsonResponse({'status': 'success', 'id': article.id, 'content': article.content or article.summary})
+
+@csrf_exempt
+def archive_search_api(request):
+    """
+    Search stories that aged out of the feed (tasks.cleanup_old_news). ?q= may repeat,
+    any keyword matches; without q the newest archived stories are listed.
+    """
+    if request.method != 'GET':
+        return JsonResponse({'status': 'error', 'message': 'Only GET method allowed'}, status=405)
+    keywords = [q for q in request.GET.getlist('q') if q.strip()]
+    categories = sorted({c.lower() for c in request.GET.getlist('category')})
+    size = page_size(request.GET.get('page_size'), ARCHIVE_PAGE_SIZE, ARCHIVE_MAX_PAGE_SIZE)
+    qs = ArchivedArticle.objects.select_related('publisher')
+    try:
+        cursor = decode_cursor(request.GET.get('cursor')) or {}
+        ranked_ids = search_archive_ids(keywords, category_keys=categories) if keywords else None
+        next_cursor = None
+        if ranked_ids is not None:
+            offset = int(cursor.get('offset', 0))
+            page_ids = ranked_ids[offset:offset + size]
+            by_id = qs.in_bulk(page_ids)
+            rows = [by_id[pk] for pk in page_ids if pk in by_id]
+            if len(ranked_ids) > offset + size:
+                next_cursor = encode_cursor({'offset': offset + size})
+        else:
+            if keywords:
+                # No full-text backend: title/summary substring match
+                condition = Q()
+                for keyword in keywords:
+                    condition |= Q(title__icontains=keyword) | Q(summary__icontains=keyword)
+                qs = qs.filter(condition)
+            if categories:
+                qs = qs.filter(category_key__in=categories)
+            rows, next_cursor = keyset_page(qs, 'published_at', request.GET.get('cursor'), size)
+    except ValueError:  # InvalidCursor or a malformed offset
+        return JsonResponse({'status': 'error', 'message': 'Invalid cursor'}, status=400)
+
+    return JsonResponse({
+        'status': 'success',
+        'articles': [{
+            'id': a.id,
+            'title': a.title,
+            'content': a.summary,
+            'source': a.publisher.name if a.publisher else 'Unknown',
+            'url': a.url,
+            'image_url': a.image_url,
+            'published_date': a.published_at.strftime("%Y-%m-%d %H:%M:%S"),
+            'category': a.category or 'Global',
+        } for a in rows],
+        'next_cursor': next_cursor,
+    })
+
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated
 
@@ -214,14 +413,29 @@ def user_bookmarks_api(request):
         return JsonResponse({'status': 'error', 'message': 'Unauthorized'}, status=401)
 
     if request.method == 'GET':
-        bookmarks = Bookmark.objects.filter(user=request.user).select_related('article')
+        bookmarks = Bookmark.objects.filter(user=request.user).select_related('article__publisher').defer('article__content')
+        if 'page_size' in request.GET or 'cursor' in request.GET:
+            try:
+                bookmarks, next_cursor = keyset_page(
+                    bookmarks,
+                    'created_at',
+                    request.GET.get('cursor'),
+                    page_size(request.GET.get('page_size'), BOOKMARKS_PAGE_SIZE, BOOKMARKS_MAX_PAGE_SIZE),
+                )
+            except InvalidCursor as e:
+                return JsonResponse({'status': 'error', 'message': str(e)}, status=400)
+        else:
+            # Clients that don't page (the saved list, bookmark toggles) get every bookmark
+            bookmarks, next_cursor = bookmarks.order_by('-created_at', '-id'), None
         data = []
+        bookmarks = list(bookmarks)
+        texts = summaries([b.article for b in bookmarks])
         for b in bookmarks:
             a = b.article
             data.append({
                 'id': a.id,
                 'title': a.title,
-                'content': a.summary or a.content,
+                'content': texts[a.id],
                 'source': a.publisher.name if a.publisher else 'Unknown',
                 'url': a.url,
                 'image_url': a.image_url,
@@ -231,7 +445,8 @@ def user_bookmarks_api(request):
             })
         return JsonResponse({
             'status': 'success',
-            'bookmarks': data
+            'bookmarks': data,
+            'next_cursor': next_cursor,
         })
 
     elif request.method == 'POST':
@@ -9,31 +9,72 @@ django.setup()
 
 from news_brief.models import Article
 from bytebrief.agent.processor import DataProcessor
-from bytebrief.core.models import ClientConfig
+from bytebrief.agent.cascade import cascade_totals
+from bytebrief.core.models import Article as CoreArticle, ClientConfig
 
-print("Reclassifying all existing articles with the new 20-category AI model...")
+# Articles are classified in chunks so the zero-shot model can batch them
+CHUNK_SIZE = 256
 
-processor = DataProcessor(ClientConfig(name="Reclassification", categories=[]))
+# --keywords-only skips the ML model and uses the compiled keyword matcher for a fast full-table pass
+KEYWORDS_ONLY = '--keywords-only' in sys.argv
 
-articles = Article.objects.all()
+if KEYWORDS_ONLY:
+    print("Reclassifying all existing articles with the compiled keyword matcher...")
+    processor = DataProcessor(
+        ClientConfig(name="Reclassification", categories=[]),
+        settings={'ml': {'classifier_backend': 'keywords'}},
+    )
+else:
+    print("Reclassifying all existing articles with the new 20-category AI model...")
+    processor = DataProcessor(ClientConfig(name="Reclassification", categories=[]))
+
+# The publisher name is the cascade's source prior, as it is during ingestion
+articles = (
+    Article.objects.defer(None).select_related('publisher')
+    .only('id', 'title', 'summary', 'content', 'category', 'url', 'publisher__name')
+    .order_by('id')
+)
 total = articles.count()
 print(f"Found {total} articles to reclassify.")
 
 updated_count = 0
-for i, article in enumerate(articles):
-    # Simulate the core Article model from core.models
-    class DummyArticle:
-        def __init__(self, title, content):
-            self.title = title
-            self.content = content
-            
-    dummy = DummyArticle(article.title, article.summary or article.content or "")
-    new_category = processor._categorize_article(dummy)
-    
-    if article.category != new_category:
-        article.category = new_category
-        article.save(update_fields=['category'])
-        updated_count += 1
-        print(f"[{i+1}/{total}] Migrated: '{article.title[:30]}...' -> {new_category}")
+processed = 0
+chunk = []
+
+def reclassify(chunk):
+    # Wrap DB rows in core Articles with no category so every one is classified
+    core_articles = [
+        CoreArticle(title=a.title, content=a.summary or a.content or "", url=a.url, source=a.publisher.name)
+        for a in chunk
+    ]
+    processor._categorize_articles(core_articles)
+
+    changed = []
+    for article, core in zip(chunk, core_articles):
+        if article.category != core.category:
+            print(f"Migrated: '{article.title[:30]}...' -> {core.category}")
+            article.category = core.category
+            changed.append(article)
+    if changed:
+        Article.objects.bulk_update(changed, ['category'])
+    return len(changed)
+
+for article in articles.iterator(chunk_size=CHUNK_SIZE):
+    chunk.append(article)
+    if len(chunk) == CHUNK_SIZE:
+        updated_count += reclassify(chunk)
+        processed += len(chunk)
+        print(f"[{processed}/{total}] articles reclassified")
+        chunk = []
+
+if chunk:
+    updated_count += reclassify(chunk)
+    processed += len(chunk)
+    print(f"[{processed}/{total}] articles reclassified")
 
 print(f"Successfully reclassified {updated_count} articles into the new categories!")
+
+stages = cascade_totals()
+if stages:
+    total = sum(stages.values())
+    print("Decided by: " + ", ".join(f"{stage} {count / total:.0%}" for stage, count in stages.items()))
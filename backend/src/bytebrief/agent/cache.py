@@ -0,0 +1,95 @@
+"""
+Persistent content-hash cache for summarizer and classifier outputs
+"""
+import hashlib
+import json
+import re
+import unicodedata
+from datetime import timedelta
+from typing import Any, Dict, List, Sequence, Tuple
+from loguru import logger
+
+# Keep IN (...) lists well under SQLite's bound-parameter limit
+_QUERY_CHUNK = 500
+
+
+def normalize_text(text: str) -> str:
+    """Unicode-normalize and collapse whitespace so trivially different copies share a key"""
+    return re.sub(r'\s+', ' ', unicodedata.normalize('NFKC', text or '')).strip()
+
+
+class InferenceCache:
+    """
+    Looks up and stores model outputs in the InferenceCacheEntry table.
+
+    The key covers the normalized input text, the model ID and the generation
+    parameters, so changing any of them naturally misses the old entries.
+    Cache errors are logged and treated as misses; they never break ingestion.
+    """
+
+    def __init__(self, kind: str, model_id: str, params: Dict[str, Any]):
+        self.kind = kind
+        self.model_id = model_id
+        self._prefix = f"{kind}\0{model_id}\0{json.dumps(params, sort_keys=True, default=str)}\0"
+
+    def key(self, text: str) -> str:
+        return hashlib.sha256((self._prefix + normalize_text(text)).encode('utf-8')).hexdigest()
+
+    def get_many(self, texts: Sequence[str]) -> Dict[int, Any]:
+        """Return {index into texts: cached value} for every hit, refreshing their LRU timestamp"""
+        from news_brief.models import InferenceCacheEntry
+        from django.utils import timezone
+
+        keys = [self.key(t) for t in texts]
+        try:
+            found: Dict[str, Any] = {}
+            unique_keys = list(dict.fromkeys(keys))
+            for start in range(0, len(unique_keys), _QUERY_CHUNK):
+                chunk = unique_keys[start:start + _QUERY_CHUNK]
+                found.update(InferenceCacheEntry.objects.filter(key__in=chunk).values_list('key', 'value'))
+                InferenceCacheEntry.objects.filter(key__in=[k for k in chunk if k in found]).update(last_used_at=timezone.now())
+        except Exception as e:
+            logger.warning(f"Inference cache lookup failed, running models instead: {e}")
+            return {}
+
+        hits = {i: found[k] for i, k in enumerate(keys) if k in found}
+        if texts:
+            logger.info(f"Inference cache ({self.kind}): {len(hits)}/{len(texts)} hits")
+        return hits
+
+    def set_many(self, items: List[Tuple[str, Any]]):
+        """Store (input text, output value) pairs"""
+        from news_brief.models import InferenceCacheEntry
+
+        from news_brief.sqlite import serialized_writes
+
+        entries = {self.key(text): value for text, value in items}
+        try:
+            with serialized_writes():
+                InferenceCacheEntry.objects.bulk_create(
+                    [InferenceCacheEntry(key=k, kind=self.kind, value=v) for k, v in entries.items()],
+                    ignore_conflicts=True,
+                )
+        except Exception as e:
+            logger.warning(f"Inference cache write failed: {e}")
+
+    @staticmethod
+    def prune(max_entries: int = 50000, max_age_days: int = 30) -> int:
+        """Evict entries unused for max_age_days, then the least recently used beyond max_entries"""
+        from news_brief.models import InferenceCacheEntry
+        from django.utils import timezone
+
+        deleted, _ = InferenceCacheEntry.objects.filter(
+            last_used_at__lt=timezone.now() - timedelta(days=max_age_days)
+        ).delete()
+
+        overflow_ids = list(
+            InferenceCacheEntry.objects.order_by('-last_used_at', '-id').values_list('id', flat=True)[max_entries:]
+        )
+        for start in range(0, len(overflow_ids), _QUERY_CHUNK):
+            count, _ = InferenceCacheEntry.objects.filter(id__in=overflow_ids[start:start + _QUERY_CHUNK]).delete()
+            deleted += count
+
+        if deleted:
+            logger.info(f"Inference cache: evicted {deleted} entries")
+        return deleted
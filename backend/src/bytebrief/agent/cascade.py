@@ -0,0 +1,88 @@
+"""
+Cheap-first category cascade: publisher/feed priors and keyword scores before the ML model
+"""
+import threading
+from collections import Counter
+from typing import Any, Dict, List, Optional, Tuple
+from loguru import logger
+from ..core.models import Article
+from .keywords import CATEGORY_MATCHER
+
+# Stages in the order an article can leave the cascade
+STAGES = ('breaking', 'publisher', 'feed_tag', 'keywords', 'ml', 'fallback')
+
+_totals: Counter = Counter()
+_totals_lock = threading.Lock()
+
+
+def cascade_totals() -> Dict[str, int]:
+    """Articles categorized by each stage since this process started"""
+    with _totals_lock:
+        return dict(_totals)
+
+
+class CategoryCascade:
+    """
+    Proposes a category with a confidence from signals that cost nothing to
+    compute, so only genuinely ambiguous articles reach the transformer:
+
+      publisher  a configured prior for mono-topic outlets (ESPN -> Sports)
+      feed_tag   an RSS/feed tag that names one of the categories
+      keywords   distinct keyword hits of the leading category over the runner-up
+
+    A proposal at or above `ml_threshold` is final; below it, the article goes
+    to the ML classifier and the best proposal is kept as its fallback.
+    """
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None, categories: Optional[List[str]] = None):
+        config = (settings or {}).get('classification', {})
+        self.enabled = config.get('cascade', True)
+        self.ml_threshold = config.get('ml_threshold', 0.9)
+        self.keyword_min_margin = max(1, config.get('keyword_min_margin', 3))
+        self.tag_confidence = config.get('feed_tag_confidence', 0.9)
+        self.publisher_priors = {
+            name.lower(): (prior['category'], prior.get('confidence', 1.0))
+            for name, prior in (config.get('publisher_priors') or {}).items()
+        }
+        self.categories = {c.lower(): c for c in categories or []}
+
+    def propose(self, article: Optional[Article], text: str) -> Optional[Tuple[str, float, str]]:
+        """Best (category, confidence, stage) from the cheap signals, or None"""
+        if not self.enabled:
+            return None
+
+        proposals = []
+        if article is not None:
+            prior = self.publisher_priors.get((article.source or '').lower())
+            if prior:
+                proposals.append((prior[0], prior[1], 'publisher'))
+            for tag in article.tags or []:
+                category = self.categories.get(str(tag).strip().lower())
+                if category:
+                    proposals.append((category, self.tag_confidence, 'feed_tag'))
+                    break
+
+        counts = CATEGORY_MATCHER.counts(text)
+        if counts:
+            ranked = sorted(counts.values(), reverse=True)
+            top = ranked[0]
+            runner_up = ranked[1] if len(ranked) > 1 else 0
+            category = CATEGORY_MATCHER.best_group(text)
+            proposals.append((category, min(1.0, (top - runner_up) / self.keyword_min_margin), 'keywords'))
+
+        # Highest confidence wins; earlier (more specific) signals win ties
+        return max(proposals, key=lambda p: p[1]) if proposals else None
+
+    def is_confident(self, proposal: Optional[Tuple[str, float, str]]) -> bool:
+        return proposal is not None and proposal[1] >= self.ml_threshold
+
+    @staticmethod
+    def record(stages: Counter):
+        """Log the share of articles each stage decided and add them to the process totals"""
+        total = sum(stages.values())
+        if not total:
+            return
+        with _totals_lock:
+            _totals.update(stages)
+        shares = ', '.join(f"{stage} {stages[stage] / total:.0%}" for stage in STAGES if stages.get(stage))
+        logger.info(f"Category cascade over {total} articles: {shares}")
@@ -0,0 +1,121 @@
+"""
+Incremental story clustering: attach freshly saved articles to recent StoryClusters
+"""
+from datetime import timedelta
+from typing import Dict, List, Optional, Tuple
+from simhash import Simhash
+from loguru import logger
+from django.db.models import F, Q
+from django.utils import timezone
+from news_brief.models import Article as DBArticle, StoryCluster
+from news_brief.sqlite import serialized_writes
+from ..core.models import Article
+from .dedup import article_text, char_ngrams, hamming_distance, split_bands
+
+
+def to_signed(value: int) -> int:
+    """Map an unsigned 64-bit fingerprint onto the signed range a BigIntegerField can hold."""
+    return value - (1 << 64) if value >= (1 << 63) else value
+
+
+def to_unsigned(value: int) -> int:
+    return value + (1 << 64) if value < 0 else value
+
+
+class StoryClusterer:
+    """
+    Assigns each new article to an existing recent cluster or opens a new one.
+
+    Candidate clusters are found through the banded fingerprint index on
+    StoryCluster, so the work done per run is proportional to the number of new
+    articles rather than the size of the corpus. With four bands the lookup is
+    exact for thresholds up to 3 bits.
+    """
+
+    def __init__(self, threshold: int = 3, window_hours: int = 48):
+        self.threshold = threshold
+        self.window = timedelta(hours=window_hours)
+
+    def fingerprint(self, article: Article) -> int:
+        """Reuse the simhash computed during deduplication when there is one"""
+        simhash = getattr(article, 'simhash', None)
+        if isinstance(simhash, Simhash):
+            return simhash.value
+        return Simhash(char_ngrams(article_text(article))).value
+
+    def find_cluster(self, value: int, since) -> Optional[int]:
+        """Return the id of the closest recent cluster within the threshold"""
+        bands = split_bands(value)
+        band_match = Q()
+        for i, band in enumerate(bands):
+            band_match |= Q(**{f'band_{i}': band})
+
+        # Clusters whose articles were all archived (count drained to 0) are stale even if recently seen
+        candidates = StoryCluster.objects.filter(
+            band_match, last_seen_at__gte=since, article_count__gt=0,
+        ).values_list('id', 'fingerprint')
+
+        best_id, best_distance = None, self.threshold + 1
+        for cluster_id, fingerprint in candidates:
+            distance = hamming_distance(value, to_unsigned(fingerprint))
+            if distance < best_distance:
+                best_id, best_distance = cluster_id, distance
+        return best_id
+
+    def assign(self, articles: List[Article]) -> Tuple[int, int]:
+        """
+        Cluster the given (already persisted) articles.
+        Returns (articles assigned to existing clusters, clusters created).
+        """
+        if not articles:
+            return 0, 0
+
+        saved = dict(
+            DBArticle.objects.filter(url__in=[a.url[:1000] for a in articles], cluster__isnull=True)
+            .values_list('url', 'id')
+        )
+
+        now = timezone.now()
+        since = now - self.window
+        members_by_cluster: Dict[int, List[int]] = {}
+        joined = created = 0
+
+        # One short write transaction for the whole batch instead of one commit per article
+        with serialized_writes():
+            for article in articles:
+                article_id = saved.get(article.url[:1000])
+                if article_id is None:
+                    continue
+
+                value = self.fingerprint(article)
+                cluster_id = self.find_cluster(value, since)
+
+                if cluster_id is None:
+                    bands = split_bands(value)
+                    cluster = StoryCluster.objects.create(
+                        title=article.title[:500],
+                        category=article.category,
+                        fingerprint=to_signed(value),
+                        band_0=bands[0],
+                        band_1=bands[1],
+                        band_2=bands[2],
+                        band_3=bands[3],
+                        article_count=1,
+                        last_seen_at=now,
+                    )
+                    cluster_id = cluster.id
+                    created += 1
+                else:
+                    StoryCluster.objects.filter(id=cluster_id).update(
+                        article_count=F('article_count') + 1,
+                        last_seen_at=now,
+                    )
+                    joined += 1
+
+                members_by_cluster.setdefault(cluster_id, []).append(article_id)
+
+            for cluster_id, article_ids in members_by_cluster.items():
+                DBArticle.objects.filter(id__in=article_ids).update(cluster_id=cluster_id)
+
+        logger.info(f"Clustering: {joined} articles joined existing stories, {created} new stories opened")
+        return joined, created
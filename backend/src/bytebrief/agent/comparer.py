@@ -1,39 +1,46 @@
 """
 News Comparer for deduplicating articles
 """
-from typing import List
+from typing import Any, Dict, List, Optional
 from ..core.models import Article
-from simhash import Simhash
+from .dedup import DedupStrategy, SimhashStrategy, char_ngrams, create_strategy, group_duplicates
 from loguru import logger
-import re
 from news_brief.models import Article as DBArticle
 
 class NewsComparer:
-    """Logic to compare and group similar articles using Simhash"""
+    """Logic to compare and group similar articles using a pluggable dedup strategy"""
     
-    def __init__(self, threshold: int = 3):
+    def __init__(self, threshold: int = 3, strategy: Optional[DedupStrategy] = None):
         # Difference in bits. Typically 3 for simhash text comparison
         self.threshold = threshold
+        self.strategy = strategy or SimhashStrategy(threshold)
+
+    @classmethod
+    def from_settings(cls, settings: Dict[str, Any]) -> 'NewsComparer':
+        """Build a comparer from the `dedup` block of settings.yaml"""
+        dedup_config = dict((settings or {}).get('dedup') or {})
+        strategy = create_strategy(dedup_config.pop('strategy', 'simhash'), **dedup_config)
+        return cls(strategy=strategy)
         
     def get_features(self, text: str):
-        width = 3
-        text = text.lower()
-        text = re.sub(r'[^\w]+', '', text)
-        return [text[i:i + width] for i in range(max(len(text) - width + 1, 1))]
+        return char_ngrams(text)
         
-    def deduplicate(self, articles: List[Article]) -> List[Article]:
+    def deduplicate(self, articles: List[Article], known: Optional[List[Article]] = None) -> List[Article]:
         """
-        Group similar articles using Simhash and drop articles already stored in DB.
+        Group similar articles with the configured strategy and drop articles already stored in DB.
+        Pass a `known` list to collect the stored ones instead (e.g. to refresh edited stories).
         """
         if not articles:
             return []
             
         # 1. Filter out exact URL duplicates from the database
-        db_urls = set(DBArticle.objects.filter(url__in=[a.url for a in articles]).values_list('url', flat=True))
-        new_articles = [a for a in articles if a.url not in db_urls]
+        db_urls = set(DBArticle.objects.filter(url__in=[a.url[:1000] for a in articles]).values_list('url', flat=True))
+        new_articles = [a for a in articles if a.url[:1000] not in db_urls]
+        if known is not None:
+            known.extend(a for a in articles if a.url[:1000] in db_urls)
         
         if len(new_articles) < len(articles):
-            logger.info(f"Dropped {len(articles) - len(new_articles)} articles already existing in database.")
+            logger.info(f"Set aside {len(articles) - len(new_articles)} articles already existing in database.")
             
         if not new_articles:
             return []
@@ -41,27 +48,7 @@ class NewsComparer:
         # Sort by date
         new_articles.sort(key=lambda x: x.published_date if x.published_date else '1970', reverse=True)
         
-        unique_articles = []
-        
-        for current in new_articles:
-            # Create a simhash from title + content
-            text_to_hash = current.title + " " + (current.content or "")
-            current.simhash = Simhash(self.get_features(text_to_hash))
-            
-            is_duplicate = False
-            for unique in unique_articles:
-                # Compare bit difference
-                distance = current.simhash.distance(unique.simhash)
-                if distance <= self.threshold:
-                    if not hasattr(unique, 'related_articles'):
-                        unique.related_articles = []
-                    unique.related_articles.append(current)
-                    is_duplicate = True
-                    break
-            
-            if not is_duplicate:
-                current.related_articles = []
-                unique_articles.append(current)
+        unique_articles = group_duplicates(new_articles, self.strategy)
                 
-        logger.info(f"Simhash: Reduced {len(new_articles)} raw incoming articles to {len(unique_articles)} unique stories")
+        logger.info(f"{self.strategy.name}: Reduced {len(new_articles)} raw incoming articles to {len(unique_articles)} unique stories")
         return unique_articles
@@ -0,0 +1,216 @@
+"""
+Pluggable near-duplicate detection strategies used by the NewsComparer
+"""
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+import hashlib
+import re
+import zlib
+import numpy as np
+from simhash import Simhash
+from ..core.models import Article
+
+BAND_COUNT = 4
+BAND_BITS = 16
+BAND_MASK = (1 << BAND_BITS) - 1
+
+
+def char_ngrams(text: str, width: int = 3) -> List[str]:
+    """Character n-grams of the text with punctuation and whitespace removed"""
+    text = re.sub(r'[^\w]+', '', text.lower())
+    return [text[i:i + width] for i in range(max(len(text) - width + 1, 1))]
+
+
+def split_bands(value: int) -> List[int]:
+    """Split a 64-bit fingerprint into its four 16-bit bands"""
+    return [(value >> (i * BAND_BITS)) & BAND_MASK for i in range(BAND_COUNT)]
+
+
+def hamming_distance(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+
+def article_text(article: Article) -> str:
+    return article.title + " " + (article.content or "")
+
+
+class DedupStrategy(ABC):
+    """
+    Decides whether an incoming article duplicates one already kept in this run.
+
+    Strategies are stateful for the duration of one grouping pass: call reset()
+    and then match_or_add() once per article.
+    """
+
+    name = ''
+    default_threshold: Any = None
+
+    def __init__(self, threshold: Any = None):
+        self.threshold = self.default_threshold if threshold is None else threshold
+        self.reset()
+
+    @abstractmethod
+    def reset(self):
+        """Forget every article indexed so far"""
+
+    @abstractmethod
+    def match_or_add(self, article: Article) -> Optional[Article]:
+        """Return the kept article this one duplicates, or index it and return None"""
+
+
+class SimhashStrategy(DedupStrategy):
+    """64-bit Simhash over character trigrams, compared by Hamming distance"""
+
+    name = 'simhash'
+    default_threshold = 3
+
+    def reset(self):
+        self._kept: List[Tuple[int, Article]] = []
+        self._bands: List[Dict[int, List[int]]] = [{} for _ in range(BAND_COUNT)]
+
+    def match_or_add(self, article: Article) -> Optional[Article]:
+        article.simhash = Simhash(char_ngrams(article_text(article)))
+        value = article.simhash.value
+
+        if self.threshold < BAND_COUNT:
+            # Pigeonhole: within `threshold` bits at least one 16-bit band is identical
+            candidates = {idx for i, band in enumerate(split_bands(value)) for idx in self._bands[i].get(band, ())}
+            candidates = sorted(candidates)
+        else:
+            candidates = range(len(self._kept))
+
+        for idx in candidates:
+            kept_value, kept = self._kept[idx]
+            if hamming_distance(value, kept_value) <= self.threshold:
+                return kept
+
+        idx = len(self._kept)
+        self._kept.append((value, article))
+        for i, band in enumerate(split_bands(value)):
+            self._bands[i].setdefault(band, []).append(idx)
+        return None
+
+
+class MinHashLSHStrategy(DedupStrategy):
+    """
+    MinHash signatures over word shingles, bucketed with LSH banding.
+    The threshold is the minimum estimated Jaccard similarity (0-1).
+    """
+
+    name = 'minhash'
+    default_threshold = 0.5
+    _MASK32 = np.uint64(0xFFFFFFFF)
+
+    def __init__(self, threshold: Optional[float] = None, num_perm: int = 64, shingle_size: int = 3, seed: int = 1):
+        self.num_perm = num_perm
+        self.shingle_size = shingle_size
+        rng = np.random.RandomState(seed)
+        self._a = rng.randint(1, 2 ** 32 - 1, size=num_perm, dtype=np.uint64)
+        self._b = rng.randint(0, 2 ** 32 - 1, size=num_perm, dtype=np.uint64)
+        super().__init__(threshold)
+        self.bands, self.rows = self._choose_bands(self.threshold, num_perm)
+
+    @staticmethod
+    def _choose_bands(threshold: float, num_perm: int) -> Tuple[int, int]:
+        """Pick the (bands, rows) split whose S-curve midpoint sits closest below the threshold"""
+        best = (num_perm, 1)
+        best_gap = None
+        for rows in range(1, num_perm + 1):
+            if num_perm % rows:
+                continue
+            bands = num_perm // rows
+            midpoint = (1.0 / bands) ** (1.0 / rows)
+            # Favour recall: candidates are verified against the threshold anyway
+            gap = threshold - midpoint if midpoint <= threshold else 2 * (midpoint - threshold)
+            if best_gap is None or gap < best_gap:
+                best, best_gap = (bands, rows), gap
+        return best
+
+    def shingles(self, text: str) -> List[str]:
+        words = re.findall(r'\w+', text.lower())
+        if len(words) <= self.shingle_size:
+            return [' '.join(words)]
+        return [' '.join(words[i:i + self.shingle_size]) for i in range(len(words) - self.shingle_size + 1)]
+
+    def signature(self, text: str) -> np.ndarray:
+        hashes = np.array([zlib.crc32(s.encode('utf-8')) for s in set(self.shingles(text))], dtype=np.uint64)
+        permuted = (self._a[:, None] * hashes[None, :] + self._b[:, None]) & self._MASK32
+        return permuted.min(axis=1)
+
+    def reset(self):
+        self._kept: List[Tuple[np.ndarray, Article]] = []
+        self._buckets: Dict[Tuple[int, bytes], List[int]] = {}
+
+    def match_or_add(self, article: Article) -> Optional[Article]:
+        signature = self.signature(article_text(article))
+        keys = [(b, signature[b * self.rows:(b + 1) * self.rows].tobytes()) for b in range(self.bands)]
+
+        candidates = sorted({idx for key in keys for idx in self._buckets.get(key, ())})
+        best, best_similarity = None, self.threshold
+        for idx in candidates:
+            kept_signature, kept = self._kept[idx]
+            similarity = float(np.mean(signature == kept_signature))
+            if similarity >= best_similarity:
+                best, best_similarity = kept, similarity
+        if best is not None:
+            return best
+
+        idx = len(self._kept)
+        self._kept.append((signature, article))
+        for key in keys:
+            self._buckets.setdefault(key, []).append(idx)
+        return None
+
+
+class TitleHashStrategy(DedupStrategy):
+    """Exact match on a hash of the normalized headline; the threshold is unused"""
+
+    name = 'title_hash'
+    # Trailing " - Reuters" / " | BBC News" style publisher suffixes
+    _SUFFIX = re.compile(r'\s+[-|–—]\s+[^-|–—]{1,40}$')
+
+    def normalize(self, title: str) -> str:
+        title = self._SUFFIX.sub('', title.strip())
+        return ' '.join(re.findall(r'\w+', title.lower()))
+
+    def reset(self):
+        self._kept: Dict[bytes, Article] = {}
+
+    def match_or_add(self, article: Article) -> Optional[Article]:
+        key = hashlib.blake2b(self.normalize(article.title).encode('utf-8'), digest_size=8).digest()
+        kept = self._kept.get(key)
+        if kept is None:
+            self._kept[key] = article
+        return kept
+
+
+_strategies = {
+    SimhashStrategy.name: SimhashStrategy,
+    MinHashLSHStrategy.name: MinHashLSHStrategy,
+    TitleHashStrategy.name: TitleHashStrategy,
+}
+
+
+def create_strategy(name: str = 'simhash', **params) -> DedupStrategy:
+    """Instantiate a strategy by name, e.g. from the `dedup` block of settings.yaml"""
+    strategy_class = _strategies.get(name)
+    if strategy_class is None:
+        raise ValueError(f"Unknown dedup strategy '{name}'. Choose one of: {', '.join(_strategies)}")
+    return strategy_class(**params)
+
+
+def group_duplicates(articles: List[Article], strategy: DedupStrategy) -> List[Article]:
+    """
+    Keep the first article of every duplicate group, attaching the rest to its
+    `related_articles`. Input order decides which copy is kept.
+    """
+    strategy.reset()
+    unique_articles = []
+    for current in articles:
+        kept = strategy.match_or_add(current)
+        if kept is not None:
+            kept.related_articles.append(current)
+        else:
+            current.related_articles = []
+            unique_articles.append(current)
+    return unique_articles
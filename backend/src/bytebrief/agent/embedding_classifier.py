@@ -0,0 +1,113 @@
+"""
+Category classification by sentence-embedding similarity to precomputed label vectors
+"""
+import hashlib
+import os
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+import numpy as np
+from loguru import logger
+
+# Small sentence encoder (6 layers, 384 dims), mean-pooled like sentence-transformers does
+EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+LABEL_TEMPLATE = "This news article is about {}."
+
+
+def label_vector_dir() -> Path:
+    """Where label embeddings are cached between runs"""
+    root = os.environ.get('BYTEBRIEF_CACHE_DIR') or Path.home() / ".cache" / "bytebrief"
+    return Path(root) / "label_vectors"
+
+
+class EmbeddingZeroShotClassifier:
+    """
+    Scores texts against a fixed set of labels with one encoder pass per text.
+
+    Each label is embedded once (from `label_template`) and the matrix is kept
+    on disk, keyed by model, labels and template, so later processes only load
+    a small .npy file. An article is embedded once and compared to every label
+    by cosine similarity, instead of one NLI forward pass per label.
+    Similarities are turned into a distribution with a temperature-scaled
+    softmax, so the result has the same shape and `best_score > threshold`
+    meaning as BatchedZeroShotClassifier.classify().
+    """
+
+    def __init__(self, model, tokenizer, labels: List[str], model_id: str = EMBEDDING_MODEL,
+                 label_template: str = LABEL_TEMPLATE, temperature: float = 0.05, max_length: int = 256,
+                 cache_dir: Optional[Path] = None):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.labels = list(labels)
+        self.model_id = model_id
+        self.label_template = label_template
+        self.temperature = temperature
+        self.max_length = max_length
+        self.cache_dir = Path(cache_dir) if cache_dir else label_vector_dir()
+        self.label_vectors = self._load_label_vectors()
+
+    def _label_vector_path(self) -> Path:
+        key = "\0".join([self.model_id, self.label_template, *self.labels])
+        return self.cache_dir / f"{hashlib.sha256(key.encode('utf-8')).hexdigest()[:32]}.npy"
+
+    def _load_label_vectors(self) -> np.ndarray:
+        path = self._label_vector_path()
+        try:
+            vectors = np.load(path)
+            if vectors.shape[0] == len(self.labels):
+                return vectors
+        except (OSError, ValueError):
+            pass
+
+        vectors = self.encode([self.label_template.format(label) for label in self.labels])
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix('.tmp.npy')
+            np.save(tmp, vectors)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Could not cache label vectors at {path}: {e}")
+        return vectors
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        """L2-normalized mean-pooled embeddings, one row per text"""
+        import torch
+
+        inputs = self.tokenizer(texts, return_tensors="pt", padding=True, truncation=True, max_length=self.max_length)
+        with torch.inference_mode():
+            hidden = self.model(**inputs).last_hidden_state
+        mask = inputs['attention_mask'].unsqueeze(-1).to(hidden.dtype)
+        pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+        pooled = torch.nn.functional.normalize(pooled, dim=-1)
+        return pooled.float().numpy()
+
+    def _score_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        logits = self.encode(texts) @ self.label_vectors.T / self.temperature
+        logits -= logits.max(axis=1, keepdims=True)
+        scores = np.exp(logits)
+        scores /= scores.sum(axis=1, keepdims=True)
+
+        results = []
+        for row in scores:
+            order = np.argsort(-row)
+            results.append({'labels': [self.labels[i] for i in order], 'scores': [float(row[i]) for i in order]})
+        return results
+
+    def classify(self, texts: List[str], batch_size: int = 32) -> List[Optional[Dict[str, Any]]]:
+        """Classify texts in encoder batches; a failed batch yields None for each of its texts"""
+        batch_size = max(1, batch_size)
+        results: List[Optional[Dict[str, Any]]] = []
+        start = time.perf_counter()
+
+        for offset in range(0, len(texts), batch_size):
+            batch = texts[offset:offset + batch_size]
+            try:
+                results.extend(self._score_batch(batch))
+            except Exception as e:
+                logger.warning(f"Embedding classification batch {offset // batch_size + 1} failed: {e}")
+                results.extend([None] * len(batch))
+
+        elapsed = time.perf_counter() - start
+        if texts and elapsed > 0:
+            logger.info(f"Embedded and classified {len(texts)} articles ({len(texts) / elapsed:.2f} articles/s)")
+        return results
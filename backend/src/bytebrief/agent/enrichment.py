@@ -0,0 +1,162 @@
+"""
+Background enrichment: summarize and classify articles after they are published
+"""
+import queue
+import threading
+from datetime import timedelta
+from typing import Any, Dict, Iterable, List, Optional, Set
+from loguru import logger
+from django.db import close_old_connections
+from django.utils import timezone
+from news_brief.models import Article as DBArticle
+from news_brief.sqlite import serialized_writes
+from ..core.models import Article, ClientConfig
+
+# Article.enrichment_state values
+PENDING = 'pending'                   # placeholder summary and category
+PENDING_SUMMARY = 'pending_summary'   # category came from the scraper, summary is a placeholder
+DONE = 'done'
+FAILED = 'failed'
+
+
+def placeholder_summary(content: Optional[str]) -> str:
+    """The truncated-content summary shown until enrichment replaces it"""
+    if not content:
+        return 'No summary available.'
+    return (content[:497] + '...') if len(content) > 500 else content
+
+
+class EnrichmentPool:
+    """
+    Drains a queue of published-but-unenriched article IDs with worker threads.
+
+    Rows are persisted first with placeholder summary/category and an
+    enrichment_state of pending; workers pick IDs off the in-process queue in
+    batches, run the same batched summarizer/classifier as inline ingestion
+    and bulk-update the rows. The state column is the durable record, so rows
+    left pending by a restart are picked up again by enqueue_stale().
+    """
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None, workers: int = 1, batch_size: int = 32):
+        self.settings = settings or {}
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self._queue: "queue.Queue[List[int]]" = queue.Queue()
+        self._threads: List[threading.Thread] = []
+        self._lock = threading.Lock()
+        # IDs waiting in or being processed from the queue, so re-queues don't double up
+        self._queued: Set[int] = set()
+
+    def submit(self, article_ids: Iterable[int]):
+        """Queue articles for enrichment and make sure the workers are running"""
+        with self._lock:
+            ids = [i for i in dict.fromkeys(article_ids) if i not in self._queued]
+            self._queued.update(ids)
+        for start in range(0, len(ids), self.batch_size):
+            self._queue.put(ids[start:start + self.batch_size])
+        if ids:
+            self._ensure_workers()
+            logger.info(f"Queued {len(ids)} articles for background enrichment")
+
+    def join(self):
+        """Block until every queued batch has been processed"""
+        self._queue.join()
+
+    def _ensure_workers(self):
+        with self._lock:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            for n in range(len(self._threads), self.workers):
+                thread = threading.Thread(target=self._run, name=f"enrichment-{n}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+
+    def _run(self):
+        while True:
+            ids = self._queue.get()
+            try:
+                self.enrich(ids)
+            except Exception as e:
+                logger.error(f"Enrichment worker error: {e}")
+            finally:
+                close_old_connections()
+                with self._lock:
+                    self._queued.difference_update(ids)
+                self._queue.task_done()
+
+    def enrich(self, article_ids: List[int]) -> int:
+        """Summarize/classify the given pending rows and mark them done; returns rows updated"""
+        from .processor import DataProcessor
+
+        rows = list(
+            DBArticle.objects.defer(None).filter(id__in=article_ids, enrichment_state__in=[PENDING, PENDING_SUMMARY])
+            .select_related('publisher')
+            .only('id', 'title', 'content', 'category', 'summary', 'url', 'enrichment_state', 'publisher__name')
+        )
+        if not rows:
+            return 0
+
+        # The publisher name is the cascade's source prior, as it is during inline ingestion
+        core_articles = [
+            Article(
+                title=row.title,
+                content=row.content or '',
+                url=row.url,
+                source=row.publisher.name,
+                category=row.category if row.enrichment_state == PENDING_SUMMARY else None,
+            )
+            for row in rows
+        ]
+        processor = DataProcessor(ClientConfig(name="Enrichment"), settings=self.settings)
+        processor._apply_governor()
+        try:
+            processor._categorize_articles(core_articles)
+            processor._summarize_articles(core_articles)
+        except Exception as e:
+            logger.error(f"Enrichment of {len(rows)} articles failed: {e}")
+            with serialized_writes():
+                DBArticle.objects.filter(id__in=[r.id for r in rows]).update(enrichment_state=FAILED)
+            return 0
+
+        for row, core in zip(rows, core_articles):
+            row.category = core.category
+            if core.content and core.content != (row.content or ''):
+                row.summary = core.content
+            row.enrichment_state = DONE
+        with serialized_writes():
+            DBArticle.objects.bulk_update(rows, ['category', 'summary', 'enrichment_state'])
+        logger.info(f"Enriched {len(rows)} published articles")
+        return len(rows)
+
+    def enqueue_stale(self, older_than: timedelta = timedelta(minutes=10)) -> int:
+        """Re-queue rows still pending after `older_than` (e.g. the process restarted mid-queue)"""
+        cutoff = timezone.now() - older_than
+        ids = list(
+            DBArticle.objects.filter(enrichment_state__in=[PENDING, PENDING_SUMMARY], created_at__lt=cutoff)
+            .values_list('id', flat=True)
+        )
+        self.submit(ids)
+        return len(ids)
+
+
+_pool: Optional[EnrichmentPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_enrichment_pool(settings: Optional[Dict[str, Any]] = None) -> EnrichmentPool:
+    """The process-wide enrichment pool, sized from ml.enrichment in settings"""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            enrichment_config = (settings or {}).get('ml', {}).get('enrichment', {})
+            _pool = EnrichmentPool(
+                settings,
+                workers=enrichment_config.get('workers', 1),
+                batch_size=enrichment_config.get('batch_size', 32),
+            )
+        return _pool
+
+
+def wait_for_enrichment():
+    """Block until queued enrichment finishes (for one-shot commands that exit afterwards)"""
+    if _pool is not None:
+        _pool.join()
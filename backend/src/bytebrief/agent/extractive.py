@@ -0,0 +1,132 @@
+"""
+Extractive summarization with NumPy: pick the most central sentences of an article
+"""
+import re
+from typing import Dict, List
+import numpy as np
+
+SUMMARIZER_METHODS = ('textrank', 'tfidf')
+
+# Sentence ends at . ! ? (optionally followed by a closing quote/bracket) before whitespace and a capital/digit/quote
+_SENTENCE_END = re.compile(r'(?<=[.!?])["\')\]]?\s+(?=["\'(\[]?[A-Z0-9])')
+_WORD = re.compile(r"[a-z0-9]+(?:'[a-z]+)?")
+# Common abbreviations that end in a period but do not end a sentence
+_ABBREVIATIONS = {'mr', 'mrs', 'ms', 'dr', 'prof', 'sr', 'jr', 'st', 'vs', 'inc', 'ltd', 'co', 'corp', 'gov', 'sen', 'rep', 'gen', 'u.s', 'u.k', 'e.g', 'i.e'}
+
+STOPWORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being below between
+both but by can could did do does doing down during each few for from further had has have having he her here
+hers him his how i if in into is it its itself just me more most my no nor not now of off on once only or other
+our out over own said same says she should so some such than that the their them then there these they this those
+through to too under until up very was we were what when where which while who whom why will with would you your
+""".split())
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences, keeping common abbreviations (Mr., U.S.) attached"""
+    sentences: List[str] = []
+    for part in _SENTENCE_END.split(' '.join(text.split())):
+        if sentences:
+            last_word = sentences[-1].rsplit(' ', 1)[-1].rstrip('.').lower()
+            if last_word in _ABBREVIATIONS or (len(last_word) == 1 and last_word.isalpha()):
+                sentences[-1] = f"{sentences[-1]} {part}"
+                continue
+        sentences.append(part)
+    return [s.strip() for s in sentences if s.strip()]
+
+
+def _tfidf_matrix(sentences: List[str]) -> np.ndarray:
+    """Row-normalized TF-IDF vectors of the sentences, with IDF computed within the article"""
+    tokenized = [[w for w in _WORD.findall(s.lower()) if w not in STOPWORDS] for s in sentences]
+    vocab: Dict[str, int] = {}
+    for words in tokenized:
+        for w in words:
+            vocab.setdefault(w, len(vocab))
+
+    tf = np.zeros((len(sentences), max(1, len(vocab))), dtype=np.float32)
+    for row, words in enumerate(tokenized):
+        for w in words:
+            tf[row, vocab[w]] += 1.0
+
+    df = np.count_nonzero(tf, axis=0)
+    idf = np.log((1.0 + len(sentences)) / (1.0 + df)) + 1.0
+    weights = np.log1p(tf) * idf
+    norms = np.linalg.norm(weights, axis=1, keepdims=True)
+    return weights / np.where(norms == 0, 1.0, norms)
+
+
+def _textrank_scores(vectors: np.ndarray, damping: float = 0.85, iterations: int = 30) -> np.ndarray:
+    """PageRank over the sentence cosine-similarity graph"""
+    similarity = vectors @ vectors.T
+    np.fill_diagonal(similarity, 0.0)
+    out_weight = similarity.sum(axis=1, keepdims=True)
+    transition = np.divide(similarity, out_weight, out=np.zeros_like(similarity), where=out_weight > 0)
+
+    n = len(vectors)
+    scores = np.full(n, 1.0 / n, dtype=np.float32)
+    for _ in range(iterations):
+        updated = (1 - damping) / n + damping * (transition.T @ scores)
+        if np.abs(updated - scores).sum() < 1e-5:
+            return updated
+        scores = updated
+    return scores
+
+
+def _tfidf_scores(vectors: np.ndarray) -> np.ndarray:
+    """Similarity of each sentence to the article's TF-IDF centroid"""
+    centroid = vectors.mean(axis=0)
+    return vectors @ centroid
+
+
+class ExtractiveSummarizer:
+    """
+    Summarizes by selecting whole sentences, so it needs no model and runs in
+    well under a millisecond per article.
+
+    Sentences are scored by TextRank (default) or by closeness to the TF-IDF
+    centroid, nudged towards the lead as news articles front-load the story,
+    then the best ones are kept in their original order until `max_chars`
+    would be exceeded. Called like Seq2SeqSummarizer: a string or a list of
+    strings in, a list of {'summary_text': ...} dicts out; generation
+    parameters meant for the abstractive model are accepted and ignored.
+    """
+
+    def __init__(self, method: str = 'textrank', max_chars: int = 500, max_sentences: int = 3,
+                 lead_bias: float = 0.15):
+        if method not in SUMMARIZER_METHODS:
+            raise ValueError(f"Unknown extractive method '{method}'. Available: {', '.join(SUMMARIZER_METHODS)}")
+        self.method = method
+        self.max_chars = max_chars
+        self.max_sentences = max_sentences
+        self.lead_bias = lead_bias
+
+    def summarize(self, text: str) -> str:
+        sentences = split_sentences(text or '')
+        if len(sentences) <= 1:
+            return (sentences[0] if sentences else '')[:self.max_chars]
+
+        vectors = _tfidf_matrix(sentences)
+        scores = _textrank_scores(vectors) if self.method == 'textrank' else _tfidf_scores(vectors)
+        scores = scores / (scores.max() or 1.0)
+        scores = scores + self.lead_bias / (1.0 + np.arange(len(sentences)))
+
+        chosen, used = [], 0
+        for index in np.argsort(-scores, kind='stable'):
+            length = len(sentences[index]) + (1 if chosen else 0)
+            if used + length > self.max_chars:
+                continue
+            chosen.append(int(index))
+            used += length
+            if len(chosen) >= self.max_sentences:
+                break
+
+        if not chosen:
+            # Even the best sentence is over budget: cut it at a word boundary
+            best = sentences[int(np.argmax(scores))]
+            return best[:self.max_chars - 3].rsplit(' ', 1)[0] + '...'
+        return ' '.join(sentences[i] for i in sorted(chosen))
+
+    def __call__(self, texts, **generation_params) -> List[Dict[str, str]]:
+        if isinstance(texts, str):
+            texts = [texts]
+        return [{'summary_text': self.summarize(text)} for text in texts]
@@ -0,0 +1,197 @@
+"""
+Adaptive resource governor: picks the ML quality tier from memory, backlog and run time
+"""
+import copy
+import os
+import threading
+import time
+from typing import Any, Dict, Optional
+from loguru import logger
+from ..utils.memory import process_memory
+
+# Quality tiers, best first
+#   full      configured models (transformer summaries and classifier)
+#   reduced   extractive summaries, configured classifier
+#   keywords  extractive summaries, cascade priors + keyword categories, no model at all
+TIERS = ('full', 'reduced', 'keywords')
+
+# Batch-size settings scaled down under memory pressure
+BATCH_SETTINGS = ('summarizer_batch_size', 'classifier_batch_size', 'embedding_batch_size')
+
+
+def memory_limit_bytes() -> int:
+    """Memory available to this process: BYTEBRIEF_MEMORY_LIMIT_MB, the cgroup limit, or physical RAM"""
+    configured = os.environ.get('BYTEBRIEF_MEMORY_LIMIT_MB')
+    if configured:
+        return int(float(configured) * 2**20)
+    for path in ('/sys/fs/cgroup/memory.max', '/sys/fs/cgroup/memory/memory.limit_in_bytes'):
+        try:
+            with open(path) as f:
+                value = f.read().strip()
+            # "max" (v2) or a huge sentinel (v1) mean unlimited
+            if value.isdigit() and int(value) < 1 << 60:
+                return int(value)
+        except OSError:
+            continue
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES')
+    except (ValueError, OSError, AttributeError):
+        return 0
+
+
+class ResourceGovernor:
+    """
+    Downgrades the pipeline one quality tier at a time instead of letting it
+    OOM or run into the next scheduled run, and upgrades again once pressure
+    is gone. Three signals are checked at every step boundary:
+
+      memory   process RSS as a share of the container/machine limit
+      backlog  articles still waiting for background enrichment
+      time     elapsed share of the run budget, while a pipeline run is active
+               (between start_run() and end_run(); enrichment batches outside
+               a run aren't penalised for the time since the last one)
+
+    The worst signal decides the tier. Memory pressure also scales batch sizes
+    down (halved past the soft limit, quartered past the hard limit), and past
+    the hard limit already-loaded models are released. After a release the
+    tier stays at keywords, which loads no model, until memory falls below
+    memory_reacquire, so models aren't reloaded straight back into the limit.
+    """
+
+    def __init__(self, settings: Optional[Dict[str, Any]] = None):
+        config = (settings or {}).get('governor', {}) or {}
+        self.enabled = config.get('enabled', False)
+        limit_mb = config.get('memory_limit_mb')
+        self.memory_limit = int(limit_mb * 2**20) if limit_mb else memory_limit_bytes()
+        self.memory_soft = config.get('memory_soft', 0.70)
+        self.memory_hard = config.get('memory_hard', 0.85)
+        self.memory_reacquire = min(config.get('memory_reacquire', 0.60), self.memory_hard)
+        self.backlog_reduced = config.get('backlog_reduced', 300)
+        self.backlog_keywords = config.get('backlog_keywords', 1500)
+        self.run_budget = config.get('run_budget_minutes', 120) * 60
+        self._run_started: Optional[float] = None
+        self._active_runs = 0
+        self._models_released = False
+        self._tier = 'full'
+        self._lock = threading.Lock()
+
+    def start_run(self):
+        """Start the run clock at the start of a pipeline run (overlapping runs share the first one's)"""
+        with self._lock:
+            if self._active_runs == 0:
+                self._run_started = time.monotonic()
+            self._active_runs += 1
+
+    def end_run(self):
+        """Stop the run clock once no pipeline run is active"""
+        with self._lock:
+            self._active_runs = max(0, self._active_runs - 1)
+            if self._active_runs == 0:
+                self._run_started = None
+
+    def elapsed(self) -> float:
+        """Share of the run budget used by the active run; 0 between runs"""
+        started = self._run_started
+        if started is None or not self.run_budget:
+            return 0.0
+        return (time.monotonic() - started) / self.run_budget
+
+    @staticmethod
+    def enrichment_backlog() -> int:
+        from news_brief.models import Article as DBArticle
+        from .enrichment import PENDING, PENDING_SUMMARY
+        return DBArticle.objects.filter(enrichment_state__in=[PENDING, PENDING_SUMMARY]).count()
+
+    def readings(self) -> Dict[str, float]:
+        """Current memory share, enrichment backlog and run-time share"""
+        try:
+            backlog = self.enrichment_backlog()
+        except Exception as e:
+            logger.warning(f"Governor could not read the enrichment backlog: {e}")
+            backlog = 0
+        rss = process_memory()['rss']
+        return {
+            'memory': rss / self.memory_limit if self.memory_limit else 0.0,
+            'backlog': backlog,
+            'elapsed': self.elapsed(),
+        }
+
+    def decide(self, readings: Dict[str, float], models_released: bool = False) -> Dict[str, Any]:
+        """Tier and batch scale for the given readings, and whether models are (still) released"""
+        release = readings['memory'] >= self.memory_hard
+        # Hysteresis: released models stay released until memory is below memory_reacquire
+        hold = models_released and readings['memory'] >= self.memory_reacquire
+        level = 2 if hold else 0
+        if readings['memory'] >= self.memory_hard:
+            level = 2
+        elif readings['memory'] >= self.memory_soft:
+            level = max(level, 1)
+        if readings['backlog'] >= self.backlog_keywords:
+            level = max(level, 2)
+        elif readings['backlog'] >= self.backlog_reduced:
+            level = max(level, 1)
+        if readings['elapsed'] >= 0.8:
+            level = max(level, 2)
+        elif readings['elapsed'] >= 0.5:
+            level = max(level, 1)
+
+        batch_scale = 1.0
+        if readings['memory'] >= self.memory_hard:
+            batch_scale = 0.25
+        elif readings['memory'] >= self.memory_soft:
+            batch_scale = 0.5
+        return {
+            'tier': TIERS[level],
+            'batch_scale': batch_scale,
+            'release_models': release,
+            'models_released': release or hold,
+        }
+
+    def apply(self, settings: Dict[str, Any]) -> Dict[str, Any]:
+        """Settings adjusted to the current tier; the input is returned unchanged when disabled"""
+        if not self.enabled:
+            return settings
+
+        readings = self.readings()
+        with self._lock:
+            decision = self.decide(readings, self._models_released)
+            self._models_released = decision['models_released']
+            if decision['tier'] != self._tier:
+                logger.warning(
+                    f"Governor: quality tier {self._tier} -> {decision['tier']} "
+                    f"(memory {readings['memory']:.0%} of limit, backlog {readings['backlog']:.0f}, "
+                    f"run time {readings['elapsed']:.0%} of budget)"
+                )
+                self._tier = decision['tier']
+
+        if decision['release_models']:
+            from .processor import release_models
+            release_models()
+
+        governed = copy.deepcopy(settings)
+        ml = governed.setdefault('ml', {})
+        ml['tier'] = decision['tier']
+        if decision['tier'] == 'keywords':
+            ml['classifier_backend'] = 'keywords'
+        if decision['batch_scale'] < 1:
+            for key in BATCH_SETTINGS:
+                if key in ml:
+                    ml[key] = max(1, int(ml[key] * decision['batch_scale']))
+        return governed
+
+    @property
+    def tier(self) -> str:
+        return self._tier
+
+
+_governor: Optional[ResourceGovernor] = None
+_governor_lock = threading.Lock()
+
+
+def get_governor(settings: Optional[Dict[str, Any]] = None) -> ResourceGovernor:
+    """The process-wide governor (configured from the first settings it sees)"""
+    global _governor
+    with _governor_lock:
+        if _governor is None:
+            _governor = ResourceGovernor(settings)
+        return _governor
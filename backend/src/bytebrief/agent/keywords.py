@@ -0,0 +1,190 @@
+"""
+Compiled keyword matching for category fallback and client keyword filters
+"""
+import re
+import unicodedata
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+
+# Keyword fallback for categorization (used when the ML classifier is disabled or unsure)
+CATEGORY_KEYWORDS: Dict[str, List[str]] = {
+    'Tech': ['apple', 'google', 'microsoft', 'software', 'hardware', 'app', 'update', 'smartphone'],
+    'Business': ['market', 'stock', 'shares', 'company', 'profit', 'revenue', 'ceo', 'economy'],
+    'Global': ['world', 'international', 'diplomacy', 'nations', 'treaty'],
+    'Health': ['covid', 'disease', 'doctor', 'hospital', 'treatment', 'virus', 'study', 'health'],
+    'Sports': ['football', 'basketball', 'soccer', 'sports', 'game', 'tournament', 'player'],
+    'Politics': ['election', 'president', 'government', 'senate', 'parliament', 'law', 'policy'],
+    'Finance': ['bank', 'inflation', 'currency', 'investor', 'financial', 'bond', 'crypto'],
+    'Travel': ['flight', 'airlines', 'hotel', 'tourism', 'destination', 'vacation'],
+    'Gaming': ['nintendo', 'playstation', 'xbox', 'game', 'steam', 'esports', 'twitch'],
+    'Startups & Innovation': ['startup', 'founder', 'funding', 'seed round', 'venture capital'],
+    'AI & Future Tech': ['ai', 'artificial intelligence', 'openai', 'chatgpt', 'neural network', 'robotics'],
+    'Climate & Environment': ['climate change', 'warming', 'pollution', 'emissions', 'green', 'renewable'],
+    'Cybersecurity': ['hacker', 'breach', 'ransomware', 'cyber', 'security', 'vulnerability', 'password'],
+    'Space & Research': ['nasa', 'space', 'orbit', 'astronaut', 'mission', 'mars', 'satellite', 'spacex'],
+    'Entertainment': ['movie', 'album', 'celebrity', 'hollywood', 'netflix', 'actor', 'cinema'],
+    'Science': ['researcher', 'discovery', 'species', 'fossil', 'science', 'scientist'],
+}
+
+
+def _combining_marks() -> str:
+    """Regex class ranges for Unicode combining marks (category M*), e.g. Devanagari vowel signs"""
+    ranges, start = [], None
+    for code in range(0x300, 0x20000):
+        is_mark = unicodedata.category(chr(code)).startswith('M')
+        if is_mark and start is None:
+            start = code
+        elif not is_mark and start is not None:
+            ranges.append(f"\\U{start:08x}-\\U{code - 1:08x}")
+            start = None
+    return ''.join(ranges) + "\\U000e0100-\\U000e01ef"
+
+
+# Words in any script: \w alone splits e.g. 'मोदी' at its vowel signs
+_WORD = re.compile(f"[\\w{_combining_marks()}]+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Casefolded words of `text`, in any script"""
+    return _WORD.findall(text.casefold())
+
+
+def _normalize_keyword(keyword: str) -> str:
+    """Space-joined tokens; a trailing '*' is kept to mark a prefix keyword"""
+    normalized = ' '.join(tokenize(keyword))
+    return normalized + '*' if normalized and keyword.strip().endswith('*') else normalized
+
+
+class KeywordMatcher:
+    """
+    Matches many keywords, each belonging to one or more named groups, in a
+    single pass over the text.
+
+    The text is casefolded and tokenized once (words in any script); single-word
+    keywords are then hash lookups per distinct word and the few multi-word
+    keywords are checked against the space-joined tokens. Keywords only match
+    whole words, optionally followed by a plural "s"/"es", so "ai" no longer
+    fires inside "said" or "campaign" while "player" still matches "players".
+    A keyword ending in '*' matches as a prefix instead ("crypto*" matches
+    "cryptocurrency"), like search queries. Tokenizing drops punctuation, so
+    "neural-network" matches the keyword "neural network".
+    """
+
+    def __init__(self, groups: Dict[str, Iterable[str]], plurals: bool = True):
+        self.groups = list(groups)
+        self.plurals = plurals
+        self._keyword_groups: Dict[str, List[str]] = {}
+        for group, keywords in groups.items():
+            for keyword in keywords:
+                normalized = _normalize_keyword(keyword)
+                if normalized:
+                    self._keyword_groups.setdefault(normalized, []).append(group)
+        # Multi-word keywords, indexed by their first word so most are never checked
+        self._phrases: Dict[str, List[str]] = {}
+        # Single-word prefix keywords ("crypto*" stored as "crypto") by length, for slice lookups
+        self._prefixes: Dict[int, Dict[str, str]] = {}
+        for keyword in self._keyword_groups:
+            if ' ' in keyword:
+                self._phrases.setdefault(keyword.split(' ', 1)[0], []).append(keyword)
+            elif keyword.endswith('*'):
+                self._prefixes.setdefault(len(keyword) - 1, {})[keyword[:-1]] = keyword
+
+    def _found_keywords(self, text: str) -> Set[str]:
+        tokens = tokenize(text)
+        words = set(tokens)
+        keyword_groups = self._keyword_groups
+        found = set()
+        for word in words:
+            if word in keyword_groups:
+                found.add(word)
+            elif self.plurals and word.endswith('s'):
+                if word[:-1] in keyword_groups:
+                    found.add(word[:-1])
+                elif word.endswith('es') and word[:-2] in keyword_groups:
+                    found.add(word[:-2])
+            for length, prefixes in self._prefixes.items():
+                if word[:length] in prefixes:
+                    found.add(prefixes[word[:length]])
+
+        candidates = [phrase for word in words & self._phrases.keys() for phrase in self._phrases[word]]
+        if candidates:
+            joined = f" {' '.join(tokens)} "
+            for phrase in candidates:
+                if phrase.endswith('*'):
+                    if f" {phrase[:-1]}" in joined:
+                        found.add(phrase)
+                elif f" {phrase} " in joined or (self.plurals and (f" {phrase}s " in joined or f" {phrase}es " in joined)):
+                    found.add(phrase)
+        return found
+
+    def matches(self, text: str) -> Dict[str, Set[str]]:
+        """{group: distinct keywords found} for every group with at least one hit"""
+        found: Dict[str, Set[str]] = {}
+        if not text or not self._keyword_groups:
+            return found
+        for keyword in self._found_keywords(text):
+            for group in self._keyword_groups[keyword]:
+                found.setdefault(group, set()).add(keyword)
+        return found
+
+    def counts(self, text: str) -> Dict[str, int]:
+        """Number of distinct keywords of each group present in the text"""
+        return {group: len(keywords) for group, keywords in self.matches(text).items()}
+
+    def best_group(self, text: str, default: Optional[str] = None) -> Optional[str]:
+        """Group with the most distinct keyword hits; ties go to the group declared first"""
+        counts = self.counts(text)
+        if not counts:
+            return default
+        return max(self.groups, key=lambda group: counts.get(group, 0))
+
+
+class KeywordFilter:
+    """
+    A client's include and exclude keyword lists compiled into one matcher.
+
+    Each article is scanned once, however many keywords the client has; an
+    article passes when it hits no excluded keyword and, if include keywords
+    are given, at least one of them. With whole_words, matching is like the
+    category fallback (plurals allowed, case-insensitive, any script) and a
+    keyword ending in '*' matches word prefixes ("crypto*" for
+    "cryptocurrency"). Otherwise a keyword matches anywhere in the text, as
+    the per-keyword substring check this replaced did, which is what keyword
+    lists saved before whole-word matching were written for.
+    """
+
+    def __init__(self, keywords: Sequence[str] = (), excluded_keywords: Sequence[str] = (),
+                 whole_words: bool = True):
+        keywords, excluded_keywords = list(keywords or ()), list(excluded_keywords or ())
+        self.whole_words = whole_words
+        if whole_words:
+            self.matcher = KeywordMatcher({'include': keywords, 'exclude': excluded_keywords})
+            self.requires_include = any(_normalize_keyword(k) for k in keywords)
+        else:
+            self._include = self._substring_pattern(keywords)
+            self._exclude = self._substring_pattern(excluded_keywords)
+            self.requires_include = bool(keywords)
+
+    @staticmethod
+    def _substring_pattern(keywords: List[str]) -> Optional[re.Pattern]:
+        # One alternation per list; a trailing '*' is meaningless here, every keyword matches inside words
+        needles = {keyword.casefold().rstrip('*') for keyword in keywords}
+        if '' in needles:
+            # An empty keyword is in every text, as it was for the substring check
+            return re.compile('')
+        return re.compile('|'.join(map(re.escape, sorted(needles, key=len, reverse=True)))) if needles else None
+
+    def allows(self, *texts: Optional[str]) -> bool:
+        text = '\n'.join(t for t in texts if t)
+        if self.whole_words:
+            groups = self.matcher.matches(text)
+            if 'exclude' in groups:
+                return False
+            return 'include' in groups or not self.requires_include
+        text = text.casefold()
+        if self._exclude and self._exclude.search(text):
+            return False
+        return not self.requires_include or bool(self._include and self._include.search(text))
+
+
+# Compiled once per process; the fallback runs for every article the classifier skips
+CATEGORY_MATCHER = KeywordMatcher(CATEGORY_KEYWORDS)
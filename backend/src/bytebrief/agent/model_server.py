@@ -0,0 +1,220 @@
+"""
+Local model-serving process for the summarizer and zero-shot classifier.
+
+Loading the distilbart models into every gunicorn worker, the scheduler thread
+and each force-scrape thread multiplies their RAM by the number of processes.
+Instead, one `python manage.py serve_models` process loads each model once and
+answers batched summarize/classify requests over a local socket; the clients
+below stand in for the in-process models inside DataProcessor.
+
+Requests are pickled, so anyone who can connect and authenticate can run code
+in the server: it only binds to a loopback address or a unix socket, and both
+sides need the shared BYTEBRIEF_MODEL_SERVER_AUTHKEY (there is no default).
+"""
+import ipaddress
+import os
+import socket
+import threading
+from multiprocessing.connection import Client, Listener
+from typing import Any, Dict, List, Optional, Tuple, Union
+from loguru import logger
+
+DEFAULT_ADDRESS = "127.0.0.1:8765"
+AUTHKEY_ENV = 'BYTEBRIEF_MODEL_SERVER_AUTHKEY'
+
+
+def model_server_address() -> Optional[str]:
+    """The configured server address ("host:port" or a unix socket path), if any"""
+    return os.environ.get('BYTEBRIEF_MODEL_SERVER') or None
+
+
+def parse_address(address: str) -> Union[str, Tuple[str, int]]:
+    if '/' in address:
+        return address
+    host, _, port = address.rpartition(':')
+    return host or '127.0.0.1', int(port)
+
+
+def is_local_address(address: Union[str, Tuple[str, int]]) -> bool:
+    """A unix socket path, or a host that resolves to a loopback address"""
+    if isinstance(address, str):
+        return True
+    try:
+        return all(
+            ipaddress.ip_address(info[4][0]).is_loopback
+            for info in socket.getaddrinfo(address[0], address[1], type=socket.SOCK_STREAM)
+        )
+    except (OSError, ValueError):
+        return False
+
+
+class ModelServerUnavailable(Exception):
+    """The model server could not be reached or did not answer in time"""
+
+
+class ModelServerConfigError(Exception):
+    """The model server is not configured safely enough to start"""
+
+
+def _authkey() -> bytes:
+    key = os.environ.get(AUTHKEY_ENV)
+    if not key:
+        raise ModelServerConfigError(f"{AUTHKEY_ENV} is not set")
+    return key.encode('utf-8')
+
+
+class ModelServer:
+    """
+    Serves one summarizer and one batched classifier to many local clients.
+    Requests are handled one at a time since the models share the CPU anyway;
+    each request already carries a whole batch of texts. Refuses to start
+    (ModelServerConfigError) without an authkey or on a non-loopback address.
+    """
+
+    def __init__(self, address: str, summarizer=None, classifier=None):
+        parsed = parse_address(address)
+        if not is_local_address(parsed):
+            raise ModelServerConfigError(f"Model server must bind to localhost or a unix socket, not {address}")
+        self.summarizer = summarizer
+        self.classifier = classifier
+        self.listener = Listener(parsed, authkey=_authkey())
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+
+    @property
+    def address(self):
+        return self.listener.address
+
+    def handle(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        op = request.get('op')
+        if op == 'ping':
+            return {'ok': True, 'summarizer': self.summarizer is not None, 'classifier': self.classifier is not None}
+
+        with self._lock:
+            if op == 'summarize' and self.summarizer is not None:
+                return {'ok': True, 'results': self.summarizer(request['texts'], **request.get('params', {}))}
+            if op == 'classify' and self.classifier is not None:
+                return {'ok': True, 'results': self.classifier.classify(request['texts'], batch_size=request.get('batch_size', 4))}
+        return {'ok': False, 'error': f"Unsupported or unavailable operation '{op}'"}
+
+    def _serve_connection(self, conn):
+        with conn:
+            while True:
+                try:
+                    request = conn.recv()
+                except (EOFError, OSError):
+                    return
+                try:
+                    response = self.handle(request)
+                except Exception as e:
+                    logger.error(f"Model server request failed: {e}")
+                    response = {'ok': False, 'error': str(e)}
+                conn.send(response)
+
+    def serve_forever(self):
+        logger.info(f"Model server listening on {self.address}")
+        while not self._stopping.is_set():
+            try:
+                conn = self.listener.accept()
+            except Exception as e:
+                if self._stopping.is_set():
+                    return
+                if isinstance(e, OSError) and not isinstance(e, ConnectionError):
+                    # Listener closed
+                    return
+                # Typically a client that failed authentication
+                logger.warning(f"Rejected model server connection: {e}")
+                continue
+            if self._stopping.is_set():
+                conn.close()
+                return
+            threading.Thread(target=self._serve_connection, args=(conn,), daemon=True).start()
+
+    def close(self):
+        """Stop accepting connections; requests already being served finish"""
+        if self._stopping.is_set():
+            return
+        self._stopping.set()
+        # Closing the listener doesn't wake a thread blocked in accept(), so connect once to
+        # hand it a connection; it sees the stop flag and returns instead of serving
+        address = self.address
+        family = socket.AF_UNIX if isinstance(address, str) else socket.AF_INET6 if ':' in address[0] else socket.AF_INET
+        try:
+            with socket.socket(family, socket.SOCK_STREAM) as waker:
+                waker.settimeout(1.0)
+                waker.connect(address)
+        except OSError:
+            pass
+        self.listener.close()
+
+
+class ModelClient:
+    """Sends one request per connection and waits at most `timeout` seconds for the answer"""
+
+    def __init__(self, address: str, timeout: float = 120.0):
+        self.address = parse_address(address)
+        self.timeout = timeout
+
+    def request(self, payload: Dict[str, Any], timeout: Optional[float] = None) -> Dict[str, Any]:
+        try:
+            conn = Client(self.address, authkey=_authkey())
+        except Exception as e:
+            raise ModelServerUnavailable(f"Cannot connect to model server at {self.address}: {e}") from e
+        with conn:
+            try:
+                conn.send(payload)
+                if not conn.poll(self.timeout if timeout is None else timeout):
+                    raise ModelServerUnavailable(f"Model server did not answer '{payload.get('op')}' in time")
+                response = conn.recv()
+            except (EOFError, OSError) as e:
+                raise ModelServerUnavailable(f"Model server connection dropped: {e}") from e
+        if not response.get('ok'):
+            raise ModelServerUnavailable(response.get('error', 'model server error'))
+        return response
+
+    def ping(self, timeout: float = 2.0) -> Optional[Dict[str, Any]]:
+        """Server capabilities, or None if it is not reachable"""
+        try:
+            return self.request({'op': 'ping'}, timeout=timeout)
+        except ModelServerUnavailable as e:
+            logger.warning(f"{e}")
+            return None
+
+
+class RemoteSummarizer:
+    """Summarizer proxy with the same call signature as Seq2SeqSummarizer"""
+
+    def __init__(self, client: ModelClient):
+        self.client = client
+
+    def __call__(self, texts, **params) -> List[Dict[str, str]]:
+        if isinstance(texts, str):
+            texts = [texts]
+        return self.client.request({'op': 'summarize', 'texts': list(texts), 'params': params})['results']
+
+
+class RemoteZeroShotClassifier:
+    """Classifier proxy with the same classify() contract as BatchedZeroShotClassifier"""
+
+    def __init__(self, client: ModelClient):
+        self.client = client
+
+    def classify(self, texts: List[str], batch_size: int = 4) -> List[Optional[Dict[str, Any]]]:
+        try:
+            return self.client.request({'op': 'classify', 'texts': list(texts), 'batch_size': batch_size})['results']
+        except ModelServerUnavailable as e:
+            logger.warning(f"Remote classification failed, falling back to keywords: {e}")
+            return [None] * len(texts)
+
+
+def get_remote_models(address: str) -> Tuple[Optional[RemoteSummarizer], Optional[RemoteZeroShotClassifier]]:
+    """Proxies for whichever models the server at `address` has loaded; (None, None) if it is down"""
+    timeout = float(os.environ.get('BYTEBRIEF_MODEL_SERVER_TIMEOUT', 120))
+    client = ModelClient(address, timeout=timeout)
+    capabilities = client.ping()
+    if not capabilities:
+        return None, None
+    return (
+        RemoteSummarizer(client) if capabilities.get('summarizer') else None,
+        RemoteZeroShotClassifier(client) if capabilities.get('classifier') else None,
+    )
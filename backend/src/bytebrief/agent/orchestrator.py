@@ -7,6 +7,7 @@ from ..scrapers.factory import ScraperFactory
 from ..scrapers.google_search import GoogleSearchScraper
 from .processor import DataProcessor
 from .comparer import NewsComparer
+from .governor import get_governor
 from loguru import logger
 import yaml
 from pathlib import Path
@@ -18,7 +19,7 @@ class AgentOrchestrator:
         self.config_dir = Path(config_dir)
         self.settings = self._load_settings()
         self.sources_config = self._load_sources()
-        self.comparer = NewsComparer()
+        self.comparer = NewsComparer.from_settings(self.settings)
         
     def _load_settings(self) -> Dict[str, Any]:
         """Load general settings"""
@@ -39,7 +40,15 @@ class AgentOrchestrator:
     def run(self, client_config: ClientConfig) -> Any:
         """Run the agent for a specific client"""
         logger.info(f"Starting agent run for client: {client_config.name}")
-        
+        governor = get_governor(self.settings)
+        # The governor's run-time budget only counts while a run is active
+        governor.start_run()
+        try:
+            return self._run(client_config)
+        finally:
+            governor.end_run()
+
+    def _run(self, client_config: ClientConfig) -> Any:
         all_articles = []
         full_config = {**self.settings, **self.sources_config}
 
@@ -89,11 +98,12 @@ class AgentOrchestrator:
 
         # Deduplicate results
         logger.info(f"Collected {len(all_articles)} raw articles. Deduplicating...")
-        unique_articles = self.comparer.deduplicate(all_articles)
+        known_articles = []
+        unique_articles = self.comparer.deduplicate(all_articles, known=known_articles)
         logger.info(f"After deduplication: {len(unique_articles)} articles")
 
-        # Process: auto-categorize + filter + format
-        processor = DataProcessor(client_config)
-        result = processor.process(unique_articles)
+        # Process: auto-categorize + filter + format; stored URLs are only rewritten if they changed
+        processor = DataProcessor(client_config, settings=self.settings)
+        result = processor.process(unique_articles, known=known_articles)
         
         return result
@@ -0,0 +1,65 @@
+"""
+Chunked article upserts: insert new URLs, update changed ones, skip the rest
+"""
+from dataclasses import dataclass
+from typing import List, Sequence
+from loguru import logger
+
+# Fields rewritten when a known URL comes back with different content. published_at,
+# the cluster and the row id are kept, so links, bookmarks and history stay valid.
+UPDATE_FIELDS = ['title', 'content', 'image_url', 'content_hash', 'summary', 'category', 'enrichment_state']
+
+DEFAULT_CHUNK_SIZE = 500
+
+
+@dataclass
+class UpsertResult:
+    inserted: int = 0
+    updated: int = 0
+    unchanged: int = 0
+
+    def __str__(self):
+        return f"{self.inserted} new, {self.updated} updated, {self.unchanged} unchanged"
+
+
+def upsert_articles(rows: Sequence, chunk_size: int = DEFAULT_CHUNK_SIZE) -> UpsertResult:
+    """
+    Write unsaved news_brief Article instances keyed on url.
+
+    Each chunk runs in its own short transaction: read the stored content
+    hashes of the chunk's URLs, then one INSERT ... ON CONFLICT (url) DO UPDATE
+    for the new and changed rows only. On SQLite the write lock is held for one
+    chunk at a time, so API reads interleave with a large ingest instead of
+    waiting for all of it. Counts are exact except under concurrent writers of
+    the same URLs.
+    """
+    from news_brief.models import Article as DBArticle, article_content_hash
+    from news_brief.sqlite import serialized_writes
+
+    # The same URL twice in one statement is an error on PostgreSQL; the first copy wins
+    unique: dict = {}
+    for row in rows:
+        unique.setdefault(row.url, row)
+    rows = list(unique.values())
+
+    result = UpsertResult()
+    chunk_size = max(1, chunk_size)
+    for start in range(0, len(rows), chunk_size):
+        chunk: List = rows[start:start + chunk_size]
+        for row in chunk:
+            row.content_hash = article_content_hash(row.title, row.content, row.image_url)
+        with serialized_writes():
+            stored = dict(
+                DBArticle.objects.filter(url__in=[row.url for row in chunk]).values_list('url', 'content_hash')
+            )
+            inserts = [row for row in chunk if row.url not in stored]
+            updates = [row for row in chunk if row.url in stored and stored[row.url] != row.content_hash]
+            if inserts or updates:
+                DBArticle.objects.bulk_create(
+                    inserts + updates, update_conflicts=True, unique_fields=['url'], update_fields=UPDATE_FIELDS,
+                )
+        result.inserted += len(inserts)
+        result.updated += len(updates)
+        result.unchanged += len(chunk) - len(inserts) - len(updates)
+    logger.info(f"Upserted {len(rows)} articles in chunks of {chunk_size}: {result}")
+    return result
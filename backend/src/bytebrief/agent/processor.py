@@ -1,30 +1,84 @@
 """
 Data processor for filtering, categorizing, and formatting articles based on client config
 """
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from ..core.models import Article, ClientConfig
+from .zero_shot import HYPOTHESIS_TEMPLATE
+from .model_server import get_remote_models, model_server_address
+from .quantization import inference_mode
+from .keywords import CATEGORY_MATCHER, KeywordFilter
+from .persistence import DEFAULT_CHUNK_SIZE, upsert_articles
 import json
 import csv
+import os
 from io import StringIO
+import time
 from pathlib import Path
 from loguru import logger
 
-# Lazy-loaded text summariation pipeline
+# We use a very small, fast distilled model for quick news summarization
+SUMMARIZER_MODEL = "sshleifer/distilbart-cnn-12-6"
+# We use a fast, distilled model for quick news classification
+CLASSIFIER_MODEL = "valhalla/distilbart-mnli-12-3"
+
+# Generation parameters for AI summaries (also part of the inference cache key)
+SUMMARY_GENERATION = {'max_length': 250, 'min_length': 90, 'do_sample': False}
+
+# Summarizers selectable with ml.summarizer / BYTEBRIEF_SUMMARIZER
+SUMMARIZER_BACKENDS = ('abstractive', 'extractive')
+
+
+class Seq2SeqSummarizer:
+    """
+    Batched abstractive summarizer around a seq2seq model.
+    Called like the transformers summarization pipeline: a string or a list of
+    strings in, a list of {'summary_text': ...} dicts out, one per input.
+    """
+
+    def __init__(self, model_name: str = SUMMARIZER_MODEL, max_input_tokens: int = 1024, mode: Optional[str] = None):
+        from transformers import AutoTokenizer
+        from .quantization import load_seq2seq_model
+
+        self.model_name = model_name
+        self.max_input_tokens = max_input_tokens
+        self.mode = mode or inference_mode()
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = load_seq2seq_model(model_name, self.mode)
+
+    def __call__(self, texts, max_length: int = 250, min_length: int = 90, do_sample: bool = False) -> List[Dict[str, str]]:
+        import torch
+
+        if isinstance(texts, str):
+            texts = [texts]
+        # Inputs are padded to the longest text in the batch, so callers should group similar lengths
+        inputs = self.tokenizer(texts, return_tensors="pt", padding=True, truncation=True, max_length=self.max_input_tokens)
+        with torch.inference_mode():
+            output_ids = self.model.generate(**inputs, max_length=max_length, min_length=min_length, do_sample=do_sample)
+        return [{'summary_text': text.strip()} for text in self.tokenizer.batch_decode(output_ids, skip_special_tokens=True)]
+
+
+# Lazy-loaded text summariation model
 _summarizer = None
 
 def get_summarizer():
-    import os
-    if os.environ.get('RENDER'):
-        logger.warning("Bypassing ML Summarizer on Render Free Tier to prevent 512MB RAM limit OOM crash.")
+    """Summarizer for this process: the shared model server when configured, else an in-process model"""
+    address = model_server_address()
+    if address:
+        # If the server is down we skip ML rather than loading a private copy of the model
+        return get_remote_models(address)[0]
+    return load_summarizer()
+
+def load_summarizer():
+    mode = inference_mode()
+    if mode == 'off':
+        logger.warning("ML summarizer disabled (BYTEBRIEF_INFERENCE_MODE=off).")
         return None
         
     global _summarizer
     if _summarizer is None:
         try:
-            from transformers import pipeline
-            logger.info("Loading ML summarization model (this might take a minute on first run)...")
-            # We use a very small, fast distilled model for quick news summarization
-            _summarizer = pipeline("summarization", model="sshleifer/distilbart-cnn-12-6", device=-1)
+            logger.info(f"Loading ML summarization model ({mode}, this might take a minute on first run)...")
+            _summarizer = Seq2SeqSummarizer(SUMMARIZER_MODEL, mode=mode)
             logger.info("ML summarizer loaded successfully.")
         except Exception as e:
             logger.error(f"Failed to load ML summarizer: {e}")
@@ -35,18 +89,23 @@ def get_summarizer():
 _classifier = None
 
 def get_classifier():
-    import os
-    if os.environ.get('RENDER'):
-        logger.warning("Bypassing ML Classifier on Render Free Tier to prevent 512MB RAM limit OOM crash.")
+    mode = inference_mode()
+    if mode == 'off':
+        logger.warning("ML classifier disabled (BYTEBRIEF_INFERENCE_MODE=off).")
         return None
 
     global _classifier
     if _classifier is None:
         try:
-            from transformers import pipeline
-            logger.info("Loading ML Zero-Shot Classifier model for categorization...")
-            # We use a fast, distilled model for quick news classification
-            _classifier = pipeline("zero-shot-classification", model="valhalla/distilbart-mnli-12-3", device=-1)
+            from transformers import AutoTokenizer, pipeline
+            from .quantization import load_sequence_classifier
+            logger.info(f"Loading ML Zero-Shot Classifier model for categorization ({mode})...")
+            _classifier = pipeline(
+                "zero-shot-classification",
+                model=load_sequence_classifier(CLASSIFIER_MODEL, mode),
+                tokenizer=AutoTokenizer.from_pretrained(CLASSIFIER_MODEL),
+                device=-1,
+            )
             logger.info("ML Classifier loaded successfully.")
         except Exception as e:
             logger.error(f"Failed to load ML classifier: {e}")
@@ -65,43 +124,141 @@ AVAILABLE_CATEGORIES = [
 
 # Removed CATEGORY_KEYWORDS dictionary in favor of ML classification
 
+_batched_classifier = None
+_embedding_classifier = None
+
+# Category classifier backends selectable with ml.classifier_backend ('keywords' skips ML entirely)
+CLASSIFIER_BACKENDS = ('nli', 'embedding', 'keywords')
+
+def get_batched_classifier(backend: str = 'nli'):
+    """Batched zero-shot classifier: the shared model server when configured, else in-process"""
+    address = model_server_address()
+    if address:
+        return get_remote_models(address)[1]
+    if backend == 'embedding':
+        return load_embedding_classifier()
+    return load_batched_classifier()
+
+def load_batched_classifier():
+    """Batched zero-shot classifier sharing the model loaded by get_classifier()"""
+    global _batched_classifier
+    if _batched_classifier is None:
+        classifier = get_classifier()
+        if classifier is None:
+            return None
+        from .zero_shot import BatchedZeroShotClassifier
+        _batched_classifier = BatchedZeroShotClassifier(classifier.model, classifier.tokenizer, AVAILABLE_CATEGORIES)
+    return _batched_classifier
+
+def load_embedding_classifier():
+    """Sentence-embedding classifier: one encoder pass per article instead of one NLI pass per label"""
+    mode = inference_mode()
+    if mode == 'off':
+        logger.warning("ML classifier disabled (BYTEBRIEF_INFERENCE_MODE=off).")
+        return None
+
+    global _embedding_classifier
+    if _embedding_classifier is None:
+        try:
+            from transformers import AutoTokenizer
+            from .embedding_classifier import EMBEDDING_MODEL, EmbeddingZeroShotClassifier
+            from .quantization import load_encoder
+            logger.info(f"Loading sentence encoder for embedding categorization ({mode})...")
+            _embedding_classifier = EmbeddingZeroShotClassifier(
+                load_encoder(EMBEDDING_MODEL, mode), AutoTokenizer.from_pretrained(EMBEDDING_MODEL), AVAILABLE_CATEGORIES,
+            )
+            logger.info("Embedding classifier loaded successfully.")
+        except Exception as e:
+            logger.error(f"Failed to load embedding classifier: {e}")
+            _embedding_classifier = "failed"
+
+    return _embedding_classifier if _embedding_classifier != "failed" else None
+
+
+def preload_models(settings: Optional[Dict[str, Any]] = None):
+    """
+    Load this deployment's in-process models up front, e.g. in the gunicorn
+    master before it forks so workers share the weights copy-on-write.
+    Nothing is loaded when a shared model server is configured.
+    """
+    if model_server_address():
+        logger.info("Model server configured; skipping in-process model preload.")
+        return
+    ml = (settings or {}).get('ml', {})
+    if (os.environ.get('BYTEBRIEF_SUMMARIZER') or ml.get('summarizer', 'abstractive')) == 'abstractive':
+        load_summarizer()
+    backend = ml.get('classifier_backend', 'nli')
+    if backend == 'embedding':
+        load_embedding_classifier()
+    elif backend == 'nli':
+        load_batched_classifier()
+
+
+def release_models():
+    """Drop this process's in-process models so their memory can be returned (they reload lazily)"""
+    global _summarizer, _classifier, _batched_classifier, _embedding_classifier
+    if all(m is None for m in (_summarizer, _classifier, _batched_classifier, _embedding_classifier)):
+        return
+    _summarizer = _classifier = _batched_classifier = _embedding_classifier = None
+    import gc
+    gc.collect()
+    logger.warning("Released in-process ML models under memory pressure.")
+
+
+def set_inference_threads(threads: int):
+    """Cap torch intra-op threads so several workers don't oversubscribe the cores"""
+    try:
+        import torch
+    except ImportError:
+        return
+    torch.set_num_threads(max(1, threads))
+    logger.info(f"Torch inference threads set to {torch.get_num_threads()}")
+
 
 class DataProcessor:
     """Process articles according to client configuration"""
     
-    def __init__(self, client_config: ClientConfig):
+    def __init__(self, client_config: ClientConfig, settings: Optional[Dict[str, Any]] = None):
         self.config = client_config
+        self.settings = settings or {}
+        # Settings as configured; self.settings may be a governed (downgraded) copy of them
+        self.base_settings = self.settings
         
-    def process(self, articles: List[Article]) -> Any:
-        """Filter, categorize, save to DB, and format articles"""
+    def process(self, articles: List[Article], known: Optional[List[Article]] = None) -> Any:
+        """
+        Filter, categorize, save to DB, and format articles. `known` are scraped
+        articles whose URL is already stored: rows whose scraped text changed are
+        rewritten with placeholders and queued for enrichment, the rest are skipped.
+        """
         filtered_articles = self._filter_articles(articles)
-        # Auto-categorize any article that doesn't already have a category
-        for article in filtered_articles:
+        known = known or []
+        # The stored content (and its content_hash) is the scraped text, not the ML output
+        scraped_content = {id(a): a.content for a in [*filtered_articles, *known]}
+
+        background = self._enrichment_mode() == 'background'
+        # Publish with cheap placeholders; the enrichment pool swaps in ML results later
+        deferred = filtered_articles + known if background else known
+        enrichment_states = {id(a): 'pending_summary' if a.category else 'pending' for a in deferred}
+        for article in deferred:
             if not article.category:
-                article.category = self._categorize_article(article)
-                
-        # Generate ML Summaries
-        summarizer = get_summarizer()
-        if summarizer:
-            logger.info("Generating AI summaries for new articles...")
-            for article in filtered_articles:
-                if article.content and len(article.content) > 150:
-                    try:
-                        # Limit input to 1024 chars to avoid token limits
-                        res = summarizer(article.content[:1024], max_length=250, min_length=90, do_sample=False)
-                        if res and len(res) > 0:
-                            article.content = res[0]['summary_text']  # Replace long content with crisp AI summary
-                    except Exception as e:
-                        logger.warning(f"Summarizer failed for {article.title}: {e}")
+                article.category = self._placeholder_category(article)
+        if not background:
+            self._apply_governor()
+            # Auto-categorize any article that doesn't already have a category
+            self._categorize_articles(filtered_articles)
+
+            # Generate ML Summaries
+            self._summarize_articles(filtered_articles)
                 
         # Save to Django Database
         from news_brief.models import Article as DBArticle, Publisher
         from django.utils import timezone
+        from .enrichment import placeholder_summary
         
         publishers = {p.name: p for p in Publisher.objects.all()}
         db_articles_to_create = []
         
-        for article in filtered_articles:
+        for article in filtered_articles + known:
             publisher = publishers.get(article.source)
             if not publisher:
                 logger.warning(f"Could not find publisher {article.source} in DB, skipping.")
@@ -109,97 +266,327 @@ class DataProcessor:
                 
             db_articles_to_create.append(DBArticle(
                 title=article.title[:500],
-                summary=(article.content[:497] + '...') if article.content and len(article.content) > 500 else article.content or 'No summary available.',
-                content=article.content,
+                summary=placeholder_summary(article.content),
+                content=scraped_content[id(article)],
                 category=article.category,
                 url=article.url[:1000],
                 image_url=getattr(article, 'image_url', None)[:1000] if hasattr(article, 'image_url') and article.image_url else None,
                 publisher=publisher,
-                published_at=article.published_date or timezone.now()
+                published_at=article.published_date or timezone.now(),
+                enrichment_state=enrichment_states.get(id(article), 'done'),
             ))
             
         try:
             if db_articles_to_create:
-                DBArticle.objects.bulk_create(db_articles_to_create, ignore_conflicts=True)
-                logger.info(f"Successfully bulk saved {len(db_articles_to_create)} unique articles to DB.")
+                chunk_size = self.settings.get('persistence', {}).get('chunk_size', DEFAULT_CHUNK_SIZE)
+                upsert_articles(db_articles_to_create, chunk_size=chunk_size)
         except Exception as e:
-            logger.error(f"Error bulk saving articles to DB: {e}")
+            logger.error(f"Error saving articles to DB: {e}")
+
+        # Attach the newly saved articles to persistent story clusters
+        try:
+            self._cluster_articles(filtered_articles)
+        except Exception as e:
+            logger.error(f"Error clustering articles: {e}")
+
+        # Only rows left pending are queued, so unchanged known stories drop out here
+        if deferred:
+            self._enqueue_enrichment(deferred)
+
+        self._prune_inference_cache()
             
         return self._format_output(filtered_articles)
 
+    def _apply_governor(self):
+        """Re-read the resource governor's tier and batch sizes before the ML steps"""
+        from .governor import get_governor
+        self.settings = get_governor(self.base_settings).apply(self.base_settings)
+
+    def _enrichment_mode(self) -> str:
+        """'inline' blocks saving on ML; 'background' publishes first and enriches afterwards"""
+        return self.settings.get('ml', {}).get('enrichment', {}).get('mode', 'inline')
+
+    def _enqueue_enrichment(self, articles: List[Article]):
+        """Hand the just-published placeholder rows to the background enrichment pool"""
+        from news_brief.models import Article as DBArticle
+        from .enrichment import PENDING, PENDING_SUMMARY, get_enrichment_pool
+
+        try:
+            urls = [a.url[:1000] for a in articles]
+            ids = []
+            for start in range(0, len(urls), 500):
+                ids.extend(DBArticle.objects.filter(
+                    url__in=urls[start:start + 500], enrichment_state__in=[PENDING, PENDING_SUMMARY],
+                ).values_list('id', flat=True))
+            get_enrichment_pool(self.settings).submit(ids)
+        except Exception as e:
+            logger.error(f"Error queueing articles for enrichment: {e}")
+
+    def _inference_cache(self, kind: str, model_id: str, params: Dict[str, Any]):
+        """Persistent output cache for a model, or None when disabled in settings"""
+        cache_config = self.settings.get('ml', {}).get('cache', {})
+        if not cache_config.get('enabled', True):
+            return None
+        from .cache import InferenceCache
+        return InferenceCache(kind, model_id, params)
+
+    def _prune_inference_cache(self):
+        """Evict stale and least recently used cache entries"""
+        cache_config = self.settings.get('ml', {}).get('cache', {})
+        if not cache_config.get('enabled', True):
+            return
+        try:
+            from .cache import InferenceCache
+            InferenceCache.prune(
+                max_entries=cache_config.get('max_entries', 50000),
+                max_age_days=cache_config.get('max_age_days', 30),
+            )
+        except Exception as e:
+            logger.error(f"Error pruning inference cache: {e}")
+
+    def _summarizer_backend(self) -> str:
+        """'abstractive' (distilbart) or 'extractive'; BYTEBRIEF_SUMMARIZER overrides ml.summarizer"""
+        if self.settings.get('ml', {}).get('tier', 'full') != 'full':
+            # Downgraded by the resource governor
+            return 'extractive'
+        backend = os.environ.get('BYTEBRIEF_SUMMARIZER') or self.settings.get('ml', {}).get('summarizer', 'abstractive')
+        if backend not in SUMMARIZER_BACKENDS:
+            logger.warning(f"Unknown summarizer '{backend}', using abstractive")
+            return 'abstractive'
+        return backend
+
+    def _extractive_summarizer(self):
+        from .extractive import ExtractiveSummarizer
+
+        extractive_config = self.settings.get('ml', {}).get('extractive', {})
+        return ExtractiveSummarizer(
+            method=extractive_config.get('method', 'textrank'),
+            max_chars=extractive_config.get('max_chars', 500),
+            max_sentences=extractive_config.get('max_sentences', 3),
+        )
+
+    def _summarize_articles(self, articles: List[Article]):
+        """Replace long article content with summaries, abstractive in batches or extractive"""
+        candidates = [a for a in articles if a.content and len(a.content) > 150]
+        if not candidates:
+            return
+
+        if self._summarizer_backend() == 'extractive':
+            self._summarize_extractive(candidates)
+            return
+
+        unsummarized = self._summarize_abstractive(candidates)
+        if unsummarized and self.settings.get('ml', {}).get('extractive_fallback', True):
+            # Model disabled, unavailable or failed: sentences beat a blind cut at 497 chars
+            self._summarize_extractive(unsummarized)
+
+    def _summarize_extractive(self, articles: List[Article]):
+        summarizer = self._extractive_summarizer()
+        start = time.perf_counter()
+        for article in articles:
+            summary = summarizer.summarize(article.content)
+            if summary:
+                article.content = summary
+        elapsed = time.perf_counter() - start
+        if elapsed > 0:
+            logger.info(
+                f"Extractive ({summarizer.method}) summaries for {len(articles)} articles in {elapsed:.3f}s "
+                f"({len(articles) / elapsed:.0f} summaries/s)"
+            )
+
+    def _summarize_abstractive(self, candidates: List[Article]) -> List[Article]:
+        """AI summaries in length-bucketed batches; returns the articles left unsummarized"""
+        # Limit input to 1024 chars to avoid token limits
+        texts = [a.content[:1024] for a in candidates]
+
+        # Re-ingested and syndicated copies cost a lookup instead of a model run
+        cache = self._inference_cache('summary', SUMMARIZER_MODEL, SUMMARY_GENERATION)
+        hits = cache.get_many(texts) if cache else {}
+        for i, summary in hits.items():
+            candidates[i].content = summary
+        pending = [(a, t) for i, (a, t) in enumerate(zip(candidates, texts)) if i not in hits]
+        if not pending:
+            return []
+
+        summarizer = get_summarizer()
+        if not summarizer:
+            return [a for a, _ in pending]
+
+        # Sorting by input length keeps each batch similarly sized, so little compute goes to padding
+        pending.sort(key=lambda item: len(item[1]))
+        batch_size = max(1, int(self.settings.get('ml', {}).get('summarizer_batch_size', 8)))
+        total_batches = (len(pending) + batch_size - 1) // batch_size
+        logger.info(f"Generating AI summaries for {len(pending)} articles in {total_batches} batches of up to {batch_size}...")
+
+        run_start = time.perf_counter()
+        summarized = 0
+        unsummarized = []
+        for batch_no, start in enumerate(range(0, len(pending), batch_size), 1):
+            batch = pending[start:start + batch_size]
+            batch_texts = [text for _, text in batch]
+            batch_start = time.perf_counter()
+            try:
+                results = summarizer(batch_texts, **SUMMARY_GENERATION)
+            except Exception as e:
+                logger.warning(f"Summarizer failed for batch {batch_no}/{total_batches}: {e}")
+                unsummarized.extend(article for article, _ in batch)
+                continue
+
+            new_entries = []
+            for (article, text), res in zip(batch, results):
+                if res and res.get('summary_text'):
+                    article.content = res['summary_text']  # Replace long content with crisp AI summary
+                    new_entries.append((text, res['summary_text']))
+                else:
+                    unsummarized.append(article)
+            summarized += len(new_entries)
+            if cache and new_entries:
+                cache.set_many(new_entries)
+
+            elapsed = time.perf_counter() - batch_start
+            logger.info(
+                f"Summary batch {batch_no}/{total_batches}: {len(batch)} articles "
+                f"({len(batch_texts[0])}-{len(batch_texts[-1])} chars) in {elapsed:.2f}s"
+            )
+
+        total_elapsed = time.perf_counter() - run_start
+        if total_elapsed > 0:
+            logger.info(f"Summarized {summarized} articles in {total_elapsed:.2f}s ({summarized / total_elapsed:.2f} summaries/s)")
+        return unsummarized
+
+    def _cluster_articles(self, articles: List[Article]):
+        """Incrementally assign saved articles to recent story clusters"""
+        from .clustering import StoryClusterer
+
+        cluster_config = self.settings.get('clustering', {})
+        clusterer = StoryClusterer(
+            threshold=cluster_config.get('threshold', 3),
+            window_hours=cluster_config.get('window_hours', 48),
+        )
+        clusterer.assign(articles)
+
+    def _categorize_articles(self, articles: List[Article]):
+        """Assign a category to every article that doesn't have one, classifying in batches"""
+        uncategorized = [a for a in articles if not a.category]
+        if not uncategorized:
+            return
+        categories = self._classify_texts([self._classification_text(a) for a in uncategorized], uncategorized)
+        for article, category in zip(uncategorized, categories):
+            article.category = category
+
     def _categorize_article(self, article: Article) -> str:
-        """Assign a category to an article using ML Zero-Shot Classification or Keywrods."""
-        text = f"{article.title}. {article.content}"[:1024].lower()
-        
+        """Assign a category to a single article"""
+        return self._classify_texts([self._classification_text(article)], [article])[0]
+
+    @staticmethod
+    def _classification_text(article: Article) -> str:
+        return f"{article.title}. {article.content}"[:1024].lower()
+
+    def _classify_texts(self, texts: List[str], articles: Optional[List[Article]] = None) -> List[str]:
+        """
+        Categorize texts with a cheap-first cascade: breaking-news heuristic,
+        publisher/feed priors and keyword scores, then batched ML Zero-Shot
+        Classification only for what is still ambiguous, then keywords.
+        """
+        from collections import Counter
+        from .cascade import CategoryCascade
+
+        categories: List[Optional[str]] = [None] * len(texts)
+        stages: Counter = Counter()
+        cascade = CategoryCascade(self.settings, AVAILABLE_CATEGORIES)
+        fallbacks: Dict[int, str] = {}
+
         # Check for breaking news urgency first using simple heuristics
         urgency_keywords = ['breaking', 'urgent', 'alert', 'developing', 'just in', 'flash', 'live']
-        if any(kw in text for kw in urgency_keywords[:5]):
-            return 'Breaking'
-            
-        classifier = get_classifier()
+        pending = []
+        for i, text in enumerate(texts):
+            if any(kw in text for kw in urgency_keywords[:5]):
+                categories[i] = 'Breaking'
+                stages['breaking'] += 1
+                continue
+
+            proposal = cascade.propose(articles[i] if articles else None, text)
+            if cascade.is_confident(proposal):
+                categories[i] = proposal[0]
+                stages[proposal[2]] += 1
+            else:
+                if proposal:
+                    fallbacks[i] = proposal[0]
+                pending.append(i)
+
+        best: Dict[int, Dict[str, Any]] = {}
+        cache = None
+        backend = self.settings.get('ml', {}).get('classifier_backend', 'nli')
+        if pending and backend != 'keywords':
+            cache = self._inference_cache('category', *self._classifier_cache_identity(backend))
+        if cache:
+            for j, cached in cache.get_many([texts[i] for i in pending]).items():
+                best[pending[j]] = cached
+
+        misses = [i for i in pending if i not in best]
+        classifier = get_batched_classifier(backend) if misses and backend != 'keywords' else None
         if classifier:
-            try:
-                # Perform zero-shot classification
-                result = classifier(text, candidate_labels=AVAILABLE_CATEGORIES, multi_label=False)
-                best_label = result['labels'][0]
-                best_score = result['scores'][0]
-                
-                # Only use the AI classification if it's reasonably confident
-                if best_score > 0.2:
-                    return best_label
-            except Exception as e:
-                logger.warning(f"Classification failed for {article.title}: {e}")
-                
+            batch_size = int(self.settings.get('ml', {}).get(
+                'embedding_batch_size' if backend == 'embedding' else 'classifier_batch_size',
+                32 if backend == 'embedding' else 4,
+            ))
+            results = classifier.classify([texts[i] for i in misses], batch_size=batch_size)
+            new_entries = []
+            for i, result in zip(misses, results):
+                if result:
+                    best[i] = {'label': result['labels'][0], 'score': result['scores'][0]}
+                    new_entries.append((texts[i], best[i]))
+            if cache and new_entries:
+                cache.set_many(new_entries)
+
+        for i, top in best.items():
+            # Only use the AI classification if it's reasonably confident
+            if top['score'] > 0.2:
+                categories[i] = top['label']
+                stages['ml'] += 1
+
+        for i, category in enumerate(categories):
+            if category is None:
+                categories[i] = fallbacks.get(i) or self._keyword_category(texts[i])
+                stages['fallback'] += 1
+
+        cascade.record(stages)
+        return categories
+
+    @staticmethod
+    def _classifier_cache_identity(backend: str):
+        """(model ID, params) that key cached categories for the given classifier backend"""
+        if backend == 'embedding':
+            from .embedding_classifier import EMBEDDING_MODEL, LABEL_TEMPLATE
+            return EMBEDDING_MODEL, {'labels': AVAILABLE_CATEGORIES, 'template': LABEL_TEMPLATE, 'similarity': 'cosine'}
+        return CLASSIFIER_MODEL, {'labels': AVAILABLE_CATEGORIES, 'template': HYPOTHESIS_TEMPLATE, 'multi_label': False}
+
+    def _placeholder_category(self, article: Article) -> str:
+        """The cascade's cheap proposal (publisher prior, feed tag, keywords), published until enrichment runs"""
+        from .cascade import CategoryCascade
+
+        text = self._classification_text(article)
+        proposal = CategoryCascade(self.settings, AVAILABLE_CATEGORIES).propose(article, text)
+        return proposal[0] if proposal else self._keyword_category(text)
+
+    def _keyword_category(self, text: str) -> str:
+        """Pick the category with the most distinct whole-word keyword hits in the text"""
         # FAST KEYWORD FALLBACK (For environments where ML Classifier is disabled due to RAM limits)
-        category_keywords = {
-            'Tech': ['apple', 'google', 'microsoft', 'software', 'hardware', 'app', 'update', 'smartphone'],
-            'Business': ['market', 'stock', 'shares', 'company', 'profit', 'revenue', 'ceo', 'economy'],
-            'Global': ['world', 'international', 'diplomacy', 'nations', 'treaty'],
-            'Health': ['covid', 'disease', 'doctor', 'hospital', 'treatment', 'virus', 'study', 'health'],
-            'Sports': ['football', 'basketball', 'soccer', 'sports', 'game', 'tournament', 'player'],
-            'Politics': ['election', 'president', 'government', 'senate', 'parliament', 'law', 'policy'],
-            'Finance': ['bank', 'inflation', 'currency', 'investor', 'financial', 'bond', 'crypto'],
-            'Travel': ['flight', 'airlines', 'hotel', 'tourism', 'destination', 'vacation'],
-            'Gaming': ['nintendo', 'playstation', 'xbox', 'game', 'steam', 'esports', 'twitch'],
-            'Startups & Innovation': ['startup', 'founder', 'funding', 'seed round', 'venture capital'],
-            'AI & Future Tech': ['ai', 'artificial intelligence', 'openai', 'chatgpt', 'neural network', 'robotics'],
-            'Climate & Environment': ['climate change', 'warming', 'pollution', 'emissions', 'green', 'renewable'],
-            'Cybersecurity': ['hacker', 'breach', 'ransomware', 'cyber', 'security', 'vulnerability', 'password'],
-            'Space & Research': ['nasa', 'space', 'orbit', 'astronaut', 'mission', 'mars', 'satellite', 'spacex'],
-            'Entertainment': ['movie', 'album', 'celebrity', 'hollywood', 'netflix', 'actor', 'cinema'],
-            'Science': ['researcher', 'discovery', 'species', 'fossil', 'science', 'scientist']
-        }
-        
-        best_match = 'Global'
-        max_hits = 0
-        for category, keywords in category_keywords.items():
-            hits = sum(1 for kw in keywords if kw in text)
-            if hits > max_hits:
-                max_hits = hits
-                best_match = category
-                
-        return best_match
+        return CATEGORY_MATCHER.best_group(text, default='Global')
 
     def _filter_articles(self, articles: List[Article]) -> List[Article]:
         """Filter articles based on keywords and exclusions"""
         if not articles:
             return []
-            
-        filtered = []
-        for article in articles:
-            # Check excluded keywords
-            if any(keyword.lower() in article.title.lower() or keyword.lower() in article.content.lower() 
-                   for keyword in self.config.excluded_keywords):
-                continue
-                
-            # Check inclusion keywords (if any are specified), but skip if categories only
-            if self.config.keywords and not self.config.categories:
-                if not any(keyword.lower() in article.title.lower() or keyword.lower() in article.content.lower() 
-                           for keyword in self.config.keywords):
-                    continue
-            
-            filtered.append(article)
-            
+
+        # Inclusion keywords only apply when the client doesn't filter by categories
+        keyword_filter = KeywordFilter(
+            keywords=self.config.keywords if not self.config.categories else (),
+            excluded_keywords=self.config.excluded_keywords,
+            whole_words=self.config.keyword_match == 'words',
+        )
+        filtered = [a for a in articles if keyword_filter.allows(a.title, a.content)]
+
         logger.info(f"Filtered {len(articles)} articles down to {len(filtered)} for client {self.config.name}")
         return filtered
     
@@ -0,0 +1,150 @@
+"""
+Low-memory inference modes for the summarizer and zero-shot classifier.
+
+  fp32  the plain transformers models (default)
+  int8  the same models with every nn.Linear dynamically quantized to int8:
+        weights are stored as int8 and activations are quantized on the fly,
+        which roughly quarters the Linear weights' RAM and speeds up CPU matmuls
+  onnx  an ONNX export run by onnxruntime on CPU, quantized to int8 when the
+        optional `optimum[onnxruntime]` extra is installed (falls back to int8)
+  off   no ML at all: truncated content for summaries, keywords for categories
+
+The mode comes from BYTEBRIEF_INFERENCE_MODE. On Render it defaults to off:
+importing torch and transformers alone is ~570 MB RSS, and quantizing a
+distilbart-sized model peaks at 1.7-2.3 GB while the fp32 weights are
+converted (benchmarks/bench_inference.py), so no mode fits a 512 MB instance.
+Keep ML on a larger instance, where serve_models can share one copy between workers.
+"""
+import io
+import os
+import shutil
+import tempfile
+import warnings
+from pathlib import Path
+from typing import Optional
+from loguru import logger
+
+INFERENCE_MODES = ('fp32', 'int8', 'onnx', 'off')
+
+
+def inference_mode() -> str:
+    """The configured inference mode; small Render instances default to off"""
+    mode = (os.environ.get('BYTEBRIEF_INFERENCE_MODE') or ('off' if os.environ.get('RENDER') else 'fp32')).lower()
+    if mode not in INFERENCE_MODES:
+        logger.warning(f"Unknown BYTEBRIEF_INFERENCE_MODE '{mode}', using fp32")
+        return 'fp32'
+    return mode
+
+
+def quantize_dynamic_int8(model):
+    """Dynamically quantize every nn.Linear of a torch model to int8 in place (CPU only)"""
+    import torch
+
+    with warnings.catch_warnings():
+        # Eager-mode dynamic quantization is deprecated upstream in favour of torchao,
+        # which is not a dependency here; the kernels are still the fbgemm/qnnpack ones
+        warnings.simplefilter('ignore', DeprecationWarning)
+        warnings.simplefilter('ignore', UserWarning)
+        from torch.ao.quantization import quantize_dynamic
+        model = quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8, inplace=True)
+    model.eval()
+    return model
+
+
+def model_size_bytes(model) -> int:
+    """Serialized weight size, counting quantized packed params that parameters() does not report"""
+    import torch
+
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell()
+
+
+def onnx_cache_dir() -> Path:
+    """Where quantized ONNX exports are kept between runs"""
+    root = os.environ.get('BYTEBRIEF_CACHE_DIR') or Path.home() / ".cache" / "bytebrief"
+    return Path(root) / "onnx"
+
+
+def _load_onnx(model_name: str, task: str):
+    """
+    Export `model_name` to ONNX and quantize it with onnxruntime, once per model
+    and task (cached under onnx_cache_dir()); None if the extra is missing.
+    """
+    try:
+        from optimum.onnxruntime import (
+            ORTModelForFeatureExtraction, ORTModelForSeq2SeqLM, ORTModelForSequenceClassification, ORTQuantizer,
+        )
+        from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    except ImportError:
+        logger.warning("ONNX inference needs `pip install optimum[onnxruntime]`; using int8 torch models instead")
+        return None
+
+    model_class = {
+        'seq2seq': ORTModelForSeq2SeqLM,
+        'sequence-classification': ORTModelForSequenceClassification,
+        'feature-extraction': ORTModelForFeatureExtraction,
+    }[task]
+    quantized_dir = onnx_cache_dir() / model_name.replace('/', '--') / task
+    if not any(quantized_dir.glob('*.onnx')):
+        quantized_dir.parent.mkdir(parents=True, exist_ok=True)
+        # The fp32 export is only an intermediate step
+        export_dir = tempfile.mkdtemp(prefix='export-', dir=quantized_dir.parent)
+        try:
+            model_class.from_pretrained(model_name, export=True).save_pretrained(export_dir)
+            config = AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+            for onnx_file in sorted(f for f in os.listdir(export_dir) if f.endswith('.onnx')):
+                ORTQuantizer.from_pretrained(export_dir, file_name=onnx_file).quantize(
+                    save_dir=quantized_dir, quantization_config=config,
+                )
+        finally:
+            shutil.rmtree(export_dir, ignore_errors=True)
+    return model_class.from_pretrained(quantized_dir)
+
+
+def load_seq2seq_model(model_name: str, mode: Optional[str] = None):
+    """Seq2seq LM for summarization in the given (or configured) inference mode"""
+    mode = mode or inference_mode()
+    if mode == 'onnx':
+        model = _load_onnx(model_name, 'seq2seq')
+        if model is not None:
+            return model
+        mode = 'int8'
+
+    from transformers import AutoModelForSeq2SeqLM
+
+    model = AutoModelForSeq2SeqLM.from_pretrained(model_name, low_cpu_mem_usage=True)
+    model.eval()
+    return quantize_dynamic_int8(model) if mode == 'int8' else model
+
+
+def load_sequence_classifier(model_name: str, mode: Optional[str] = None):
+    """NLI sequence classifier for zero-shot categorization in the given (or configured) inference mode"""
+    mode = mode or inference_mode()
+    if mode == 'onnx':
+        model = _load_onnx(model_name, 'sequence-classification')
+        if model is not None:
+            return model
+        mode = 'int8'
+
+    from transformers import AutoModelForSequenceClassification
+
+    model = AutoModelForSequenceClassification.from_pretrained(model_name, low_cpu_mem_usage=True)
+    model.eval()
+    return quantize_dynamic_int8(model) if mode == 'int8' else model
+
+
+def load_encoder(model_name: str, mode: Optional[str] = None):
+    """Sentence encoder for embedding classification in the given (or configured) inference mode"""
+    mode = mode or inference_mode()
+    if mode == 'onnx':
+        model = _load_onnx(model_name, 'feature-extraction')
+        if model is not None:
+            return model
+        mode = 'int8'
+
+    from transformers import AutoModel
+
+    model = AutoModel.from_pretrained(model_name, low_cpu_mem_usage=True)
+    model.eval()
+    return quantize_dynamic_int8(model) if mode == 'int8' else model
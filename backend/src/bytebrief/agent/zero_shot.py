@@ -0,0 +1,107 @@
+"""
+Batched zero-shot NLI classification with pre-tokenized label hypotheses
+"""
+import time
+from typing import Any, Dict, List, Optional
+from loguru import logger
+
+# Same default template as the transformers zero-shot-classification pipeline
+HYPOTHESIS_TEMPLATE = "This example is {}."
+
+
+class BatchedZeroShotClassifier:
+    """
+    Scores many texts against a fixed set of candidate labels.
+
+    The transformers pipeline re-tokenizes every (text, hypothesis) pair on each
+    call. Here the hypothesis for each label is tokenized once up front, every
+    premise is tokenized once, and the pairs are assembled from those encodings
+    with the tokenizer's own special-token template. All pairs for a batch of
+    texts then go through the NLI model in a single forward pass.
+    Scores match the pipeline with multi_label=False (softmax of the
+    entailment logits across labels).
+    """
+
+    def __init__(self, model, tokenizer, labels: List[str], hypothesis_template: str = HYPOTHESIS_TEMPLATE,
+                 max_length: int = 512):
+        self.model = model
+        self.tokenizer = tokenizer
+        self.labels = list(labels)
+        self.max_length = max_length
+        self.entailment_id = self._entailment_id(model.config.label2id)
+        self.pad_token_id = tokenizer.pad_token_id if tokenizer.pad_token_id is not None else 0
+
+        self._backend = tokenizer.backend_tokenizer
+        self._hypotheses = [
+            self._backend.encode(hypothesis_template.format(label), add_special_tokens=False)
+            for label in self.labels
+        ]
+        # Room left for the premise once the longest hypothesis and special tokens are in
+        self._special_tokens = self._backend.num_special_tokens_to_add(is_pair=True)
+        self._premise_budget = max_length - self._special_tokens - max(len(h.ids) for h in self._hypotheses)
+
+    @staticmethod
+    def _entailment_id(label2id: Dict[str, int]) -> int:
+        for label, idx in label2id.items():
+            if label.lower().startswith("entail"):
+                return idx
+        return -1
+
+    def _pair_ids(self, premise: str) -> List[List[int]]:
+        encoding = self._backend.encode(premise, add_special_tokens=False)
+        encoding.truncate(self._premise_budget)
+        return [
+            self._backend.post_process(encoding, hypothesis, add_special_tokens=True).ids
+            for hypothesis in self._hypotheses
+        ]
+
+    def _score_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        import torch
+
+        rows = [ids for text in texts for ids in self._pair_ids(text)]
+        width = max(len(ids) for ids in rows)
+        input_ids = torch.full((len(rows), width), self.pad_token_id, dtype=torch.long)
+        attention_mask = torch.zeros((len(rows), width), dtype=torch.long)
+        for i, ids in enumerate(rows):
+            input_ids[i, :len(ids)] = torch.tensor(ids, dtype=torch.long)
+            attention_mask[i, :len(ids)] = 1
+
+        with torch.inference_mode():
+            logits = self.model(input_ids=input_ids, attention_mask=attention_mask).logits
+
+        entailment = logits[:, self.entailment_id].reshape(len(texts), len(self.labels))
+        scores = entailment.softmax(dim=-1)
+
+        results = []
+        for row in scores.tolist():
+            order = sorted(range(len(row)), key=lambda i: row[i], reverse=True)
+            results.append({'labels': [self.labels[i] for i in order], 'scores': [row[i] for i in order]})
+        return results
+
+    def classify(self, texts: List[str], batch_size: int = 4) -> List[Optional[Dict[str, Any]]]:
+        """
+        Classify texts in batches of `batch_size` (each batch is batch_size x labels NLI pairs).
+        A batch that fails yields None for each of its texts so callers can fall back.
+        """
+        batch_size = max(1, batch_size)
+        results: List[Optional[Dict[str, Any]]] = []
+        total = len(texts)
+        start = time.perf_counter()
+
+        for offset in range(0, total, batch_size):
+            batch = texts[offset:offset + batch_size]
+            try:
+                results.extend(self._score_batch(batch))
+            except Exception as e:
+                logger.warning(f"Zero-shot batch {offset // batch_size + 1} failed: {e}")
+                results.extend([None] * len(batch))
+
+            done = offset + len(batch)
+            elapsed = time.perf_counter() - start
+            if elapsed > 0:
+                logger.info(
+                    f"Classified {done}/{total} articles "
+                    f"({done / elapsed:.2f} articles/s, {done * len(self.labels) / elapsed:.1f} NLI pairs/s)"
+                )
+
+        return results
@@ -87,6 +87,7 @@ class ClientConfig:
     preferred_sources: List[str] = field(default_factory=list)
     output_format: str = "json"  # json, csv, markdown
     categories: List[str] = field(default_factory=list)
+    keyword_match: str = "substring"  # substring (as saved configs expect) | words (whole words, '*' for prefixes)
     
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> 'ClientConfig':
@@ -96,5 +97,6 @@ class ClientConfig:
             excluded_keywords=data.get('excluded_keywords', []),
             preferred_sources=data.get('preferred_sources', []),
             output_format=data.get('output_format', 'json'),
-            categories=data.get('categories', [])
+            categories=data.get('categories', []),
+            keyword_match=data.get('keyword_match', 'substring'),
         )
@@ -0,0 +1,39 @@
+"""
+Process memory readings (RSS, PSS, shared pages) for sizing ML workers
+"""
+import os
+from typing import Dict
+
+
+def process_memory(pid: str = 'self') -> Dict[str, int]:
+    """
+    Memory of a process in bytes.
+
+    rss     resident pages, counting pages shared with other processes in full
+    pss     proportional set size: shared pages divided by the number of sharers,
+            the honest per-worker cost when model weights are shared copy-on-write
+    shared  resident pages currently shared with at least one other process
+
+    Linux reads /proc/<pid>/smaps_rollup; elsewhere only rss (peak) is available.
+    """
+    try:
+        fields = {}
+        with open(f'/proc/{pid}/smaps_rollup') as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 3 and parts[2] == 'kB':
+                    fields[parts[0].rstrip(':')] = int(parts[1]) * 1024
+        return {
+            'rss': fields.get('Rss', 0),
+            'pss': fields.get('Pss', 0),
+            'shared': fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0),
+        }
+    except OSError:
+        import resource
+        scale = 1 if os.uname().sysname == 'Darwin' else 1024
+        rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+        return {'rss': rss, 'pss': rss, 'shared': 0}
+
+
+def format_memory(memory: Dict[str, int]) -> str:
+    return ', '.join(f"{key.upper()} {value / 2**20:.0f} MB" for key, value in memory.items())